@@ -0,0 +1,281 @@
+import heapq
+import math
+from enum import Enum
+
+class Verdict(Enum):
+    schedulable = "Schedulable"  # The test proves the task set meets every deadline
+    unschedulable = "Unschedulable"  # The test proves some deadline is missed
+    inconclusive = "Inconclusive"  # The test cannot decide (sufficient test failed or not applicable)
+
+def utilization(tasks):
+    """
+    Calculates the total CPU utilization of a task set.
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - float: Sum of execution_time / period.
+    """
+    return sum(task.execution_time / task.period for task in tasks)
+
+def liu_layland_bound(n):
+    """
+    Calculates the Liu & Layland utilization bound for n tasks under RMS.
+
+    Parameters:
+    - n (int): Number of tasks.
+
+    Returns:
+    - float: n * (2^(1/n) - 1).
+    """
+    return n * (2 ** (1 / n) - 1) if n else 1.0
+
+def implicit_deadlines(tasks):
+    """
+    Checks if every relative deadline is at least the period, as the utilization bounds assume.
+
+    The simulator counts a miss when a job is still queued at its next release,
+    so a deadline past the period behaves as the period for the miss count.
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - bool: True if deadline >= period for every task.
+    """
+    return all(task.deadline >= task.period for task in tasks)
+
+def liu_layland_test(tasks):
+    """
+    Sufficient RMS test: U <= n(2^(1/n) - 1).
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - dict: Test name, verdict and detail.
+    """
+    total = utilization(tasks)
+    bound = liu_layland_bound(len(tasks))
+    if total > 1:
+        verdict = Verdict.unschedulable
+    elif implicit_deadlines(tasks) and total <= bound:
+        verdict = Verdict.schedulable
+    else:
+        verdict = Verdict.inconclusive
+    return {"test": "Liu & Layland", "verdict": verdict, "detail": f"U={total:.4f} bound={bound:.4f}"}
+
+def hyperbolic_test(tasks):
+    """
+    Sufficient RMS test (Bini & Buttazzo): prod(U_i + 1) <= 2.
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - dict: Test name, verdict and detail.
+    """
+    product = math.prod(task.execution_time / task.period + 1 for task in tasks)
+    if implicit_deadlines(tasks) and product <= 2:
+        verdict = Verdict.schedulable
+    else:
+        verdict = Verdict.inconclusive
+    return {"test": "Hyperbolic bound", "verdict": verdict, "detail": f"prod(U+1)={product:.4f}"}
+
+def response_times(tasks):
+    """
+    Calculates the worst-case response time of every task under fixed priorities.
+
+    The tasks are given in priority order (highest first). The iteration
+    R = C_i + sum(ceil(R / T_j) * C_j) over higher priority tasks stops once R
+    converges or exceeds the deadline.
+
+    Parameters:
+    - tasks (list): Task objects sorted by priority.
+
+    Returns:
+    - dict: Response time by task PID, or None if it exceeds the deadline.
+    """
+    result = {}
+    for index, task in enumerate(tasks):
+        higher = tasks[:index]
+        response = task.execution_time + sum(other.execution_time for other in higher)
+        while response <= task.deadline:
+            demand = task.execution_time + sum(math.ceil(response / other.period) * other.execution_time for other in higher)
+            if demand == response:
+                break
+            response = demand
+        result[task.pid] = response if response <= task.deadline else None
+    return result
+
+def response_time_test(tasks):
+    """
+    Exact RMS test by response-time analysis, valid for deadlines up to the period.
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - dict: Test name, verdict and detail.
+    """
+    if any(task.deadline > task.period for task in tasks):
+        return {"test": "Response time analysis", "verdict": Verdict.inconclusive, "detail": "deadline > period"}
+    responses = response_times(sorted(tasks, key=lambda task: task.period))
+    verdict = Verdict.schedulable if all(response is not None for response in responses.values()) else Verdict.unschedulable
+    return {"test": "Response time analysis", "verdict": verdict, "detail": responses}
+
+def demand_bound(tasks, interval):
+    """
+    Calculates the processor demand of the jobs released and due within an interval.
+
+    Parameters:
+    - tasks (list): Task objects.
+    - interval (int): Length of the interval starting at a synchronous release.
+
+    Returns:
+    - int: sum(max(0, floor((t - D_i) / T_i) + 1) * C_i).
+    """
+    return sum(max(0, (interval - task.deadline) // task.period + 1) * task.execution_time for task in tasks)
+
+def demand_horizon(tasks):
+    """
+    Calculates the interval length up to which the demand bound must be checked.
+
+    Parameters:
+    - tasks (list): Task objects with utilization at most 1.
+
+    Returns:
+    - int: Minimum of the hyperperiod plus the largest deadline and, for U < 1, the bound L_a.
+    """
+    horizon = math.lcm(*(task.period for task in tasks)) + max(task.deadline for task in tasks)
+    total = utilization(tasks)
+    if total < 1:
+        limit = sum((task.period - task.deadline) * task.execution_time / task.period for task in tasks) / (1 - total)
+        horizon = min(horizon, max(max(task.deadline for task in tasks), math.ceil(limit)))
+    return horizon
+
+def processor_demand_test(tasks):
+    """
+    Exact EDF test by processor-demand analysis: dbf(t) <= t at every absolute deadline up to the horizon.
+
+    Only valid for deadlines up to the period: with D > T the jobs are ordered by
+    D but miss at their next release, which no demand bound describes.
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - dict: Test name, verdict and detail.
+    """
+    total = utilization(tasks)
+    if total > 1:
+        return {"test": "Processor demand", "verdict": Verdict.unschedulable, "detail": f"U={total:.4f}"}
+    if any(task.deadline > task.period for task in tasks):
+        return {"test": "Processor demand", "verdict": Verdict.inconclusive, "detail": "deadline > period"}
+    if implicit_deadlines(tasks):
+        return {"test": "Processor demand", "verdict": Verdict.schedulable, "detail": f"U={total:.4f}"}
+    horizon = demand_horizon(tasks)
+    checked = 0
+    previous = None
+    for deadline in heapq.merge(*(range(task.deadline, horizon + 1, task.period) for task in tasks)):
+        if deadline == previous:
+            continue
+        previous = deadline
+        checked += 1
+        demand = demand_bound(tasks, deadline)
+        if demand > deadline:
+            return {"test": "Processor demand", "verdict": Verdict.unschedulable, "detail": f"dbf({deadline})={demand}"}
+    return {"test": "Processor demand", "verdict": Verdict.schedulable, "detail": f"{checked} deadlines up to {horizon}"}
+
+def job_demand_test(jobs):
+    """
+    Exact EDF test for one-shot (aperiodic) jobs: the work released and due inside every window fits in it.
+
+    Parameters:
+    - jobs (list): (release, execution_time, absolute_deadline) tuples.
+
+    Returns:
+    - dict: Test name, verdict and detail.
+    """
+    jobs = sorted(jobs, key=lambda job: job[2])
+    for release in sorted({job[0] for job in jobs}):
+        demand = 0
+        for start, execution_time, deadline in jobs:
+            if start >= release:
+                demand += execution_time
+                if demand > deadline - release:
+                    return {"test": "Job demand", "verdict": Verdict.unschedulable, "detail": f"window [{release}, {deadline}]"}
+    return {"test": "Job demand", "verdict": Verdict.schedulable, "detail": f"{len(jobs)} jobs"}
+
+def global_density_test(tasks, cpus, edf=True):
+    """
+    Multiprocessor test for global scheduling on identical CPUs.
+
+    U > m is unschedulable on any scheduler. For global EDF the density bound of
+    Goossens, Funk and Baruah, sum(delta) <= m - (m - 1) * max(delta) with
+    delta = C / D, is sufficient for deadlines up to the period.
+
+    Parameters:
+    - tasks (list): Task objects.
+    - cpus (int): Number of CPUs.
+    - edf (bool): Indicates if the scheduler is global EDF; fixed priorities only get the necessary test (default is True).
+
+    Returns:
+    - dict: Test name, verdict and detail.
+    """
+    total = utilization(tasks)
+    densities = [task.execution_time / min(task.deadline, task.period) for task in tasks]
+    bound = cpus - (cpus - 1) * max(densities, default=0)
+    if total > cpus:
+        verdict = Verdict.unschedulable
+    elif edf and sum(densities) <= bound and all(task.deadline <= task.period for task in tasks):
+        verdict = Verdict.schedulable
+    else:
+        verdict = Verdict.inconclusive
+    return {"test": "Global density bound", "verdict": verdict, "detail": f"U={total:.4f} density={sum(densities):.4f} bound={bound:.4f}"}
+
+def combine(results):
+    """
+    Combines the results of several tests: the first conclusive verdict wins.
+
+    Parameters:
+    - results (list): Test results.
+
+    Returns:
+    - Verdict: Overall verdict.
+    """
+    for result in results:
+        if result["verdict"] != Verdict.inconclusive:
+            return result["verdict"]
+    return Verdict.inconclusive
+
+def analyze_rms(tasks):
+    """
+    Runs the RMS tests from the cheapest to the exact one, stopping at the first conclusive verdict.
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - Tuple[Verdict, list]: Overall verdict and the results of the tests run.
+    """
+    results = []
+    for test in (liu_layland_test, hyperbolic_test, response_time_test):
+        results.append(test(tasks))
+        if results[-1]["verdict"] != Verdict.inconclusive:
+            break
+    return combine(results), results
+
+def analyze_edf(tasks):
+    """
+    Runs the EDF processor-demand test for periodic tasks with constrained deadlines (D <= T).
+
+    Parameters:
+    - tasks (list): Task objects.
+
+    Returns:
+    - Tuple[Verdict, list]: Overall verdict and the results of the tests run.
+    """
+    results = [processor_demand_test(tasks)]
+    return combine(results), results
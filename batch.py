@@ -0,0 +1,145 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from simulation import ALGORITHMS, run_simulation
+from file_manager import write_statistics_to_file
+from logger import Logger
+from result_cache import ResultCache
+
+SUMMARY_FILE = "summary.csv"
+SUMMARY_FIELDS = ["job", "input", "algorithm", "time", "seed", "status", "elapsed",
+                  "Missed Deadlines", "Executed Periods", "Non executed Periods", "error"]
+
+def parse_job(index, row):
+    """
+    Validates a manifest row and converts its fields.
+
+    Parameters:
+    - index (int): Position of the row in the manifest.
+    - row (dict): Row with input, algorithm, time and optionally seed and random.
+
+    Returns:
+    - dict: Job with its id and typed fields.
+    """
+    algorithm = row["algorithm"].strip().upper()
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Manifest row {index}: unknown algorithm {row['algorithm']}")
+    seed = row.get("seed")
+    seed = int(seed) if seed not in (None, "") else None
+    random = row.get("random")
+    if random in (None, ""):
+        # A seed only makes sense for the random start times of EDFA
+        random = seed is not None and algorithm == 'EDFA'
+    elif isinstance(random, str):
+        random = random.strip().lower() in ("1", "true", "yes")
+    return {"job": row.get("job") or f"{index:04d}-{algorithm}",
+            "input": row["input"].strip(),
+            "algorithm": algorithm,
+            "time": int(row["time"]),
+            "seed": seed,
+            "random": bool(random)}
+
+def read_manifest(filename):
+    """
+    Reads the jobs of a batch. JSON Lines manifests (.jsonl) have one object per line;
+    any other file is read as CSV with a header (input,algorithm,time,seed[,random]).
+
+    Parameters:
+    - filename (str): Manifest file.
+
+    Returns:
+    - list: Jobs of the manifest.
+    """
+    with open(filename, 'r') as file:
+        if filename.endswith(".jsonl"):
+            rows = [json.loads(line) for line in file if line.strip()]
+        else:
+            rows = list(csv.DictReader(file))
+    return [parse_job(index, row) for index, row in enumerate(rows)]
+
+def run_job(job, directory, options):
+    """
+    Runs one job of a batch in its own directory. Runs in a worker process.
+
+    Parameters:
+    - job (dict): Job of the manifest.
+    - directory (str): Directory of the job; receives logs/ and statistics.txt.
+    - options (dict): Scheduler flags shared by every job (eventDriven, extrapolate, vectorized), the trace flag and the result cache directory.
+
+    Returns:
+    - dict: Summary row of the job.
+    """
+    row = {key: job[key] for key in ("job", "input", "algorithm", "time", "seed")}
+    start = time.perf_counter()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Each worker logs to the job directory, so concurrent runs never share a file
+        Logger.configure(logs_path=os.path.join(directory, "logs", ""), trace=options.get("trace", True))
+        result_cache = ResultCache(options["result_cache"]) if options.get("result_cache") else None
+        scheduler = run_simulation(job["input"], job["algorithm"], job["time"], randomGenerator=job["random"],
+                                   seed=job["seed"], result_cache=result_cache, eventDriven=options.get("eventDriven", False),
+                                   extrapolate=options.get("extrapolate", False), vectorized=options.get("vectorized", False))
+        write_statistics_to_file(os.path.join(directory, "statistics.txt"), scheduler.get_statistics())
+        general = scheduler.get_general_statistics()
+        row.update({key: general[key] for key in SUMMARY_FIELDS[7:10]})
+        row["status"] = "ok"
+    except Exception as error:
+        row["status"] = "error"
+        row["error"] = f"{type(error).__name__}: {error}"
+    finally:
+        Logger.shutdown()
+    row["elapsed"] = round(time.perf_counter() - start, 6)
+    return row
+
+def run_batch(jobs, directory, workers=None, **options):
+    """
+    Runs the jobs of a batch in a process pool and writes the summary.
+
+    Parameters:
+    - jobs (list): Jobs of the manifest.
+    - directory (str): Results directory; every job gets directory/<job>/.
+    - workers (int): Number of worker processes (default is the number of CPUs).
+    - options: Scheduler flags shared by every job (eventDriven, extrapolate, vectorized), the trace flag and the result cache directory.
+
+    Returns:
+    - list: Summary rows in manifest order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, job, os.path.join(directory, job["job"]), options): index
+                   for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            row = future.result()
+            rows[futures[future]] = row
+            print(f"{row['job']}: {row['status']} ({row['elapsed']}s)")
+    rows = [rows[index] for index in range(len(jobs))]
+    with open(os.path.join(directory, SUMMARY_FILE), 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Real-Time Scheduling Simulator - batch runner')
+    parser.add_argument('-m', '--manifest', type=str, required=True, help='CSV or JSON Lines file with one job (input, algorithm, time, seed) per row')
+    parser.add_argument('-d', '--directory', type=str, default='results/batch', help='Results directory, one subdirectory per job')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Number of worker processes (default is the number of CPUs)')
+    parser.add_argument('-e', '--event-driven', action='store_true', help='Jump time between scheduling events instead of stepping every tick')
+    parser.add_argument('--vectorized', action='store_true', help='Find releases and expired deadlines with NumPy array operations (for large task sets)')
+    parser.add_argument('--hyperperiod', action='store_true', help='Simulate periodic runs until the schedule repeats and extrapolate the statistics')
+    parser.add_argument('--no-trace', action='store_true', help='Do not log the per-tick trace records')
+    parser.add_argument('--result-cache', type=str, help='Reuse the results of identical jobs stored in this directory')
+    args = parser.parse_args()
+
+    rows = run_batch(read_manifest(args.manifest), args.directory, workers=args.workers,
+                     eventDriven=args.event_driven, extrapolate=args.hyperperiod, vectorized=args.vectorized, trace=not args.no_trace,
+                     result_cache=args.result_cache)
+    failed = sum(row["status"] != "ok" for row in rows)
+    print(f"{len(rows) - failed} jobs done, {failed} failed. Summary: {os.path.join(args.directory, SUMMARY_FILE)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import platform
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from simulation import ALGORITHMS, create_scheduler
+from scheduler import Statistic
+from metrics import JobMetric
+from task_generator import generate_task_set
+from file_manager import read_tasks_from_file, write_tasks_to_file
+from cpu import CPU
+from logger import Logger
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+RESULT_FIELDS = ["algorithm", "tasks", "time", "utilization", "seed", "eventDriven", "vectorized", "trace",
+                 "elapsed", "ticks_per_sec", "events", "events_per_sec", "peak_rss_kb", "log_bytes"]
+
+def directory_size(path):
+    """
+    Calculates the size of the files under a directory.
+
+    Parameters:
+    - path (str): Directory.
+
+    Returns:
+    - int: Total size in bytes.
+    """
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def run_case(case):
+    """
+    Generates the task set of a benchmark case and times its simulation. Runs in a fresh
+    worker process, so the peak RSS belongs to this case only.
+
+    Events are the scheduling decisions of the run: CPU history segments (dispatches and
+    idle gaps) plus completed jobs and missed deadlines.
+
+    Parameters:
+    - case (dict): algorithm, tasks, time, utilization, seed, eventDriven, vectorized and trace of the case.
+
+    Returns:
+    - dict: The case with its measurements.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        logs_path = os.path.join(directory, "logs", "")
+        Logger.configure(logs_path=logs_path, trace=case["trace"])
+        input = os.path.join(directory, "tasks.txt")
+        write_tasks_to_file(input, generate_task_set(case["tasks"], case["utilization"], seed=case["seed"]))
+        cpu = CPU("Processor")
+        scheduler = create_scheduler(case["algorithm"], case["time"], cpu, randomGenerator=case["algorithm"] == 'EDFA',
+                                     seed=case["seed"], eventDriven=case["eventDriven"], vectorized=case["vectorized"])
+        for task in read_tasks_from_file(input, aperiodic=case["algorithm"] == 'EDFA', cache=False):
+            scheduler.add_task(task)
+
+        start = time.perf_counter()
+        scheduler.run()
+        elapsed = time.perf_counter() - start
+        Logger.shutdown()
+
+        missed = sum(counters[Statistic.missed_deadlines.value] for counters in scheduler.statistics.values())
+        completed = sum(metrics[JobMetric.response_time.value].count for metrics in scheduler.job_metrics.values())
+        events = len(cpu.return_cpu_history().starts) + completed + missed
+        result = dict(case)
+        result.update({"elapsed": round(elapsed, 6),
+                       "ticks_per_sec": round(case["time"] / elapsed, 1),
+                       "events": events,
+                       "events_per_sec": round(events / elapsed, 1),
+                       "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+                       "log_bytes": directory_size(logs_path)})
+        return result
+
+def run_benchmark(algorithms, task_counts, times, utilization=0.9, seed=0, eventDriven=False, vectorized=False, trace=True):
+    """
+    Runs every case of the grid algorithms x task counts x simulation times, one after the
+    other and each in its own process.
+
+    Parameters:
+    - algorithms (list): Scheduling algorithms ('RMS', 'EDF', 'EDFA').
+    - task_counts (list): Numbers of tasks.
+    - times (list): Simulation times.
+    - utilization (float): Total utilization of the generated task sets (default is 0.9).
+    - seed (int): Seed of the task sets and EDFA start times (default is 0).
+    - eventDriven (bool): Indicates if the event-driven loop is used (default is False).
+    - vectorized (bool): Indicates if the NumPy task table is used (default is False).
+    - trace (bool): Indicates if the per-tick trace is logged (default is True).
+
+    Returns:
+    - list: Results of every case.
+    """
+    results = []
+    for algorithm, tasks, simulation_time in itertools.product(algorithms, task_counts, times):
+        case = {"algorithm": algorithm, "tasks": tasks, "time": simulation_time, "utilization": utilization,
+                "seed": seed, "eventDriven": eventDriven, "vectorized": vectorized, "trace": trace}
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+            result = executor.submit(run_case, case).result()
+        print(f"{algorithm} n={tasks} t={simulation_time}: {result['ticks_per_sec']} ticks/s, "
+              f"{result['events_per_sec']} events/s, {result['peak_rss_kb']} KB, {result['log_bytes']} log bytes")
+        results.append(result)
+    return results
+
+def write_results(filename, results, label=None):
+    """
+    Writes benchmark results as JSON (with run metadata) or, for .csv files, as CSV.
+
+    Parameters:
+    - filename (str): Output file.
+    - results (list): Results of every case.
+    - label (str): Name of the measured version (default is None).
+    """
+    if filename.endswith(".csv"):
+        with open(filename, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        return
+    metadata = {"label": label,
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform()}
+    with open(filename, 'w') as file:
+        json.dump({"metadata": metadata, "results": results}, file, indent=2)
+
+def compare_results(baseline, results):
+    """
+    Prints the throughput of every case relative to a previous benchmark run.
+
+    Parameters:
+    - baseline (str): JSON file written by an earlier run.
+    - results (list): Results of the current run.
+    """
+    with open(baseline, 'r') as file:
+        previous = {(row["algorithm"], row["tasks"], row["time"], row["eventDriven"], row.get("vectorized", False)): row for row in json.load(file)["results"]}
+    for result in results:
+        row = previous.get((result["algorithm"], result["tasks"], result["time"], result["eventDriven"], result["vectorized"]))
+        if row:
+            print(f"{result['algorithm']} n={result['tasks']} t={result['time']}: "
+                  f"{result['ticks_per_sec'] / row['ticks_per_sec']:.2f}x ticks/s, "
+                  f"{result['log_bytes'] - row['log_bytes']:+d} log bytes")
+
+def main():
+    parser = argparse.ArgumentParser(description='Real-Time Scheduling Simulator - throughput benchmark')
+    parser.add_argument('-a', '--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS, help='Scheduling algorithms')
+    parser.add_argument('-n', '--tasks', nargs='+', type=int, default=[5, 20, 50], help='Task counts')
+    parser.add_argument('-t', '--times', nargs='+', type=int, default=[10000, 100000], help='Simulation times')
+    parser.add_argument('-u', '--utilization', type=float, default=0.9, help='Total utilization of the generated task sets')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Seed of the generated task sets')
+    parser.add_argument('-e', '--event-driven', action='store_true', help='Jump time between scheduling events instead of stepping every tick')
+    parser.add_argument('--vectorized', action='store_true', help='Use the NumPy task table')
+    parser.add_argument('--no-trace', action='store_true', help='Do not log the per-tick trace records')
+    parser.add_argument('-o', '--output', type=str, default='benchmark.json', help='Results file (.json or .csv)')
+    parser.add_argument('--label', type=str, default=None, help='Name of the measured version, stored in the JSON metadata')
+    parser.add_argument('--compare', type=str, default=None, help='JSON results of a previous run to compare against')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.algorithms, args.tasks, args.times, args.utilization, args.seed,
+                            eventDriven=args.event_driven, vectorized=args.vectorized, trace=not args.no_trace)
+    write_results(args.output, results, args.label)
+    if args.compare:
+        compare_results(args.compare, results)
+
+if __name__ == '__main__':
+    main()
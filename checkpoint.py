@@ -0,0 +1,72 @@
+import gzip
+import os
+import pickle
+
+CHECKPOINT_VERSION = 1  # Format of the checkpoint files
+
+def write_checkpoint(scheduler, filename):
+    """
+    Saves a scheduler with its tasks, CPUs, queue and statistics to a gzip-compressed pickle.
+
+    The file is written next to the target and then renamed over it, so a run
+    killed while saving keeps the previous checkpoint.
+
+    Parameters:
+    - scheduler (Scheduler): Scheduler to save.
+    - filename (str): Checkpoint file.
+    """
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with gzip.open(temporary, 'wb', compresslevel=6) as file:
+            pickle.dump({"version": CHECKPOINT_VERSION, "scheduler": scheduler}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, filename)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+def load_checkpoint(filename):
+    """
+    Restores a scheduler from a checkpoint. Its `run` continues from the saved tick.
+
+    Every call returns an independent scheduler, so several variants can branch
+    from the same checkpoint. The restored scheduler writes no checkpoints
+    until `set_checkpoint` is called again, so variants never replace the
+    checkpoint they branched from.
+
+    Parameters:
+    - filename (str): Checkpoint file.
+
+    Returns:
+    - Scheduler: Restored scheduler.
+    """
+    with gzip.open(filename, 'rb') as file:
+        checkpoint = pickle.load(file)
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{filename} is not a checkpoint of this simulator version")
+    return resumable(checkpoint["scheduler"])
+
+def fork(scheduler):
+    """
+    Copies a scheduler in memory, as if it was saved and restored from a checkpoint.
+
+    Parameters:
+    - scheduler (Scheduler): Scheduler stopped between ticks (for example at the end of a warm-up run).
+
+    Returns:
+    - Scheduler: Independent copy whose `run` continues from the current tick.
+    """
+    return resumable(pickle.loads(pickle.dumps(scheduler, protocol=pickle.HIGHEST_PROTOCOL)))
+
+def resumable(scheduler):
+    """
+    Marks a restored scheduler so `run` continues instead of starting over.
+
+    Parameters:
+    - scheduler (Scheduler): Restored scheduler.
+
+    Returns:
+    - Scheduler: The same scheduler.
+    """
+    scheduler.resumed = True
+    scheduler.set_checkpoint(None)
+    return scheduler
@@ -1,53 +1,154 @@
 import argparse
+import importlib.util
+import os
 import sys
 from task import Task
-from rms import RateMonotonicScheduler
-from edf import EarliestDeadlineFirstScheduler
-from file_manager import read_tasks_from_file, write_statistics_to_file
+from simulation import ALGORITHMS, create_scheduler
+from multiprocessor import PARTITIONING
+from servers import SERVERS, create_server
+from checkpoint import load_checkpoint
+from task_loader import iter_tasks
+from file_manager import write_statistics_to_file, write_analysis_to_file
+from analysis import Verdict
+from profiler import PhaseProfiler, format_profile
+from timeline import DEFAULT_PIXELS, EXPORT_FORMATS, EXPORT_PACKAGES, export_timeline
+from result_cache import ResultCache, DEFAULT_CACHE_SIZE
+from results_export import RESULT_FORMATS, ResultsExporter
 from cpu import CPU
+from logger import Logger
 
 def main():
     # Create an argument parser
     parser = argparse.ArgumentParser(description='Real-Time Scheduling Simulator')
 
     # Add command-line arguments
-    parser.add_argument('-i', '--input', type=str, required=True, help='Input file with tasks')
+    parser.add_argument('-i', '--input', type=str, help='Input file with tasks')
     parser.add_argument('-o', '--output', type=str, required=True, help='Output file for statistics')
-    parser.add_argument('-a', '--algorithm', type=str, required=True, choices=['RMS', 'EDF', 'EDFA'], help='Scheduling algorithm')
-    parser.add_argument('-t', '--time', type=int, required=True, help='Simulation time')
+    parser.add_argument('-a', '--algorithm', type=str, choices=ALGORITHMS, help='Scheduling algorithm')
+    parser.add_argument('-t', '--time', type=int, help='Simulation time (with --resume, the new end of the run)')
+    parser.add_argument('-m', '--metrics', type=str, required=False, help='Output file for the job metrics (response time, lateness, start jitter, preemptions)')
     parser.add_argument('-r', '--random', type=bool, required=False, help='Random Init Times')
+    parser.add_argument('-s', '--seed', type=int, required=False, help='Seed of the random init times')
+    parser.add_argument('-c', '--cpus', type=int, default=1, help='Number of identical CPUs (RMS and EDF only)')
+    parser.add_argument('--partition', type=str, choices=PARTITIONING, help='Partition the tasks among the CPUs with this heuristic instead of scheduling them globally')
+    parser.add_argument('--server', type=str, choices=list(SERVERS), help='Serve the aperiodic jobs of --aperiodic next to the periodic tasks with this server (EDF only)')
+    parser.add_argument('--aperiodic', type=str, help='File with aperiodic jobs (pid,arrival,execution_time,deadline) for --server')
+    parser.add_argument('--server-budget', type=int, default=1, help='Execution budget of the aperiodic server per period')
+    parser.add_argument('--server-period', type=int, default=10, help='Period of the aperiodic server')
+    parser.add_argument('-e', '--event-driven', action='store_true', help='Jump time between scheduling events instead of stepping every tick')
+    parser.add_argument('--vectorized', action='store_true', help='Find releases and expired deadlines with NumPy array operations (for large task sets)')
+    parser.add_argument('--hyperperiod', action='store_true', help='Simulate periodic runs until the schedule repeats and extrapolate the statistics')
+    parser.add_argument('--log-level', type=str, default='DEBUG', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], help='Minimum level of the log records')
+    parser.add_argument('--no-trace', action='store_true', help='Do not log the per-tick trace records')
+    parser.add_argument('--no-cache', action='store_true', help='Parse the input file again instead of using its cache')
+    parser.add_argument('--analyze', action='store_true', help='Run the schedulability analysis and simulate only if it is inconclusive')
+    parser.add_argument('--checkpoint', type=str, help='Save the simulation state to this file, to resume or fork the run later')
+    parser.add_argument('--checkpoint-every', type=int, default=0, help='Simulation time between checkpoints (default: only at the end of the run)')
+    parser.add_argument('--resume', type=str, help='Continue the run saved in this checkpoint file instead of reading --input')
+    parser.add_argument('--timeline', type=str, help='Export the execution timeline to this file (.html, .png or .svg) without opening a window')
+    parser.add_argument('--timeline-range', type=int, nargs=2, metavar=('START', 'END'), help='Time window of the exported timeline (default: the whole run)')
+    parser.add_argument('--timeline-width', type=int, default=DEFAULT_PIXELS, help='Horizontal resolution the exported timeline is decimated to')
+    parser.add_argument('--profile', action='store_true', help='Time the phases of the scheduling loop and print the breakdown at the end of the run')
+    parser.add_argument('--profile-output', type=str, help='With --profile, also dump the cProfile statistics of the run to this file (read it with pstats)')
+    parser.add_argument('--async-log', action='store_true', help='Write log records in batches from a background thread')
+    parser.add_argument('--result-cache', type=str, help='Reuse the result of an identical earlier run stored in this directory')
+    parser.add_argument('--result-cache-size', type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024), help='Megabytes of results kept in --result-cache')
+    parser.add_argument('--export', type=str, help='Append the task statistics, job records and CPU segments of the run to the dataset in this directory')
+    parser.add_argument('--export-format', type=str, default='csv', choices=RESULT_FORMATS, help='Format of the --export tables (parquet needs pyarrow)')
+    parser.add_argument('--run-id', type=str, help='Identifier of the run in the --export rows (default: the algorithm and the current time)')
 
     # Parse the command-line arguments
     args = parser.parse_args()
+    if not args.resume and not (args.input and args.algorithm and args.time is not None):
+        parser.error('-i, -a and -t are required unless --resume is given')
+    if args.checkpoint and args.partition:
+        parser.error('partitioned runs simulate every CPU in its own process and cannot be checkpointed')
+    if (args.profile or args.profile_output) and args.partition:
+        parser.error('partitioned runs simulate every CPU in its own process and cannot be profiled')
+    if args.cpus > 1 and args.algorithm == 'EDFA':
+        parser.error('EDFA runs on a single CPU')
+    if bool(args.server) != bool(args.aperiodic) or (args.server and (args.algorithm != 'EDF' or args.cpus > 1)):
+        parser.error('--server and --aperiodic go together, with EDF on a single CPU')
+    if args.result_cache and (args.resume or args.checkpoint or args.profile or args.profile_output):
+        parser.error('--result-cache cannot be combined with --resume, --checkpoint or --profile')
+    if args.export and (args.partition or args.hyperperiod or args.result_cache):
+        parser.error('--export records every simulated job and cannot be combined with --partition, --hyperperiod or --result-cache')
+    if args.export and args.export_format == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        parser.error('--export-format parquet needs the pyarrow package')
+    if args.timeline and not args.timeline.lower().endswith(EXPORT_FORMATS):
+        parser.error(f"--timeline must end in one of {', '.join(EXPORT_FORMATS)}")
+    if args.timeline:
+        extension = os.path.splitext(args.timeline)[1].lower()
+        missing = [package for package in EXPORT_PACKAGES[extension] if importlib.util.find_spec(package) is None]
+        if missing:
+            parser.error(f"--timeline {extension} needs the {', '.join(missing)} package{'s' if len(missing) > 1 else ''}")
 
-    # Initialize variables
-    aperiodic = False
-    cpu = CPU("Processor")
+    # Configure logging before any logger is created
+    Logger.configure(level=args.log_level, trace=not args.no_trace, asynchronous=args.async_log)
 
-    # Choose the scheduler based on the selected algorithm
-    if args.algorithm == 'RMS':
-        scheduler = RateMonotonicScheduler(args.time, args.algorithm, cpu=cpu)
-    elif args.algorithm == 'EDF':
-        scheduler = EarliestDeadlineFirstScheduler(args.time, args.algorithm, cpu=cpu)
-    elif args.algorithm == 'EDFA':
-        scheduler = EarliestDeadlineFirstScheduler(args.time, args.algorithm, cpu=cpu, aperiodic=True, randomGenerator=args.random)
-        aperiodic = True
+    if args.resume:
+        # Continue a saved run; every call branches an independent variant from the checkpoint
+        scheduler = load_checkpoint(args.resume)
+        if args.time is not None:
+            scheduler.simulation_time = args.time
+        if args.event_driven:
+            scheduler.eventDriven = True
+    else:
+        # Choose the scheduler based on the selected algorithm
+        cpu = CPU("Processor")
+        server = create_server(args.server, args.server_budget, args.server_period) if args.server else None
+        scheduler = create_scheduler(args.algorithm, args.time, cpu, randomGenerator=args.random, seed=args.seed, cpus=args.cpus, partitioning=args.partition, server=server, eventDriven=args.event_driven, extrapolate=args.hyperperiod, vectorized=args.vectorized)
 
-    # Read tasks from the input file
-    tasks = read_tasks_from_file(args.input, aperiodic=aperiodic)
+        # Stream the tasks of the input file into the scheduler
+        for task in iter_tasks(args.input, aperiodic=args.algorithm == 'EDFA', cache=not args.no_cache):
+            scheduler.add_task(task)
+        if args.aperiodic:
+            for task in iter_tasks(args.aperiodic, cache=not args.no_cache, arrivals=True):
+                scheduler.add_aperiodic_task(task)
 
-    # Add tasks to the scheduler
-    for task in tasks:
-        scheduler.add_task(task)
+        # Accept or reject the task set analytically when possible
+        if args.analyze:
+            verdict, results = scheduler.analyze()
+            for result in results:
+                print(f"{result['test']}: {result['verdict'].value} ({result['detail']})")
+            if verdict != Verdict.inconclusive:
+                write_analysis_to_file(args.output, verdict, results)
+                Logger.shutdown()
+                return
+
+    if args.checkpoint:
+        scheduler.set_checkpoint(args.checkpoint, args.checkpoint_every)
+
+    # Stream the job records of the run to the dataset while it runs
+    exporter = ResultsExporter(scheduler, args.export, args.export_format, args.run_id) if args.export else None
 
     # Run the scheduler
-    scheduler.run()
+    if args.profile or args.profile_output:
+        profiler = PhaseProfiler(scheduler)
+        report = profiler.run(args.profile_output)
+        print(format_profile(report, profiler.elapsed, profiler.ticks))
+    elif args.result_cache:
+        if ResultCache(args.result_cache, args.result_cache_size * 1024 * 1024).run(scheduler, args.seed):
+            print(f"Result restored from {args.result_cache}")
+    else:
+        scheduler.run()
+
+    if exporter:
+        exporter.close()
 
     # Get statistics from the scheduler
     statistics = scheduler.get_statistics()
 
     # Write statistics to the output file
     write_statistics_to_file(args.output, statistics)
+    if args.metrics:
+        write_statistics_to_file(args.metrics, scheduler.get_job_metrics())
+    if args.timeline:
+        start, finish = args.timeline_range if args.timeline_range else (0, None)
+        export_timeline(scheduler.cpu_histories(), args.timeline, start, finish, args.timeline_width)
+
+    # Flush pending log records
+    Logger.shutdown()
 
 if __name__ == '__main__':
     main()
@@ -2,6 +2,7 @@ LOGS_PATH="logs/"
 CPU_LOGGER="log-cpu"
 SCHEDULER_LOGGER="log-scheduler"
 TASK_LOGGER="log-task"
+RUN_LOGGER="log-run"
 DEFAULT_SENDER=-1
 DEFAULT_PRIORITY=1
 GENERAL_STATISTICS = "GENERAL_STATISTICS"
\ No newline at end of file
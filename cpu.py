@@ -1,54 +1,60 @@
-import pandas as pd
 from datetime import datetime, timedelta
-from tabulate import tabulate
 from logger import Logger
+from execution_history import ExecutionHistory, IDLE
+from events import SchedulerEvent
 from constants import CPU_LOGGER
 
 class CPU:
-    def __init__(self, name):
+    def __init__(self, name, cleanLogs=True):
         """
         Initializes the CPU object with a name and sets initial attributes.
 
         Parameters:
         - name (str): The name of the CPU.
+        - cleanLogs (bool): Indicates if the logs of previous runs are removed (default is True; False for the extra cores of a multiprocessor).
         """
         self.name = name
         self.current_task = None
-        self.execution_history = []
+        self.execution_history = ExecutionHistory()
         self.preemp = True
+        self.notify = None  # Scheduler.emit while dispatch or idle events are observed
         self.logPath = CPU_LOGGER + "-" + name
-        self.logger = Logger(self.logPath, clean=True) 
+        self.logger = Logger(self.logPath, clean=cleanLogs) 
 
-    def run_task(self, task, current_time):
+    def run_task(self, task, current_time, ticks=1):
         """
         Runs a task on the CPU.
 
         Parameters:
         - task (Task): The task to be executed.
         - current_time (datetime): The current time.
+        - ticks (int): Number of consecutive time units the task runs (default is 1).
 
         Returns:
         - task (Task): The task being executed.
         - finished (bool): Whether the task has finished execution.
         """
-        history_entry =  {"Task": task.pid , "Start": current_time, "Finish": current_time + 1}
-        self.execution_history.append(history_entry)
+        if self.notify is not None and self.current_task is not task:
+            self.notify(SchedulerEvent.dispatch, current_time, task.pid, self.name)
+        self.execution_history.append(task.pid, current_time, ticks)
         self.current_task = task
-        finished = task.run(current_time)
+        finished = task.run(current_time, ticks)
         if finished:
             self.current_task = None
         return task, finished
     
-    def empty_run(self, current_time):
+    def empty_run(self, current_time, ticks=1):
         """
         Runs an empty cycle on the CPU (no task execution).
 
         Parameters:
         - current_time (datetime): The current time.
+        - ticks (int): Number of consecutive idle time units (default is 1).
         """
         self.current_task = None
-        history_entry =  {"Task": self.current_task , "Start": current_time, "Finish": current_time + 1}
-        self.execution_history.append(history_entry)
+        if self.notify is not None and (not self.execution_history.tasks or self.execution_history.tasks[-1] != IDLE):
+            self.notify(SchedulerEvent.idle, current_time, cpu=self.name)
+        self.execution_history.append(self.current_task, current_time, ticks)
 
     def killProcess(self, task_pid):
         """
@@ -65,16 +71,16 @@ class CPU:
         Returns the execution history of the CPU.
 
         Returns:
-        - execution_history (list): List of dictionaries representing CPU execution history.
+        - execution_history (ExecutionHistory): Run-length encoded history; iterating it yields the per-tick dictionaries.
         """
         return self.execution_history
 
     def print_history(self):
         """
-        Prints the CPU execution history.
+        Prints the CPU execution history, one row per coalesced segment.
         """
-        # Create a pandas DataFrame from the list of dictionaries
-        df = pd.DataFrame(self.execution_history)
+        from tabulate import tabulate
+        df = self.execution_history.to_dataframe()
 
         # Print the table using tabulate with "grid" style
         self.logger.info(f"CPU Log:\n{tabulate(df, headers='keys', tablefmt='grid')}")
@@ -1,6 +1,32 @@
-from scheduler import Scheduler, ExecutableItems
+from bisect import bisect_left
+from itertools import chain
+from scheduler import Scheduler, ExecutableItems, Statistic
+from analysis import analyze_edf, job_demand_test, combine
+from task import Task
 
 class EarliestDeadlineFirstScheduler(Scheduler):
+    def __init__(self, simulation_time, name, cpu, server=None, **options):
+        """
+        Initializes the EDF scheduler.
+
+        Parameters:
+        - simulation_time (int): Total simulation time.
+        - name (str): Name of the scheduler.
+        - cpu (CPU): CPU object for task execution.
+        - server (AperiodicServer): Server of the aperiodic jobs added with `add_aperiodic_task` next to the periodic tasks (default is None).
+        - options: Other Scheduler flags (aperiodic, randomGenerator, eventDriven, extrapolate, seed, vectorized).
+        """
+        if server is not None:
+            # Aperiodic arrivals break the hyperperiod pattern, and aperiodic jobs have no TaskTable row
+            options["extrapolate"] = False
+            options["vectorized"] = False
+        super().__init__(simulation_time, name, cpu, **options)
+        self.server = server
+        self.server_priority = 0
+        self.aperiodic_tasks = []
+        self.arrivals = {}
+        self.arrival_times = []
+
     def run(self):
         """
         Runs the scheduler based on whether it is aperiodic or periodic.
@@ -10,6 +36,38 @@ class EarliestDeadlineFirstScheduler(Scheduler):
         else:
             self.runPeriodic()
 
+    def schedulability_tests(self):
+        """
+        Runs the processor-demand analysis for periodic tasks, or the job demand test for aperiodic ones.
+
+        With a server, its bandwidth is analyzed as one more periodic task (budget every server period).
+
+        Returns:
+        - Tuple[Verdict, list]: Overall verdict and the results of the tests run.
+        """
+        if not self.aperiodic:
+            tasks = self.tasks
+            if self.server is not None:
+                execution_time, period, deadline = self.server.task()
+                tasks = tasks + [Task(pid=self.server.policy.value, period=period, execution_time=execution_time, deadline=deadline)]
+            return analyze_edf(tasks)
+        results = [job_demand_test([(task.startedTime, task.execution_time, task.startedTime + task.deadline) for task in self.tasks])]
+        return combine(results), results
+
+    def add_aperiodic_task(self, task):
+        """
+        Adds an aperiodic job, served by the server next to the periodic tasks. Its arrival time is the period column.
+
+        Parameters:
+        - task (Task): Aperiodic job to be added.
+        """
+        if self.server is None:
+            raise ValueError("Aperiodic jobs next to periodic tasks need an aperiodic server")
+        self.track_task(task)
+        self.schedule_arrival(task)
+        self.aperiodic_tasks.append(task)
+        self.task_registry.setdefault(task.pid, task)
+
     def validateNewTasks(self, task):
         """
         Validates new tasks and adds them to the execution queue if they meet certain conditions.
@@ -19,12 +77,12 @@ class EarliestDeadlineFirstScheduler(Scheduler):
         """
         if task.startedTime == self.current_time:
             if not self.isExecuting(task) and task.aperiodic:
-                self.execution_queue.append({ExecutableItems.pid.value: task.pid, 
-                                         ExecutableItems.period.value: task.period, 
-                                         ExecutableItems.deadline.value: task.deadline + task.startedTime, 
-                                         ExecutableItems.startTime.value: task.startedTime,
-                                         ExecutableItems.delete.value: False})
-                self.execution_queue.sort(key=lambda executable: executable[ExecutableItems.deadline.value])
+                executable = {ExecutableItems.pid.value: task.pid, 
+                              ExecutableItems.period.value: task.period, 
+                              ExecutableItems.deadline.value: task.deadline + task.startedTime, 
+                              ExecutableItems.startTime.value: task.startedTime,
+                              ExecutableItems.delete.value: False}
+                self.enqueue(executable, executable[ExecutableItems.deadline.value])
     
     def isExecuting(self, task):
         """
@@ -34,62 +92,188 @@ class EarliestDeadlineFirstScheduler(Scheduler):
         - task (Task): The task to be checked.
 
         Returns:
-        - isExec (bool): True if the task is executing, False otherwise.
+        - isExec (bool): True if the task started and is in the execution queue, False otherwise.
+        """
+        return task.started and task.pid in self.execution_queue
+
+    def build_arrival_calendar(self, tasks):
         """
-        isExec = False
-        if task.started:
-            for executable in self.execution_queue:
-                executable[ExecutableItems.pid.value] == task.pid
-                isExec = True
-        return isExec
+        Groups aperiodic tasks by arrival time, so each tick only visits the tasks that arrive then.
+
+        Parameters:
+        - tasks (list): Aperiodic tasks, in priority order.
+        """
+        self.arrivals = {}
+        for task in tasks:
+            self.arrivals.setdefault(task.startedTime, []).append(task)
+        self.arrival_times = sorted(self.arrivals)
+
+    def next_arrival_time(self):
+        """
+        Gets the first arrival time from the current time on.
+
+        Returns:
+        - int: Time of the next arrival, or `simulation_time` if there is none.
+        """
+        index = bisect_left(self.arrival_times, self.current_time)
+        return self.arrival_times[index] if index < len(self.arrival_times) else self.simulation_time
+
+    def next_release_time(self):
+        """
+        Gets the first time, from the current time on, at which a task is released.
+
+        Returns:
+        - int: Time of the next release or arrival, or `simulation_time` if there is none.
+        """
+        if self.aperiodic:
+            return self.next_arrival_time()
+        if self.server is not None:
+            return min(super().next_release_time(), self.next_arrival_time())
+        return super().next_release_time()
+
+    def released_tasks(self):
+        """
+        Gets the tasks whose release has to be handled at the current time.
+
+        Returns:
+        - iterable: The periodic tasks and, from the arrival calendar, the aperiodic tasks that arrive at the current time.
+        """
+        if self.aperiodic:
+            return self.arrivals.get(self.current_time, [])
+        if self.server is not None:
+            return chain(super().released_tasks(), self.arrivals.get(self.current_time, []))
+        return super().released_tasks()
+
+    def serveArrival(self, task):
+        """
+        Hands an aperiodic job that arrives to the server.
+
+        Parameters:
+        - task (Task): Aperiodic job.
+        """
+        self.logger.info("Aperiodic task %s arrived at %s", task.pid, self.current_time)
+        if self.server.arrive(task, self.current_time):
+            self.promote()
+
+    def promote(self):
+        """
+        Sends the head job of the server to the execution queue with the deadline the server assigns, if the server may run.
+        """
+        task = self.server.head()
+        if task is None or task.pid in self.execution_queue or not self.server.eligible(self.current_time):
+            return
+        deadline = self.server.start(self.current_time)
+        task.priority = self.server_priority
+        executable = {ExecutableItems.pid.value: task.pid,
+                      ExecutableItems.period.value: task.period,
+                      ExecutableItems.deadline.value: deadline,
+                      ExecutableItems.startTime.value: task.startedTime,
+                      ExecutableItems.delete.value: False}
+        self.enqueue(executable, deadline)
+        self.logger.info("Server %s serving %s with deadline %s at %s", self.server.policy.value, task.pid, deadline, self.current_time)
+
+    def charge_server(self, executable, task, finished):
+        """
+        Charges the tick the head job of the server ran and applies the budget rules.
+
+        Parameters:
+        - executable (dict): Executable of the head job.
+        - task (Task): Head job.
+        - finished (bool): Indicates if the job finished in this tick.
+        """
+        exhausted = self.server.consume(self.current_time)
+        if finished:
+            self.server.finish(self.current_time)
+            self.promote()
+        elif exhausted and self.server.eligible(self.current_time):
+            # The budget was recharged or a new replenishment opened, with a later deadline
+            executable[ExecutableItems.deadline.value] = self.server.deadline
+            self.execution_queue.update(executable, self.server.deadline)
+        elif exhausted:
+            # Out of budget, the job waits for the next replenishment outside the queue
+            self.logger.warning("Server %s suspended %s at %s", self.server.policy.value, task.pid, self.current_time)
+            self.execution_queue.discard(executable)
+            self.job_preempted(task)
+            self.cpu.killProcess(task.pid)
+
+    def dispatch(self):
+        """
+        Replenishes the server budget, drops the aperiodic jobs that expired waiting for the server and dispatches.
+        """
+        if self.server is not None:
+            self.server.replenish(self.current_time)
+            head = self.server.head()
+            for task in self.server.expired(self.current_time, head is not None and head.pid in self.execution_queue):
+                self.logger.warning("Deadline of task %s met at %s", task.pid, self.current_time)
+                self.update_statistics(task, Statistic.missed_deadlines)
+                task.resetTask()
+            self.promote()
+        super().dispatch()
+
+    def send_task_to_cpu(self, task_pid):
+        """
+        Sends a task to the CPU for execution, charging the server when its head job runs.
+
+        Parameters:
+        - task_pid (dict): Executable of the task to send.
+
+        Returns:
+        - Tuple[Task, bool, bool]: Tuple containing the new task, finished flag, and executed flag.
+        """
+        task, finished, executed = super().send_task_to_cpu(task_pid)
+        if executed and self.server is not None and task is self.server.head():
+            self.charge_server(task_pid, task, finished)
+        return task, finished, executed
+
+    def is_deadline_met(self, task_pid):
+        """
+        Checks if the deadline of a task is met. An expired head job of the server makes room for the next one.
+
+        Parameters:
+        - task_pid (dict): Executable of the task to check.
+
+        Returns:
+        - bool: True if the deadline is met, False otherwise.
+        """
+        deadline_met = super().is_deadline_met(task_pid)
+        if deadline_met and self.server is not None and self.getTask(task_pid) is self.server.head():
+            self.server.finish(self.current_time)
+            self.promote()
+        return deadline_met
+
+    def fast_forward(self):
+        """
+        Jumps to the next scheduling event. While the server has jobs its budget changes every tick, so time is stepped.
+        """
+        if self.server is not None and self.server.head() is not None:
+            return
+        super().fast_forward()
 
     def runAperiodic(self):
         """
         Runs the scheduler for aperiodic tasks.
         """
-        self.tasks.sort(key=lambda task: task.deadline + task.startedTime)  # RMS: Ordena por periodo (menor a mayor)
-        self.assign_priorities()
-        for self.current_time in range(self.simulation_time):
-            self.garbageCollector()
-            for task in self.tasks:
-                self.validateNewTasks(task)
-            executed = False
-            count_executables = len(self.execution_queue)
-            self.evaluateEmptyRun(-1, executed, count_executables)
-            for index, task_pid in enumerate(self.execution_queue):
-                if not self.is_deadline_met(task_pid) and not executed:
-                    task, task_finished, executed = self.send_task_to_cpu(task_pid)
-                    if task_finished:
-                        self.logger.info(f"Task {task.pid} finished at {self.current_time}")
-                        self.removeExecutable(task.pid)
-                    self.updateTask(task)
-                else:
-                    self.evaluateEmptyRun(index, executed, count_executables)
-        self.cpu.print_history()
-        self.save_statistics()
+        if not self.resumed:
+            # Start times change once tasks run, so a restored run keeps its order and calendar
+            self.tasks.sort(key=lambda task: task.deadline + task.startedTime)  # RMS: Ordena por periodo (menor a mayor)
+            self.assign_priorities()
+            self.build_arrival_calendar(self.tasks)
+        self.simulate(self.validateNewTasks, ExecutableItems.deadline)
 
     def runPeriodic(self):
         """
-        Runs the scheduler for periodic tasks.
+        Runs the scheduler for periodic tasks, and the aperiodic jobs of the server if there is one.
         """
         self.tasks.sort(key=lambda task: task.deadline)  # RMS: Ordena por periodo (menor a mayor)
         self.assign_priorities()
-
-        for self.current_time in range(self.simulation_time):
-            self.garbageCollector()
-            for task in self.tasks:
-                self.periodTriggered(task, ExecutableItems.deadline)
-            executed = False
-            count_executables = len(self.execution_queue)
-            self.evaluateEmptyRun(-1, executed, count_executables)
-            for index, task_pid in enumerate(self.execution_queue):
-                if not self.is_deadline_met(task_pid) and not executed:
-                    task, task_finished, executed = self.send_task_to_cpu(task_pid)
-                    if task_finished:
-                        self.logger.info(f"Task {task.pid} finished at {self.current_time}")
-                        self.removeExecutable(task.pid)
-                    self.updateTask(task)
-                else:
-                    self.evaluateEmptyRun(index, executed, count_executables)
-        self.cpu.print_history()
-        self.save_statistics()
+        if self.server is None:
+            self.simulate(lambda task: self.periodTriggered(task, ExecutableItems.deadline), ExecutableItems.deadline)
+            return
+        # The server preempts like a periodic task whose relative deadline is the server period
+        self.server_priority = sum(task.deadline <= self.server.period for task in self.tasks)
+        for task in self.tasks[self.server_priority:]:
+            task.priority += 1
+        for task in self.aperiodic_tasks:
+            self.task_registry.setdefault(task.pid, task)
+        self.build_arrival_calendar(self.aperiodic_tasks)
+        self.simulate(lambda task: self.serveArrival(task) if task.aperiodic else self.periodTriggered(task, ExecutableItems.deadline), ExecutableItems.deadline)
@@ -0,0 +1,43 @@
+from enum import Enum
+
+class SchedulerEvent(Enum):
+    release = "Release"  # A job entered the execution queue
+    start = "Start"  # A job got a CPU for the first time since its release
+    dispatch = "Dispatch"  # A CPU switched to a job (first run of the job or after a preemption)
+    preemption = "Preemption"  # A running job lost its CPU to a higher-priority one
+    completion = "Completion"  # A job finished its execution time
+    deadline_miss = "DeadlineMiss"  # A job missed its deadline (count > 1 when extrapolated)
+    idle = "Idle"  # A CPU became idle
+    queue_gc = "QueueGC"  # The garbage collector removed an entry from the execution queue
+
+class SchedulingEvent:
+    """
+    Scheduling decision reported to the observers of a Scheduler.
+
+    Attributes:
+    - kind (SchedulerEvent): What happened.
+    - time (int): Simulation time of the event.
+    - pid (str): PID of the task involved, or None for idle events.
+    - cpu (str): Name of the CPU involved, or None if the event is not tied to a CPU.
+    - count (int): Number of occurrences the event stands for.
+    """
+    __slots__ = ("kind", "time", "pid", "cpu", "count")
+
+    def __init__(self, kind, time, pid=None, cpu=None, count=1):
+        self.kind = kind
+        self.time = time
+        self.pid = pid
+        self.cpu = cpu
+        self.count = count
+
+    def as_dict(self):
+        """
+        Converts the event to a dictionary, for exporters.
+
+        Returns:
+        - dict: Event fields, with the kind as its string value.
+        """
+        return {"Event": self.kind.value, "Time": self.time, "Task": self.pid, "CPU": self.cpu, "Count": self.count}
+
+    def __repr__(self):
+        return f"SchedulingEvent({self.kind.value}, time={self.time}, pid={self.pid}, cpu={self.cpu}, count={self.count})"
@@ -0,0 +1,123 @@
+from array import array
+from bisect import bisect_right
+
+IDLE = -1  # Task index used for ticks where the CPU runs empty
+
+class ExecutionHistory:
+    """
+    Execution history of a CPU stored as run-length encoded segments.
+
+    Contiguous ticks of the same task are merged into one (start, finish, task)
+    row kept in typed arrays, so memory grows with the number of context
+    switches instead of the simulation length. The history still behaves as the
+    old list of per-tick {"Task", "Start", "Finish"} dictionaries: it can be
+    iterated, indexed and measured, and the dictionaries are built lazily.
+
+    Attributes:
+    - starts (array): Start time of every segment.
+    - finishes (array): Finish time (exclusive) of every segment.
+    - tasks (array): Index in `names` of the task of every segment, or IDLE.
+    - offsets (array): Number of ticks recorded before every segment.
+    - names (list): Task PIDs by index.
+    """
+    def __init__(self):
+        """
+        Initializes an empty ExecutionHistory.
+        """
+        self.starts = array('q')
+        self.finishes = array('q')
+        self.tasks = array('l')
+        self.offsets = array('q')
+        self.names = []
+        self.indexes = {}
+        self.ticks = 0
+
+    def append(self, task_pid, start, ticks=1):
+        """
+        Records that a task ran on the CPU, merging it with the last segment when possible.
+
+        Parameters:
+        - task_pid (str): PID of the task, or None for an empty run.
+        - start (int): First tick of the run.
+        - ticks (int): Number of consecutive ticks (default is 1).
+        """
+        if task_pid is None:
+            index = IDLE
+        else:
+            index = self.indexes.get(task_pid)
+            if index is None:
+                index = self.indexes[task_pid] = len(self.names)
+                self.names.append(task_pid)
+        if self.tasks and self.tasks[-1] == index and self.finishes[-1] == start:
+            self.finishes[-1] = start + ticks
+        else:
+            self.starts.append(start)
+            self.finishes.append(start + ticks)
+            self.tasks.append(index)
+            self.offsets.append(self.ticks)
+        self.ticks += ticks
+
+    def task_name(self, index):
+        """
+        Gets the PID of a task index.
+
+        Parameters:
+        - index (int): Task index of a segment.
+
+        Returns:
+        - str: PID of the task, or None for an empty run.
+        """
+        return None if index == IDLE else self.names[index]
+
+    def segments(self):
+        """
+        Iterates the coalesced segments.
+
+        Returns:
+        - generator: {"Task", "Start", "Finish"} dictionaries, one per segment.
+        """
+        for start, finish, index in zip(self.starts, self.finishes, self.tasks):
+            yield {"Task": self.task_name(index), "Start": start, "Finish": finish}
+
+    def __iter__(self):
+        """
+        Iterates the history tick by tick, in the old per-tick dictionary form.
+        """
+        for start, finish, index in zip(self.starts, self.finishes, self.tasks):
+            task = self.task_name(index)
+            for time in range(start, finish):
+                yield {"Task": task, "Start": time, "Finish": time + 1}
+
+    def __getitem__(self, position):
+        """
+        Gets the per-tick dictionary at a position of the expanded history.
+
+        Parameters:
+        - position (int): Tick position, negative values count from the end.
+
+        Returns:
+        - dict: {"Task", "Start", "Finish"} of that tick.
+        """
+        if position < 0:
+            position += self.ticks
+        if not 0 <= position < self.ticks:
+            raise IndexError("execution history index out of range")
+        segment = bisect_right(self.offsets, position) - 1
+        time = self.starts[segment] + position - self.offsets[segment]
+        return {"Task": self.task_name(self.tasks[segment]), "Start": time, "Finish": time + 1}
+
+    def __len__(self):
+        return self.ticks
+
+    def to_dataframe(self, expand=False):
+        """
+        Builds a pandas DataFrame of the history.
+
+        Parameters:
+        - expand (bool): Indicates if the rows are ticks instead of segments (default False).
+
+        Returns:
+        - DataFrame: History with Task, Start and Finish columns.
+        """
+        import pandas as pd
+        return pd.DataFrame(list(self) if expand else list(self.segments()), columns=["Task", "Start", "Finish"])
@@ -1,27 +1,18 @@
-from task import Task
+from task_loader import iter_tasks, write_task_rows
 
-def read_tasks_from_file(filename, aperiodic=False):
+def read_tasks_from_file(filename, aperiodic=False, cache=True):
     """
     Reads tasks from a file and creates Task objects.
 
     Parameters:
-    - filename (str): The name of the file containing task information.
+    - filename (str): The name of the file containing task information (CSV, JSON Lines or binary, see task_loader).
     - aperiodic (bool): Indicates whether the tasks are aperiodic.
+    - cache (bool): Indicates if the parsed rows are cached next to the file (default is True).
 
     Returns:
     - tasks (list): List of Task objects read from the file.
     """
-    tasks = []
-    with open(filename, 'r') as file:
-        for line in file:
-            pid, period, execution_time, deadline = line.split(',')
-            task = Task(pid=pid, 
-                        period=int(period), 
-                        execution_time=int(execution_time), 
-                        deadline=int(deadline), 
-                        aperiodic=aperiodic)
-            tasks.append(task)
-    return tasks
+    return list(iter_tasks(filename, aperiodic=aperiodic, cache=cache))
 
 def write_statistics_to_file(filename, statistics):
     """
@@ -34,3 +25,27 @@ def write_statistics_to_file(filename, statistics):
     with open(filename, 'w') as file:
         for task_name, stats in statistics.items():
             file.write(f"{task_name}: {stats}\n")
+
+def write_analysis_to_file(filename, verdict, results):
+    """
+    Writes the result of a schedulability analysis to a file.
+
+    Parameters:
+    - filename (str): The name of the file to write the analysis to.
+    - verdict (Verdict): Overall verdict.
+    - results (list): Results of the tests run.
+    """
+    with open(filename, 'w') as file:
+        for result in results:
+            file.write(f"{result['test']}: {result['verdict'].value} ({result['detail']})\n")
+        file.write(f"Verdict: {verdict.value}\n")
+
+def write_tasks_to_file(filename, tasks):
+    """
+    Writes tasks in the input file format given by the extension (CSV lines, JSON Lines or binary).
+
+    Parameters:
+    - filename (str): The name of the file to write the tasks to.
+    - tasks (list): (pid, period, execution_time, deadline) tuples.
+    """
+    write_task_rows(filename, tasks)
@@ -1,7 +1,5 @@
 import tkinter as tk
-from tkinter import Label, Entry, Button, Listbox, Scrollbar, END, messagebox, filedialog, Toplevel, Text, simpledialog
-import plotly.express as px
-import tkinterweb
+from tkinter import Label, Entry, Button, Listbox, Scrollbar, END, messagebox, filedialog, Toplevel, Text, simpledialog, Canvas
 import json
 import shlex
 import argparse
@@ -12,21 +10,28 @@ from rms import RateMonotonicScheduler
 from edf import EarliestDeadlineFirstScheduler
 from task import Task
 import random
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from constants import LOGS_PATH
+from timeline import plot_timeline
+from simulation_worker import SimulationWorker, WorkerEvent, PROGRESS_PIXELS
+from result_cache import ResultCache
 from file_manager import read_tasks_from_file, write_statistics_to_file
 
+POLL_INTERVAL = 100  # Milliseconds between two polls of the simulation worker
+LIVE_ROW_HEIGHT = 12  # Height of a task row in the live timeline, in pixels
+
 class gui():
     def __init__(self, root):
         self.root = root
         self.root.title("Task Scheduler Simulation Interface")
         self.cpu = CPU("Processor")
         self.random_case = tk.IntVar()
+        self.profile_runs = tk.IntVar()
         self.scheduler = None
         self.task_ids = set()
+        self.worker = SimulationWorker(ResultCache())
+        self.outputs = {}  # Statistics file of every queued CLI simulation
+        self.live_rows = {}  # Row of every task in the live timeline
         self.setup_initial_choice()
+        self.root.after(POLL_INTERVAL, self.poll_worker)
         
 
     def setup_initial_choice(self):
@@ -46,6 +51,7 @@ class gui():
         self.cli_command_entry = Entry(self.root, width=80)
         self.cli_command_entry.pack(pady=10)
         Button(self.root, text="Execute Command", command=self.execute_cli_command).pack(pady=10)
+        self.setup_progress_panel()
         Button(self.root, text="View Statistics", command=self.view_statistics).pack(pady=10)
         Button(self.root, text="View Timeline", command=self.load_and_plot_timeline).pack(pady=10)
         Button(self.root, text="Clear Simulation", command=self.clear_all_tasks).pack(pady=20)
@@ -54,7 +60,7 @@ class gui():
     def view_statistics(self):
         # Read log content
         try:
-            with open(LOGS_PATH + self.scheduler.logPath + "-statistics.log", 'r') as file:
+            with open(self.scheduler.statisticsLogger.filename, 'r') as file:
                 log_content = file.read()
             # Create a new window to display log content
             log_window = Toplevel(self.root)
@@ -70,20 +76,21 @@ class gui():
             args = self.parse_command(command_line)
             aperiodic = False
             if args:
+                # Queued simulations must not share the history of a CPU
+                self.cpu = CPU("Processor")
                 if args.algorithm == 'RMS':
-                    self.scheduler = RateMonotonicScheduler(args.time, args.algorithm, self.cpu)
+                    self.scheduler = RateMonotonicScheduler(args.time, args.algorithm, self.cpu, eventDriven=args.event_driven, extrapolate=args.hyperperiod)
                 elif args.algorithm == 'EDF':
-                    self.scheduler = EarliestDeadlineFirstScheduler(args.time, args.algorithm, self.cpu)
+                    self.scheduler = EarliestDeadlineFirstScheduler(args.time, args.algorithm, self.cpu, eventDriven=args.event_driven, extrapolate=args.hyperperiod)
                 elif args.algorithm == 'EDFA':
-                    self.scheduler = EarliestDeadlineFirstScheduler(args.time, args.algorithm, self.cpu, aperiodic=True, randomGenerator=args.random)  
+                    self.scheduler = EarliestDeadlineFirstScheduler(args.time, args.algorithm, self.cpu, aperiodic=True, randomGenerator=args.random, eventDriven=args.event_driven, extrapolate=args.hyperperiod)  
                     print(self.scheduler.name)    
                 tasks = read_tasks_from_file(args.input, aperiodic=aperiodic)
                 for task in tasks:
                    self.scheduler.add_task(task)
-                self.scheduler.run()
-                statistics = self.scheduler.get_statistics()
-                write_statistics_to_file(args.output, statistics)
-                messagebox.showinfo("Success", "Scheduler ran successfully and results saved.")
+                # Run in the background; the statistics are written when the worker reports the end
+                job = self.worker.submit(self.scheduler, profile=args.profile or self.profile_runs.get() > 0)
+                self.outputs[job] = args.output
             else:
                 messagebox.showerror("Error", "Failed to parse the command or initialize the scheduler.")
 
@@ -94,6 +101,9 @@ class gui():
         parser.add_argument('-a', '--algorithm', type=str, required=True, choices=['RMS', 'EDF', 'EDFA'], help='Algoritmo de scheduling')
         parser.add_argument('-t', '--time', type=int, required=True, help='Tiempo de simulación')
         parser.add_argument('-r', '--random', type=bool, required=False, help='Random Init Times')
+        parser.add_argument('-e', '--event-driven', action='store_true', help='Saltar el tiempo entre eventos de scheduling')
+        parser.add_argument('--hyperperiod', action='store_true', help='Simular hasta que el schedule se repite y extrapolar las estadísticas')
+        parser.add_argument('--profile', action='store_true', help='Medir el tiempo de cada fase del ciclo de scheduling')
 
         try:
             args = parser.parse_args(shlex.split(command_line))
@@ -155,6 +165,7 @@ class gui():
 
         Button(self.root, text="Add Task", command=self.add_task).pack(pady=10)
         Button(self.root, text="Run Simulation", command=self.run_scheduler).pack(pady=10)
+        self.setup_progress_panel()
         Button(self.root, text="View Statistics", command=self.view_statistics).pack(pady=10)
         Button(self.root, text="View Timeline", command=self.load_and_plot_timeline).pack(pady=10)
         Button(self.root, text="Clear Simulation", command=self.clear_all_tasks).pack(pady=20)
@@ -250,13 +261,100 @@ class gui():
         messagebox.showinfo("Ayuda", help_text)
 
     def run_scheduler(self):
-        self.scheduler.run()
-        messagebox.showinfo("Scheduler", "Scheduler has been run.")
+        # Run in the background; the end is reported by poll_worker
+        self.worker.submit(self.scheduler, profile=self.profile_runs.get() > 0)
+
+    def setup_progress_panel(self):
+        # Status, partial statistics and live timeline of the simulation running in the worker
+        self.progress_label = Label(self.root, text=self.queue_status("Idle"))
+        self.progress_label.pack()
+        self.partial_statistics_label = Label(self.root, text="")
+        self.partial_statistics_label.pack()
+        self.live_timeline = Canvas(self.root, width=PROGRESS_PIXELS, height=LIVE_ROW_HEIGHT, background="white")
+        self.live_timeline.pack(pady=5)
+        self.live_rows = {}
+        tk.Checkbutton(self.root, text="Profile Scheduling Phases", variable=self.profile_runs).pack()
+        Button(self.root, text="Cancel Simulation", command=self.worker.cancel).pack(pady=10)
+
+    def queue_status(self, status):
+        pending = self.worker.pending()
+        return f"{status} ({pending} queued)" if pending else status
+
+    def panel_alive(self):
+        # The panel is destroyed whenever the window changes screen
+        return hasattr(self, 'live_timeline') and self.live_timeline.winfo_exists()
+
+    def poll_worker(self):
+        # Drain the events of the simulation worker on the Tk thread
+        for event, job, payload in self.worker.poll():
+            if event == WorkerEvent.started:
+                self.show_progress(f"Simulation {job} running", reset=True)
+            elif event == WorkerEvent.progress:
+                self.show_partial_results(job, payload)
+            elif event == WorkerEvent.profiled:
+                self.show_profile(job, payload)
+            elif event == WorkerEvent.finished:
+                self.scheduler = payload
+                self.cpu = payload.cpu
+                self.show_progress(f"Simulation {job} finished")
+                if job in self.outputs:
+                    write_statistics_to_file(self.outputs.pop(job), payload.get_statistics())
+                    messagebox.showinfo("Success", "Scheduler ran successfully and results saved.")
+                else:
+                    messagebox.showinfo("Scheduler", "Scheduler has been run.")
+            elif event == WorkerEvent.cancelled:
+                self.outputs.pop(job, None)
+                self.show_progress(f"Simulation {job} cancelled")
+            elif event == WorkerEvent.failed:
+                self.outputs.pop(job, None)
+                self.show_progress(f"Simulation {job} failed")
+                messagebox.showerror("Error", f"Simulation {job} failed: {payload}")
+            elif event == WorkerEvent.queued:
+                self.show_progress(f"Simulation {job} queued")
+        self.root.after(POLL_INTERVAL, self.poll_worker)
+
+    def show_profile(self, job, profile):
+        # Timing breakdown of a profiled run in its own window
+        profile_window = Toplevel(self.root)
+        profile_window.title(f"Profile of Simulation {job}")
+        text = Text(profile_window, wrap='none', font=("Courier", 10))
+        text.insert('end', profile)
+        text.pack(expand=True, fill='both')
+
+    def show_progress(self, status, reset=False):
+        if not self.panel_alive():
+            return
+        self.progress_label.config(text=self.queue_status(status))
+        if reset:
+            self.partial_statistics_label.config(text="")
+            self.live_timeline.delete("all")
+            self.live_timeline.config(height=LIVE_ROW_HEIGHT)
+            self.live_rows = {}
+
+    def show_partial_results(self, job, progress):
+        if not self.panel_alive():
+            return
+        percentage = progress["time"] * 100 // max(progress["total"], 1)
+        self.progress_label.config(text=self.queue_status(f"Simulation {job} running: {progress['time']}/{progress['total']} ({percentage}%)"))
+        self.partial_statistics_label.config(text=", ".join(f"{name}: {value}" for name, value in progress["statistics"].items()))
+        # Draw the new segments, already decimated by the worker to the width of the canvas
+        from matplotlib import colormaps
+        from matplotlib.colors import to_hex
+        scale = PROGRESS_PIXELS / max(progress["total"], 1)
+        palette = colormaps["tab20"].colors
+        for pid, segments in progress["segments"].items():
+            if pid not in self.live_rows:
+                self.live_rows[pid] = len(self.live_rows)
+                self.live_timeline.config(height=LIVE_ROW_HEIGHT * len(self.live_rows))
+            row = self.live_rows[pid]
+            color = to_hex(palette[row % len(palette)])
+            for start, width in segments:
+                self.live_timeline.create_rectangle(start * scale, row * LIVE_ROW_HEIGHT, (start + width) * scale, (row + 1) * LIVE_ROW_HEIGHT - 2, fill=color, outline="")
    
     def get_task_history(self):
-        # Directly use the CPU instance of the gui class
+        # Execution history of every CPU of the scheduler
         if hasattr(self, 'cpu'):
-            return self.cpu.return_cpu_history()
+            return self.scheduler.cpu_histories()
         else:
             messagebox.showerror("Error", "CPU not initialized.")
             return []
@@ -270,45 +368,16 @@ class gui():
     
 
     def plot_tasks(self, task_history, timeline_scale):
-        # Filtering out entries where 'Task' is None if not meaningful for visualization
-        filtered_history = [task for task in task_history if task['Task'] is not None]
-
-        if not filtered_history:
+        # Only tasks that ran get a row; idle segments are not drawn
+        if not any(history.names for history in task_history):
             messagebox.showinfo("No Data", "No valid task history to display.")
             return
 
-        # Prepare data
-        df = pd.DataFrame(filtered_history)
-        unique_tasks = df['Task'].unique()
-        colors = {task: (random.random(), random.random(), random.random()) for task in unique_tasks}  # RGB colors
-
-        # Create a Gantt chart using matplotlib
-        fig, ax = plt.subplots(figsize=(10, 5))  # Adjust size as needed
-        yticks = []
-        yticklabels = []
-
-        for i, task in enumerate(sorted(unique_tasks, reverse=True)):
-            task_data = df[df['Task'] == task]
-            y_position = 10 * (i + 1)
-            yticks.append(y_position + 5)  # Center of the bar
-            yticklabels.append(f"Task {task}")
-
-            for _, row in task_data.iterrows():
-                start = row['Start']
-                finish = row['Finish']
-                ax.broken_barh([(start, finish - start)], (y_position, 9), facecolors=colors[task])
-
-        # Set labels and limits
-        ax.set_ylim(5, 10 * len(unique_tasks) + 5)
-        ax.set_xlim(0, timeline_scale)
-        ax.set_xlabel('Time (s)')
-        ax.set_ylabel('Tasks')
-        ax.set_yticks(yticks)
-        ax.set_yticklabels(yticklabels)
-        ax.grid(True)
-        
+        # One bar collection per task, redrawn for the visible window on zoom and pan
+        import matplotlib.pyplot as plt
+        self.timeline_view = plot_timeline(task_history, timeline_scale)
+
         # Show plot
-        plt.title("Task Execution Timeline")
         plt.tight_layout()  # Adjust layout to make room for label
         plt.show()
 
@@ -318,7 +387,7 @@ class gui():
             return
         
         task_history = self.get_task_history()
-        if not task_history:
+        if not any(len(history) for history in task_history):
             messagebox.showinfo("Info", "No task history available.")
             return
 
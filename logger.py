@@ -1,20 +1,229 @@
 import logging
+import logging.handlers
+import atexit
+import json
+import queue
 import sys
 import os
-from constants import LOGS_PATH
+from constants import LOGS_PATH, RUN_LOGGER
 from datetime import datetime
 import shutil
 
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que encola los registros sin formatearlos.
+
+    El formateo del mensaje se hace en el hilo escritor, fuera del camino crítico de la simulación.
+    """
+    def prepare(self, record):
+        """
+        Devuelve el registro tal cual para encolarlo.
+
+        Parámetros:
+        - record (logging.LogRecord): Registro a encolar.
+        """
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter que escribe cada registro como una línea JSON con su origen y PID.
+    """
+    def format(self, record):
+        """
+        Formatea un registro como JSON. Los mensajes que son diccionarios se guardan estructurados.
+
+        Parámetros:
+        - record (logging.LogRecord): Registro a formatear.
+        """
+        message = record.msg if isinstance(record.msg, dict) and not record.args else record.getMessage()
+        return json.dumps({"time": self.formatTime(record),
+                           "level": record.levelname,
+                           "source": getattr(record, "source", record.name),
+                           "pid": getattr(record, "pid", None),
+                           "message": message}, default=str)
+
+class BatchRouter(logging.Handler):
+    """
+    Handler del hilo escritor que envía cada registro al archivo de su logger y escribe en lotes.
+
+    Attributes:
+    - capacity (int): Cantidad de registros acumulados antes de escribir al archivo.
+    - targets (dict): MemoryHandler por archivo de registro.
+    """
+    def __init__(self, capacity):
+        """
+        Inicializa un BatchRouter.
+
+        Parámetros:
+        - capacity (int): Cantidad de registros por lote.
+        """
+        super().__init__()
+        self.capacity = capacity
+        self.targets = {}
+        self.formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        self.json_formatter = JsonFormatter()
+
+    def emit(self, record):
+        """
+        Acumula un registro en el lote de su archivo. El nombre del logger es la ruta del archivo.
+
+        Parámetros:
+        - record (logging.LogRecord): Registro a escribir.
+        """
+        target = self.targets.get(record.name)
+        if target is None:
+            file_handler = logging.FileHandler(record.name)
+            file_handler.setFormatter(self.json_formatter if hasattr(record, "pid") else self.formatter)
+            target = logging.handlers.MemoryHandler(self.capacity, flushLevel=logging.ERROR, target=file_handler)
+            self.targets[record.name] = target
+        target.handle(record)
+
+    def flush(self):
+        """
+        Escribe los lotes pendientes.
+        """
+        for target in self.targets.values():
+            target.flush()
+
+    def close(self):
+        """
+        Escribe los lotes pendientes y cierra los archivos.
+        """
+        for target in self.targets.values():
+            file_handler = target.target
+            target.close()
+            file_handler.close()
+        self.targets = {}
+        super().close()
+
 class Logger:
     """
     Clase para gestionar el registro de eventos.
 
+    La configuración es compartida por todos los loggers (ver `configure`): nivel
+    mínimo, registros de traza por tick y modo asíncrono, donde los registros se
+    encolan y un hilo escritor los formatea y escribe en lotes.
+
+    Los loggers de tareas (creados con `pid`) no abren un archivo propio: todos
+    escriben en un único archivo JSON Lines por corrida, etiquetados con su
+    origen y PID. La vista de una tarea se obtiene bajo demanda con `view`.
+
     Attributes:
     - loggerName (str): Nombre del logger.
     - filename (str): Ruta del archivo de registro.
     - logger (logging.Logger): Objeto Logger de la biblioteca estándar de Python.
     """
-    def __init__(self, loggerName, printConsole=False, clean=False):
+    level = logging.DEBUG
+    tracing = True
+    batch_size = 1000
+    records = None
+    listener = None
+    sinks = set()
+    logs_path = LOGS_PATH
+
+    @classmethod
+    def configure(cls, level=None, trace=None, asynchronous=None, batch_size=None, logs_path=None):
+        """
+        Configura el registro de todos los loggers creados a partir de ahora.
+
+        Parámetros:
+        - level (int | str): Nivel mínimo de los registros (por ejemplo "INFO").
+        - trace (bool): Indica si se registran los mensajes de traza de cada tick.
+        - asynchronous (bool): Indica si los registros se escriben desde un hilo en segundo plano.
+        - batch_size (int): Cantidad de registros por escritura en modo asíncrono.
+        - logs_path (str): Directorio de los registros, terminado en "/" (por defecto LOGS_PATH).
+        """
+        if level is not None:
+            cls.level = logging.getLevelName(level) if isinstance(level, str) else level
+        if trace is not None:
+            cls.tracing = trace
+        if batch_size is not None:
+            cls.batch_size = batch_size
+        if logs_path is not None:
+            cls.logs_path = logs_path
+        if asynchronous and cls.listener is None:
+            cls.records = queue.SimpleQueue()
+            cls.listener = logging.handlers.QueueListener(cls.records, BatchRouter(cls.batch_size))
+            cls.listener.start()
+            atexit.register(cls.shutdown)
+        elif asynchronous is False:
+            cls.shutdown()
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Detiene el hilo escritor, escribiendo los registros pendientes.
+        """
+        if cls.listener is None:
+            return
+        cls.listener.stop()
+        for handler in cls.listener.handlers:
+            handler.close()
+        cls.listener = None
+        cls.records = None
+
+    @classmethod
+    def shared_logger(cls, filename):
+        """
+        Obtiene el logger del archivo compartido de la corrida, configurando sus manejadores una sola vez.
+
+        Parámetros:
+        - filename (str): Ruta del archivo compartido.
+
+        Returns:
+        - logging.Logger: Logger de la biblioteca estándar que escribe en el archivo compartido.
+        """
+        logger = logging.getLogger(filename)
+        if filename not in cls.sinks:
+            cls.reset_handlers(logger)
+            logger.setLevel(cls.level)
+            logger.propagate = False
+            if cls.listener:
+                handler = RecordQueueHandler(cls.records)
+            else:
+                handler = logging.FileHandler(filename)
+                handler.setFormatter(JsonFormatter())
+            handler.setLevel(logging.DEBUG)
+            logger.addHandler(handler)
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(logging.ERROR)
+            console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(source)s - %(message)s'))
+            logger.addHandler(console_handler)
+            cls.sinks.add(filename)
+        return logger
+
+    @staticmethod
+    def reset_handlers(logger):
+        """
+        Cierra y quita los manejadores de un logger, para que nunca queden duplicados.
+
+        Parámetros:
+        - logger (logging.Logger): Logger de la biblioteca estándar.
+        """
+        for handler in logger.handlers[:]:
+            handler.close()
+            logger.removeHandler(handler)
+
+    @staticmethod
+    def view(source=None, pid=None, filename=None):
+        """
+        Lee los registros del archivo compartido de la corrida, filtrados por origen o PID.
+
+        Parámetros:
+        - source (str): Nombre del logger de origen (por defecto todos).
+        - pid (str): PID de la tarea (por defecto todos).
+        - filename (str): Ruta del archivo compartido (por defecto el de la corrida).
+
+        Returns:
+        - generator: Registros como diccionarios con time, level, source, pid y message.
+        """
+        with open(filename or Logger.logs_path + RUN_LOGGER + ".jsonl", 'r') as file:
+            for line in file:
+                record = json.loads(line)
+                if (source is None or record["source"] == source) and (pid is None or record["pid"] == pid):
+                    yield record
+
+    def __init__(self, loggerName, printConsole=False, clean=False, pid=None):
         """
         Inicializa un objeto Logger.
 
@@ -22,20 +231,35 @@ class Logger:
         - loggerName (str): Nombre del logger.
         - printConsole (bool): Indica si se debe imprimir en la consola (por defecto False).
         - clean (bool): Indica si se deben limpiar los registros existentes (por defecto False).
+        - pid (str): PID de la tarea; si se indica, los registros van al archivo compartido de la corrida (por defecto None).
         """
         if clean:
             self.clean_logs()
         self.loggerName = loggerName
-        self.filename = LOGS_PATH + self.loggerName + ".log"
-        self.logger = logging.getLogger(self.filename)
-        self.logger.setLevel(logging.DEBUG)
+        self.pid = pid
         self.formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        if pid is not None:
+            self.filename = Logger.logs_path + RUN_LOGGER + ".jsonl"
+            self.logger = logging.LoggerAdapter(Logger.shared_logger(self.filename), {"source": loggerName, "pid": pid})
+            return
 
-        # Configurar el manejador de archivos para escribir en el archivo de registro
-        file_handler = logging.FileHandler(self.filename)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(self.formatter)
-        self.logger.addHandler(file_handler)
+        self.filename = Logger.logs_path + self.loggerName + ".log"
+        self.logger = logging.getLogger(self.filename)
+        self.logger.setLevel(Logger.level)
+        # Un logger con el mismo nombre reemplaza los manejadores del anterior
+        Logger.reset_handlers(self.logger)
+
+        if Logger.listener:
+            # Encolar los registros para el hilo escritor
+            queue_handler = RecordQueueHandler(Logger.records)
+            queue_handler.setLevel(logging.DEBUG)
+            self.logger.addHandler(queue_handler)
+        else:
+            # Configurar el manejador de archivos para escribir en el archivo de registro
+            file_handler = logging.FileHandler(self.filename)
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(self.formatter)
+            self.logger.addHandler(file_handler)
 
         # Configurar el manejador de consola para imprimir en la consola
         console_handler = logging.StreamHandler(sys.stdout)
@@ -45,48 +269,115 @@ class Logger:
         console_handler.setFormatter(self.formatter)
         self.logger.addHandler(console_handler)
 
-    def error(self, message):
+    def __getstate__(self):
+        """
+        Devuelve el estado guardado en un checkpoint: solo el nombre y el PID, los manejadores no se guardan.
+
+        Returns:
+        - dict: Nombre del logger y PID de la tarea.
+        """
+        return {"loggerName": self.loggerName, "pid": self.pid}
+
+    def __setstate__(self, state):
+        """
+        Restaura un logger de un checkpoint, abriendo sus archivos en la ruta de registros actual sin limpiarlos.
+
+        Parámetros:
+        - state (dict): Nombre del logger y PID de la tarea.
+        """
+        os.makedirs(Logger.logs_path, exist_ok=True)
+        self.__init__(state["loggerName"], pid=state["pid"])
+
+    def error(self, message, *args):
         """
         Registra un mensaje de error.
 
         Parámetros:
         - message (str): Mensaje de error.
+        - args: Argumentos de formato; el mensaje solo se formatea si el nivel está habilitado.
         """
-        self.logger.error(message)
+        self.logger.error(message, *args)
 
-    def warning(self, message):
+    def warning(self, message, *args):
         """
         Registra un mensaje de advertencia.
 
         Parámetros:
         - message (str): Mensaje de advertencia.
+        - args: Argumentos de formato; el mensaje solo se formatea si el nivel está habilitado.
         """
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
 
-    def info(self, message):
+    def info(self, message, *args):
         """
         Registra un mensaje informativo.
 
         Parámetros:
         - message (str): Mensaje informativo.
+        - args: Argumentos de formato; el mensaje solo se formatea si el nivel está habilitado.
         """
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
+    def trace(self, message, *args):
+        """
+        Registra un mensaje informativo de traza (eventos de cada tick de la simulación).
+
+        Parámetros:
+        - message (str): Mensaje informativo.
+        - args: Argumentos de formato; el mensaje solo se formatea si la traza está habilitada.
+        """
+        if Logger.tracing:
+            self.logger.info(message, *args)
+
+    def traceEnabled(self):
+        """
+        Indica si los mensajes de traza se registran, para evitar construirlos cuando no.
+
+        Returns:
+        - bool: True si la traza y el nivel informativo están habilitados.
+        """
+        return Logger.tracing and self.logger.isEnabledFor(logging.INFO)
+
+    def read(self):
+        """
+        Lee los registros de este logger en el archivo compartido de la corrida.
+
+        Returns:
+        - generator: Registros como diccionarios.
+        """
+        return Logger.view(source=self.loggerName, filename=self.filename)
+
+    def write_view(self):
+        """
+        Escribe la vista de este logger como un archivo de texto propio (logs_path + loggerName + ".log").
+
+        Returns:
+        - str: Ruta del archivo escrito.
+        """
+        filename = Logger.logs_path + self.loggerName + ".log"
+        with open(filename, 'w') as file:
+            for record in self.read():
+                file.write(f"{record['time']} - {record['level']} - {record['message']}\n")
+        return filename
+
     def clean_logs(self):
         """
-        Limpia los registros existentes.
+        Limpia los registros existentes. El archivo compartido se vuelve a abrir con el próximo logger de tarea.
         """
-        shutil.rmtree(LOGS_PATH)
-        os.mkdir(LOGS_PATH)
+        for filename in Logger.sinks:
+            Logger.reset_handlers(logging.getLogger(filename))
+        Logger.sinks.clear()
+        shutil.rmtree(Logger.logs_path, ignore_errors=True)
+        os.makedirs(Logger.logs_path)
 
     def close(self):
         """
-        Cierra el Logger.
+        Cierra el Logger. Los loggers de tareas comparten el archivo de la corrida y no lo cierran.
         """
+        if self.pid is not None:
+            return
         # Limpiar los manejadores de registro
-        for handler in self.logger.handlers[:]:
-            handler.close()
-            self.logger.removeHandler(handler)
+        Logger.reset_handlers(self.logger)
 
 # Ejemplo de uso:
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+from enum import Enum
+
+class JobMetric(Enum):
+    response_time = "Response Time"  # Completion time minus release time of a job
+    lateness = "Lateness"  # Completion time minus absolute deadline (negative when the job is early)
+    start_jitter = "Start Jitter"  # Time from the release of a job to its first tick on the CPU
+    preemptions = "Preemptions"  # Times a job lost the CPU before completing
+
+class Distribution:
+    """
+    Streaming distribution of integer samples.
+
+    Samples are counted by value, so memory grows with the number of distinct
+    values (bounded by the task deadlines for the job metrics) and not with the
+    number of samples. Min, max, mean and percentiles are exact.
+
+    Attributes:
+    - count (int): Number of samples.
+    - total (int): Sum of the samples.
+    - minimum (int): Smallest sample, or None.
+    - maximum (int): Largest sample, or None.
+    - counts (dict): Number of samples by value.
+    """
+    def __init__(self):
+        """
+        Initializes an empty Distribution.
+        """
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.counts = {}
+
+    def add(self, value, count=1):
+        """
+        Adds samples of a value.
+
+        Parameters:
+        - value (int): Sample value.
+        - count (int): Number of samples (default is 1).
+        """
+        self.count += count
+        self.total += value * count
+        self.counts[value] = self.counts.get(value, 0) + count
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other, weight=1):
+        """
+        Adds the samples of another distribution, repeated `weight` times.
+
+        Parameters:
+        - other (Distribution): Samples to add.
+        - weight (int): Times every sample is added (default is 1).
+        """
+        for value, count in other.counts.items():
+            self.add(value, count * weight)
+
+    def difference(self, previous):
+        """
+        Gets the samples added since an earlier copy of this distribution.
+
+        Parameters:
+        - previous (Distribution): Earlier copy.
+
+        Returns:
+        - Distribution: Samples not in the copy.
+        """
+        delta = Distribution()
+        for value, count in self.counts.items():
+            count -= previous.counts.get(value, 0)
+            if count:
+                delta.add(value, count)
+        return delta
+
+    def copy(self):
+        """
+        Copies the distribution.
+
+        Returns:
+        - Distribution: Independent copy.
+        """
+        copy = Distribution()
+        copy.merge(self)
+        return copy
+
+    def mean(self):
+        """
+        Calculates the mean of the samples.
+
+        Returns:
+        - float: Mean, or None without samples.
+        """
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """
+        Gets a percentile of the samples (nearest rank).
+
+        Parameters:
+        - percent (float): Percentile between 0 and 100.
+
+        Returns:
+        - int: Smallest value with at least `percent`% of the samples at or below it, or None without samples.
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= rank:
+                return value
+
+    def summary(self):
+        """
+        Summarizes the distribution.
+
+        Returns:
+        - dict: Count, Min, Max, Mean, P50, P90 and P99.
+        """
+        mean = self.mean()
+        return {"Count": self.count,
+                "Min": self.minimum,
+                "Max": self.maximum,
+                "Mean": round(mean, 3) if mean is not None else None,
+                "P50": self.percentile(50),
+                "P90": self.percentile(90),
+                "P99": self.percentile(99)}
@@ -0,0 +1,140 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from simulation import create_scheduler
+from task_loader import load_task_rows
+from sweep import confidence_interval
+from scheduler import Statistic
+from metrics import JobMetric
+from task import Task
+from cpu import CPU
+from logger import Logger
+
+def replication_seed(seed, replication):
+    """
+    Derives the seed of one replication, so every replication has its own reproducible random stream.
+
+    Parameters:
+    - seed (int): Seed of the experiment.
+    - replication (int): Number of the replication.
+
+    Returns:
+    - int: 64-bit seed.
+    """
+    text = f"{seed}:{replication}"
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+def run_replication(rows, replication, seed, simulation_time, options, logs_path):
+    """
+    Simulates one replication of an EDFA scenario with random start times. Runs in a worker process.
+
+    The start times of all the tasks are drawn at once from the generator of
+    the replication before the tasks are added. The miss ratio is the share of
+    finished jobs (completed or missed) that missed their deadline.
+
+    Parameters:
+    - rows (list): (pid, period, execution_time, deadline) rows of the task set.
+    - replication (int): Number of the replication.
+    - seed (int): Seed of the replication.
+    - simulation_time (int): Simulation time.
+    - options (dict): Scheduler flags (eventDriven).
+    - logs_path (str): Base directory of the logs; every worker process gets its own.
+
+    Returns:
+    - dict: Result row of the replication.
+    """
+    start = time.perf_counter()
+    # Minimal logging, in a directory of this process so concurrent runs never share a file
+    Logger.configure(level='ERROR', trace=False, logs_path=os.path.join(logs_path, str(os.getpid()), ""))
+    scheduler = create_scheduler('EDFA', simulation_time, CPU("Processor"), randomGenerator=True, seed=seed, **options)
+    scheduler.draw_arrival_offsets(len(rows))
+    for pid, period, execution_time, deadline in rows:
+        scheduler.add_task(Task(pid=pid, period=period, execution_time=execution_time, deadline=deadline))
+    scheduler.run()
+    Logger.shutdown()
+    missed = sum(counters[Statistic.missed_deadlines.value] for counters in scheduler.statistics.values())
+    completed = sum(metrics[JobMetric.response_time.value].count for metrics in scheduler.job_metrics.values())
+    jobs = missed + completed
+    return {"replication": replication, "seed": seed, "missed": missed, "completed": completed, "jobs": jobs,
+            "miss_ratio": missed / jobs if jobs else 0.0, "elapsed": round(time.perf_counter() - start, 6)}
+
+def summarize_replications(replications, confidence):
+    """
+    Aggregates the replications with normal confidence intervals over replications.
+
+    Parameters:
+    - replications (list): Result rows of the replications.
+    - confidence (float): Confidence level, for example 0.95.
+
+    Returns:
+    - dict: Mean miss ratio, probability that a replication misses a deadline, and
+      the pooled ratio of missed jobs, each interval given by its half-width.
+    """
+    miss_ratio, miss_ci = confidence_interval([row["miss_ratio"] for row in replications], confidence)
+    any_miss, any_miss_ci = confidence_interval([float(row["missed"] > 0) for row in replications], confidence)
+    missed = sum(row["missed"] for row in replications)
+    jobs = sum(row["jobs"] for row in replications)
+    return {"replications": len(replications), "confidence": confidence,
+            "miss_ratio": round(miss_ratio, 6), "miss_ratio_ci": round(miss_ci, 6),
+            "miss_probability": round(any_miss, 6), "miss_probability_ci": round(any_miss_ci, 6),
+            "pooled_miss_ratio": round(missed / jobs, 6) if jobs else 0.0,
+            "missed": missed, "jobs": jobs}
+
+def run_montecarlo(input, simulation_time, replications, seed=0, workers=None, confidence=0.95, logs_path="logs/montecarlo", **options):
+    """
+    Runs the replications of an EDFA scenario in a process pool and aggregates them.
+
+    Replication r always gets the seed `replication_seed(seed, r)`, so the
+    results do not depend on the number of workers or on the order the
+    replications finish in.
+
+    Parameters:
+    - input (str): Input file with the EDFA tasks.
+    - simulation_time (int): Simulation time of every replication.
+    - replications (int): Number of replications.
+    - seed (int): Seed of the experiment (default is 0).
+    - workers (int): Number of worker processes (default is the number of CPUs).
+    - confidence (float): Confidence level of the intervals (default is 0.95).
+    - logs_path (str): Base directory of the worker logs (default is logs/montecarlo).
+    - options: Scheduler flags (eventDriven).
+
+    Returns:
+    - Tuple[dict, list]: Summary and the result rows of the replications, in replication order.
+    """
+    rows = list(load_task_rows(input, arrivals=True))
+    seeds = [replication_seed(seed, replication) for replication in range(replications)]
+    # A few chunks per worker keep the pool busy without one task per replication
+    chunksize = max(1, replications // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_replication, [rows] * replications, range(replications), seeds,
+                                    [simulation_time] * replications, [options] * replications, [logs_path] * replications,
+                                    chunksize=chunksize))
+    return summarize_replications(results, confidence), results
+
+def main():
+    parser = argparse.ArgumentParser(description='Real-Time Scheduling Simulator - Monte-Carlo replications of EDFA random start times')
+    parser.add_argument('-i', '--input', type=str, required=True, help='Input file with EDFA tasks')
+    parser.add_argument('-t', '--time', type=int, required=True, help='Simulation time of every replication')
+    parser.add_argument('-k', '--replications', type=int, default=100, help='Number of replications')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Seed of the experiment; replication seeds are derived from it')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Number of worker processes (default is the number of CPUs)')
+    parser.add_argument('-o', '--output', type=str, help='JSON file for the summary and the result of every replication')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence level of the intervals')
+    parser.add_argument('-e', '--event-driven', action='store_true', help='Jump time between scheduling events instead of stepping every tick')
+    args = parser.parse_args()
+
+    summary, results = run_montecarlo(args.input, args.time, args.replications, seed=args.seed, workers=args.workers,
+                                      confidence=args.confidence, eventDriven=args.event_driven)
+    print(f"{summary['replications']} replications, {summary['jobs']} jobs, {summary['missed']} missed")
+    print(f"Miss ratio: {summary['miss_ratio']} ± {summary['miss_ratio_ci']} ({args.confidence:.0%} confidence)")
+    print(f"Probability of a missed deadline: {summary['miss_probability']} ± {summary['miss_probability_ci']}")
+    print(f"Pooled miss ratio: {summary['pooled_miss_ratio']}")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({"input": args.input, "time": args.time, "seed": args.seed, "summary": summary, "replications": results}, file, indent=2)
+
+if __name__ == '__main__':
+    main()
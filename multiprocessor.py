@@ -0,0 +1,374 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from scheduler import Scheduler, ExecutableItems, Statistic
+from analysis import Verdict, utilization, analyze_rms, analyze_edf, global_density_test
+from cpu import CPU
+from task import Task
+from logger import Logger
+
+PARTITIONING = ['first-fit', 'best-fit', 'worst-fit']
+
+def fits(tasks, algorithm):
+    """
+    Checks if a set of tasks can share one CPU, using the single-CPU analysis of the algorithm.
+
+    Inconclusive analyses (deadlines beyond the period) accept the set when its utilization is at most 1.
+
+    Parameters:
+    - tasks (list): Task objects of the CPU.
+    - algorithm (str): 'RMS' or 'EDF'.
+
+    Returns:
+    - bool: True if the tasks are schedulable together.
+    """
+    verdict, _ = analyze_rms(tasks) if algorithm == 'RMS' else analyze_edf(tasks)
+    return verdict == Verdict.schedulable or (verdict == Verdict.inconclusive and utilization(tasks) <= 1)
+
+def partition_tasks(tasks, cpus, heuristic, algorithm):
+    """
+    Assigns tasks to CPUs by decreasing utilization with a bin-packing heuristic.
+
+    first-fit puts each task on the first CPU where it fits, best-fit on the
+    fullest CPU where it fits and worst-fit on the emptiest one.
+
+    Parameters:
+    - tasks (list): Task objects.
+    - cpus (int): Number of CPUs.
+    - heuristic (str): 'first-fit', 'best-fit' or 'worst-fit'.
+    - algorithm (str): 'RMS' or 'EDF', for the admission test.
+
+    Returns:
+    - Tuple[list, list]: Tasks of every CPU, and the tasks that fit on no CPU.
+    """
+    if heuristic not in PARTITIONING:
+        raise ValueError(f"Unknown partitioning heuristic: {heuristic}")
+    partitions = [[] for _ in range(cpus)]
+    loads = [0.0] * cpus
+    unassigned = []
+    for task in sorted(tasks, key=lambda task: task.execution_time / task.period, reverse=True):
+        candidates = [core for core in range(cpus) if fits(partitions[core] + [task], algorithm)]
+        if not candidates:
+            unassigned.append(task)
+            continue
+        if heuristic == 'first-fit':
+            core = candidates[0]
+        elif heuristic == 'best-fit':
+            core = max(candidates, key=lambda core: loads[core])
+        else:
+            core = min(candidates, key=lambda core: loads[core])
+        partitions[core].append(task)
+        loads[core] += task.execution_time / task.period
+    return partitions, unassigned
+
+def run_partition(core, rows, algorithm, simulation_time, options, logging):
+    """
+    Simulates the tasks of one CPU with the single-CPU scheduler. Runs in a worker process.
+
+    Parameters:
+    - core (int): Index of the CPU.
+    - rows (list): (pid, period, execution_time, deadline) tuples of the partition.
+    - algorithm (str): 'RMS' or 'EDF'.
+    - simulation_time (int): Total simulation time.
+    - options (dict): Scheduler flags (eventDriven, extrapolate, vectorized).
+    - logging (dict): Logger.configure arguments of the parent process; logs go to a core-<n>/ subdirectory.
+
+    Returns:
+    - dict: Statistic counters, job metrics and execution history of the CPU.
+    """
+    from simulation import create_scheduler
+    Logger.configure(**dict(logging, logs_path=os.path.join(logging["logs_path"], f"core-{core}", "")))
+    cpu = CPU(f"Processor-{core}")
+    scheduler = create_scheduler(algorithm, simulation_time, cpu, **options)
+    for pid, period, execution_time, deadline in rows:
+        scheduler.add_task(Task(pid=pid, period=period, execution_time=execution_time, deadline=deadline))
+    scheduler.run()
+    Logger.shutdown()
+    return {"statistics": scheduler.statistics, "job_metrics": scheduler.job_metrics, "history": cpu.return_cpu_history()}
+
+class GlobalScheduler(Scheduler):
+    """
+    Global scheduler for identical CPUs: at every tick the highest-priority ready
+    jobs run, one per CPU. With the deadline key it is global EDF; with the
+    period key it is global fixed priority (rate monotonic priorities).
+
+    A running job keeps its CPU while it is selected; a preempted job may resume
+    on another CPU, which counts as a migration of its task. Hyperperiod
+    extrapolation and the vectorized task table are single-CPU features and are
+    turned off.
+
+    Attributes:
+    - cpus (list): CPU objects.
+    - policy (ExecutableItems): Key that orders the ready queue.
+    - placement (dict): Release time and CPU index of the last job run of every task.
+    """
+    def __init__(self, simulation_time, name, cpus, policy=ExecutableItems.deadline, **options):
+        """
+        Initializes the global scheduler.
+
+        Parameters:
+        - simulation_time (int): Total simulation time.
+        - name (str): Name of the scheduler.
+        - cpus (list): CPU objects; the first one is also `cpu`.
+        - policy (ExecutableItems): deadline for global EDF, period for global fixed priority (default is deadline).
+        - options: Other Scheduler flags (eventDriven, seed).
+        """
+        options.pop("extrapolate", None)
+        options.pop("vectorized", None)
+        super().__init__(simulation_time, name, cpus[0], **options)
+        self.cpus = cpus
+        self.policy = policy
+        self.placement = {}
+
+    def add_task(self, task):
+        """
+        Adds a task to the scheduler, with a migration counter.
+
+        Parameters:
+        - task (Task): Task object to be added.
+        """
+        super().add_task(task)
+        self.statistics[task.pid][Statistic.migrations.value] = 0
+
+    def schedulability_tests(self):
+        """
+        Runs the global density bound (sufficient for global EDF, necessary only for fixed priorities).
+
+        Returns:
+        - Tuple[Verdict, list]: Overall verdict and the results of the tests run.
+        """
+        result = global_density_test(self.tasks, len(self.cpus), edf=self.policy == ExecutableItems.deadline)
+        return result["verdict"], [result]
+
+    def run(self):
+        """
+        Runs the global scheduler.
+        """
+        self.tasks.sort(key=lambda task: task.period if self.policy == ExecutableItems.period else task.deadline)
+        self.assign_priorities()
+        self.simulate(lambda task: self.periodTriggered(task, self.policy), self.policy)
+
+    def dispatch(self):
+        """
+        Checks every deadline in the queue, then runs the first ready job of each of the highest-priority tasks, one per CPU.
+        """
+        selected = []
+        for executable in self.execution_queue:
+            # Entries flagged in this tick (finished or rescheduled jobs) wait for the garbage collector
+            if executable[ExecutableItems.delete.value] or self.is_deadline_met(executable):
+                continue
+            task = self.getTask(executable)
+            if len(selected) < len(self.cpus) and task not in selected:
+                selected.append(task)
+        # Selected jobs that are running keep their CPU; the others take the free CPUs
+        assignment = [cpu.current_task if cpu.current_task in selected else None for cpu in self.cpus]
+        free = [core for core, task in enumerate(assignment) if task is None]
+        for task in selected:
+            if task in assignment:
+                continue
+            placement = self.placement.get(task.pid)
+            core = placement[1] if placement and placement[1] in free else free[0]
+            free.remove(core)
+            assignment[core] = task
+        for cpu in self.cpus:
+            if cpu.current_task is not None and cpu.current_task not in selected:
+                self.logger.warning("Preempting %s at %s", cpu.current_task.pid, self.current_time)
+                self.job_preempted(cpu.current_task)
+        for core, (cpu, task) in enumerate(zip(self.cpus, assignment)):
+            if task is None:
+                self.logger.trace("Empty run of CPU %s at %s", core, self.current_time)
+                cpu.empty_run(self.current_time)
+                continue
+            self.logger.trace("Executing %s on CPU %s at %s", task.pid, core, self.current_time)
+            self.update_statistics(task, Statistic.executed_periods)
+            self.job_dispatched(task)
+            self.count_migration(task, core)
+            task, finished = cpu.run_task(task, self.current_time)
+            if finished:
+                self.job_completed(task)
+                self.logger.info("Task %s finished at %s", task.pid, self.current_time)
+                self.removeExecutable(task.pid)
+
+    def count_migration(self, task, core):
+        """
+        Counts a migration when the current job of a task runs on a different CPU than before.
+
+        Parameters:
+        - task (Task): Task about to run.
+        - core (int): Index of the CPU it runs on.
+        """
+        placement = self.placement.get(task.pid)
+        if placement and placement[0] == task.startedTime and placement[1] != core:
+            self.update_statistics(task, Statistic.migrations)
+        self.placement[task.pid] = (task.startedTime, core)
+
+    def fast_forward(self):
+        """
+        Jumps `current_time` to the next scheduling event (release, completion or deadline) on every CPU at once.
+
+        Between events the queue does not change, so every CPU keeps its job (or stays idle).
+        """
+        if self.execution_queue.pending:
+            return
+        start = self.current_time
+        horizon = min(self.simulation_time, self.next_release_time(), self.next_deadline_time())
+        for cpu in self.cpus:
+            if cpu.current_task:
+                # The tick that completes a job is an event on its own
+                horizon = min(horizon, start + cpu.current_task.execution_time - cpu.current_task.runningTime - 1)
+        ticks = horizon - start
+        if ticks <= 0:
+            return
+        for cpu in self.cpus:
+            if cpu.current_task:
+                self.update_statistics(cpu.current_task, Statistic.executed_periods, ticks)
+                cpu.run_task(cpu.current_task, start, ticks)
+            else:
+                cpu.empty_run(start, ticks)
+        self.current_time = horizon
+
+    def get_statistics(self):
+        """
+        Gets the statistics of every task, with its migrations.
+
+        Returns:
+        - dict: Statistics dictionary by task PID.
+        """
+        statistics = super().get_statistics()
+        for pid, counters in self.statistics.items():
+            statistics[pid][Statistic.migrations.value] = counters[Statistic.migrations.value]
+        return statistics
+
+class PartitionedScheduler(Scheduler):
+    """
+    Partitioned scheduler: the tasks are assigned to CPUs with a bin-packing
+    heuristic and every CPU runs the single-CPU algorithm (RMS or EDF) on its
+    partition. Partitions are independent, so each one is simulated in its own
+    worker process; the statistics, job metrics and histories are merged back.
+
+    Attributes:
+    - cpu_count (int): Number of CPUs.
+    - heuristic (str): Partitioning heuristic.
+    - options (dict): Scheduler flags of the partitions.
+    - partitions (list): Tasks of every CPU, set when the scheduler runs.
+    - histories (list): ExecutionHistory of every CPU, set when the scheduler runs.
+    """
+    def __init__(self, simulation_time, name, cpu, cpus, heuristic='first-fit', **options):
+        """
+        Initializes the partitioned scheduler.
+
+        Parameters:
+        - simulation_time (int): Total simulation time.
+        - name (str): Name of the scheduler and single-CPU algorithm ('RMS' or 'EDF').
+        - cpu (CPU): CPU of the parent process (only its logger is used).
+        - cpus (int): Number of CPUs.
+        - heuristic (str): 'first-fit', 'best-fit' or 'worst-fit' (default is 'first-fit').
+        - options: Scheduler flags passed to every partition (eventDriven, extrapolate, vectorized).
+        """
+        options.pop("seed", None)
+        super().__init__(simulation_time, name, cpu)
+        self.cpu_count = cpus
+        self.heuristic = heuristic
+        self.options = options
+        self.partitions = None
+        self.histories = []
+
+    def partition(self):
+        """
+        Assigns the tasks to CPUs. Tasks that fit nowhere go to the least loaded CPU, so their misses are simulated.
+
+        Returns:
+        - Tuple[list, list]: Tasks of every CPU, and the tasks that did not fit.
+        """
+        partitions, unassigned = partition_tasks(self.tasks, self.cpu_count, self.heuristic, self.name)
+        for task in unassigned:
+            core = min(range(self.cpu_count), key=lambda core: utilization(partitions[core]))
+            self.logger.warning("Task %s does not fit on any CPU, assigned to CPU %s", task.pid, core)
+            partitions[core].append(task)
+        return partitions, unassigned
+
+    def schedulability_tests(self):
+        """
+        Runs the single-CPU analysis of every partition.
+
+        Returns:
+        - Tuple[Verdict, list]: Schedulable if every partition is, unschedulable if a task fits on no CPU or a partition is not.
+        """
+        partitions, unassigned = self.partition()
+        results = []
+        verdicts = []
+        for core, tasks in enumerate(partitions):
+            if not tasks:
+                continue
+            verdict, core_results = analyze_rms(tasks) if self.name == 'RMS' else analyze_edf(tasks)
+            verdicts.append(verdict)
+            for result in core_results:
+                results.append(dict(result, test=f"CPU {core} {result['test']}"))
+        if unassigned or Verdict.unschedulable in verdicts:
+            return Verdict.unschedulable, results
+        if all(verdict == Verdict.schedulable for verdict in verdicts):
+            return Verdict.schedulable, results
+        return Verdict.inconclusive, results
+
+    def run(self):
+        """
+        Partitions the tasks and simulates every CPU in a worker process.
+        """
+        self.partitions, _ = self.partition()
+        for core, tasks in enumerate(self.partitions):
+            self.logger.info("CPU %s: %s", core, [task.pid for task in tasks])
+        logging = {"level": Logger.level, "trace": Logger.tracing, "asynchronous": Logger.listener is not None,
+                   "batch_size": Logger.batch_size, "logs_path": Logger.logs_path}
+        # Spawned workers start with a clean logging state instead of a copy of this process
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(self.cpu_count, os.cpu_count() or 1), mp_context=context) as executor:
+            futures = [executor.submit(run_partition, core, [(task.pid, task.period, task.execution_time, task.deadline) for task in tasks],
+                                       self.name, self.simulation_time, self.options, logging)
+                       for core, tasks in enumerate(self.partitions)]
+            results = [future.result() for future in futures]
+        for result in results:
+            self.statistics.update(result["statistics"])
+            self.job_metrics.update(result["job_metrics"])
+            self.histories.append(result["history"])
+        self.save_statistics()
+
+    def subscribe(self, callback, *kinds):
+        """
+        Scheduling events happen in the worker processes of the partitions and cannot reach observers in this one.
+        """
+        raise ValueError("Partitioned runs cannot be observed; simulate every partition as a single CPU instead")
+
+    def cpu_histories(self):
+        """
+        Gets the execution history of every CPU.
+
+        Returns:
+        - list: ExecutionHistory of each CPU, in CPU order.
+        """
+        return self.histories
+
+    def get_statistics(self):
+        """
+        Gets the statistics of every task; tasks never migrate in partitioned scheduling.
+
+        Returns:
+        - dict: Statistics dictionary by task PID.
+        """
+        statistics = super().get_statistics()
+        for report in statistics.values():
+            report[Statistic.migrations.value] = 0
+        return statistics
+
+    def get_general_statistics(self, elapsed=None):
+        """
+        Gets the statistics of the whole task set over all the CPUs.
+
+        Parameters:
+        - elapsed (int): Time the statistics cover (default is the simulation time).
+
+        Returns:
+        - dict: Statistics of all the tasks together; non executed periods are counted over the elapsed time of every CPU.
+        """
+        return self.statistics_report(sum(counters[Statistic.missed_deadlines.value] for counters in self.statistics.values()),
+                                      sum(counters[Statistic.executed_periods.value] for counters in self.statistics.values()),
+                                      self.cpu_count, elapsed)
@@ -0,0 +1,176 @@
+from time import perf_counter
+from logger import Logger
+
+# Methods timed in every phase, by owner: the scheduler class, the CPU classes and the Logger class
+SCHEDULER_PHASES = {
+    "garbage collector": ("garbageCollector",),
+    "release": ("periodTriggered", "validateNewTasks", "serveArrival"),
+    "dispatch": ("dispatch",),
+    "deadline checks": ("is_deadline_met",),
+    "send to cpu": ("send_task_to_cpu",),
+    "statistics": ("update_statistics", "job_dispatched", "job_preempted", "job_completed"),
+    "fast forward": ("fast_forward",),
+    "checkpoint": ("save_checkpoint",),
+    "statistics report": ("save_statistics",),
+}
+CPU_PHASES = {
+    "cpu run": ("run_task", "empty_run"),
+    "logging": ("print_history",),
+}
+LOGGER_PHASES = {
+    "logging": ("error", "warning", "info", "trace"),
+}
+OTHER = "other"  # Loop time not spent in any timed phase
+
+class PhaseProfiler:
+    """
+    Times the phases of the scheduling loop of one run.
+
+    Every method of a phase is replaced in its class, for the length of the run
+    only, by a wrapper that counts its calls and measures its time, so the
+    scheduler can still be checkpointed while profiled. Phases nest (a
+    dispatch sends a task to the CPU, which logs), so besides the inclusive
+    time each phase gets its self time, which excludes the timed phases it
+    called; self times add up to the duration of the run. Unprofiled runs
+    are not affected.
+
+    Attributes:
+    - scheduler (Scheduler): Scheduler profiled.
+    - phases (dict): [calls, total time, self time] by phase name.
+    - elapsed (float): Wall time of the run, in seconds.
+    - ticks (int): Simulation time covered by the run.
+    """
+    def __init__(self, scheduler):
+        """
+        Initializes the profiler of a scheduler.
+
+        Parameters:
+        - scheduler (Scheduler): Scheduler to profile, with its tasks added.
+        """
+        self.scheduler = scheduler
+        self.phases = {}
+        self.elapsed = 0.0
+        self.ticks = 0
+        self.stack = [0.0]
+        self.restore = []
+
+    def wrap(self, owner, method, phase):
+        """
+        Replaces a method of a class by a timed wrapper.
+
+        Parameters:
+        - owner (type): Class whose method is timed; an inherited method is shadowed.
+        - method (str): Name of the method; missing methods are skipped.
+        - phase (str): Phase the time is charged to.
+        """
+        function = getattr(owner, method, None)
+        if function is None:
+            return
+        counters = self.phases.setdefault(phase, [0, 0.0, 0.0])
+        stack = self.stack
+
+        def timed(*args, **kwargs):
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                children = stack.pop()
+                stack[-1] += elapsed
+                counters[0] += 1
+                counters[1] += elapsed
+                counters[2] += elapsed - children
+
+        self.restore.append((owner, method, owner.__dict__.get(method)))
+        setattr(owner, method, timed)
+
+    def unwrap(self):
+        """
+        Puts back the original methods.
+        """
+        for owner, method, original in reversed(self.restore):
+            if original is None:
+                delattr(owner, method)
+            else:
+                setattr(owner, method, original)
+        self.restore = []
+
+    def run(self, cprofile_path=None):
+        """
+        Runs the scheduler with its phases timed.
+
+        Parameters:
+        - cprofile_path (str): File to dump the cProfile statistics of the run to, readable with `pstats` (default is None).
+
+        Returns:
+        - dict: Report of the run (see `report`).
+        """
+        for phase, methods in SCHEDULER_PHASES.items():
+            for method in methods:
+                self.wrap(type(self.scheduler), method, phase)
+        for cls in {type(cpu) for cpu in self.scheduler.cpus}:
+            for phase, methods in CPU_PHASES.items():
+                for method in methods:
+                    self.wrap(cls, method, phase)
+        for phase, methods in LOGGER_PHASES.items():
+            for method in methods:
+                self.wrap(Logger, method, phase)
+        profile = None
+        if cprofile_path:
+            import cProfile
+            profile = cProfile.Profile()
+        start_time = self.scheduler.current_time if self.scheduler.resumed else 0
+        start = perf_counter()
+        try:
+            if profile is not None:
+                profile.runcall(self.scheduler.run)
+            else:
+                self.scheduler.run()
+        finally:
+            self.elapsed = perf_counter() - start
+            self.unwrap()
+        self.ticks = self.scheduler.current_time - start_time
+        if profile is not None:
+            profile.dump_stats(cprofile_path)
+        return self.report()
+
+    def report(self):
+        """
+        Builds the timing breakdown of the run.
+
+        Returns:
+        - dict: Calls, total time, self time, share of the run and ticks per second of self time by phase, slowest first, plus OTHER for the untimed loop time.
+        """
+        rows = dict(self.phases)
+        rows[OTHER] = [1, self.elapsed, self.elapsed - sum(counters[2] for counters in self.phases.values())]
+        report = {}
+        for phase, (calls, total, own) in sorted(rows.items(), key=lambda row: -row[1][2]):
+            if not calls:
+                continue
+            report[phase] = {"Calls": calls,
+                             "Total (s)": round(total, 4),
+                             "Self (s)": round(own, 4),
+                             "Self %": round(own * 100 / self.elapsed, 2) if self.elapsed else 0.0,
+                             "Ticks/sec": round(self.ticks / own) if own > 0 else None}
+        return report
+
+def format_profile(report, elapsed, ticks):
+    """
+    Formats a profile report as a text table.
+
+    Parameters:
+    - report (dict): Report returned by `PhaseProfiler.run`.
+    - elapsed (float): Wall time of the run, in seconds.
+    - ticks (int): Simulation time covered by the run.
+
+    Returns:
+    - str: Table with one row per phase and a summary line.
+    """
+    headers = ["Phase"] + list(next(iter(report.values())).keys())
+    rows = [[phase] + [str(value) for value in values.values()] for phase, values in report.items()]
+    widths = [max(len(row[column]) for row in rows + [headers]) for column in range(len(headers))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in [headers] + rows]
+    speed = round(ticks / elapsed) if elapsed else 0
+    lines.append(f"{ticks} ticks in {elapsed:.4f} s ({speed} ticks/sec)")
+    return "\n".join(lines)
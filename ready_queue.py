@@ -0,0 +1,331 @@
+import heapq
+import itertools
+
+REMOVED = object()  # Marks a heap node whose item was collected
+
+class ReadyQueue:
+    """
+    Priority queue of executables backed by a binary heap with lazy deletion.
+
+    Items are ordered by their key and, for equal keys, by insertion order, the
+    same order a stable sort of the old list produced. Deleting an item only
+    flags it (tombstone); the item stays visible until `collect` is called and
+    is physically dropped from the heap when it reaches the top or when
+    tombstones outnumber live items.
+
+    Items are also indexed by an identifier (the task PID), so membership tests
+    and lookups of the entries of one task take constant time.
+
+    Full iterations read a sorted list of the nodes kept next to the heap.
+    Pushed nodes are appended to it unsorted and merged on the next iteration
+    (a sorted run plus a short tail, which the sort merges in about linear
+    time), and removed nodes are filtered out then, so a changed queue is not
+    sorted from scratch on every tick.
+
+    Attributes:
+    - heap (list): Heap of [key, sequence, item, flagged] nodes.
+    - order (list): Nodes in priority order, including removed ones not filtered yet.
+    - added (list): Nodes pushed since `order` was last sorted.
+    - flagged (list): Nodes marked for deletion and not collected yet.
+    - members (dict): Nodes in the queue grouped by item identifier.
+    """
+    def __init__(self, ident):
+        """
+        Initializes an empty ReadyQueue.
+
+        Parameters:
+        - ident (callable): Function returning the identifier of an item.
+        """
+        self.ident = ident
+        self.heap = []
+        self.flagged = []
+        self.nodes = {}
+        self.members = {}
+        self.counter = itertools.count()
+        self.size = 0
+        self.removed = 0
+        self.order = []
+        self.added = []
+        self.view = None
+
+    def __getstate__(self):
+        """
+        Gets the state saved in a checkpoint. Collected nodes are left out and the node index, keyed by object id, is rebuilt on load.
+
+        Returns:
+        - dict: Attributes of the queue.
+        """
+        sequence = next(self.counter)
+        self.counter = itertools.count(sequence)
+        state = self.__dict__.copy()
+        state["heap"] = [node for node in self.heap if node[2] is not REMOVED]
+        heapq.heapify(state["heap"])
+        state["removed"] = 0
+        state["counter"] = sequence
+        state["view"] = None
+        del state["nodes"]
+        state.pop("order", None)
+        state.pop("added", None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state saved in a checkpoint.
+
+        Parameters:
+        - state (dict): Attributes of the queue.
+        """
+        self.__dict__.update(state)
+        self.counter = itertools.count(state["counter"])
+        self.nodes = {id(node[2]): node for node in self.heap}
+        self.order = sorted(self.heap)
+        self.added = []
+
+    def push(self, item, key):
+        """
+        Inserts an item in O(log n).
+
+        Parameters:
+        - item (dict): Executable to insert.
+        - key: Sort key of the item (period for RMS, absolute deadline for EDF).
+        """
+        node = [key, next(self.counter), item, False]
+        heapq.heappush(self.heap, node)
+        self.nodes[id(item)] = node
+        self.members.setdefault(self.ident(item), []).append(node)
+        self.size += 1
+        self.added.append(node)
+        self.view = None
+        self.bound_order()
+
+    def flag(self, item):
+        """
+        Marks an item for deletion. The item stays in the queue until `collect` is called.
+
+        Parameters:
+        - item (dict): Executable to flag.
+        """
+        node = self.nodes[id(item)]
+        if not node[3]:
+            node[3] = True
+            self.flagged.append(node)
+
+    @property
+    def pending(self):
+        """
+        Indicates if there are flagged items waiting to be collected.
+
+        Returns:
+        - bool: True if `collect` has work to do.
+        """
+        return bool(self.flagged)
+
+    def collect(self):
+        """
+        Removes every flagged item from the queue.
+
+        Returns:
+        - list: Items removed, in the order they were flagged.
+        """
+        if not self.flagged:
+            return []
+        removed = []
+        for node in self.flagged:
+            removed.append(node[2])
+            self.forget(node)
+            node[2] = REMOVED
+        self.flagged = []
+        self.size -= len(removed)
+        self.removed += len(removed)
+        self.view = None
+        self.prune()
+        return removed
+
+    def forget(self, node):
+        """
+        Removes a node from the lookup indexes.
+
+        Parameters:
+        - node (list): Heap node leaving the queue.
+        """
+        del self.nodes[id(node[2])]
+        key = self.ident(node[2])
+        entries = self.members[key]
+        entries.remove(node)
+        if not entries:
+            del self.members[key]
+
+    def entries(self, ident):
+        """
+        Gets the items of the queue with the given identifier, in insertion order.
+
+        Parameters:
+        - ident: Identifier of the items (task PID).
+
+        Returns:
+        - list: Items with that identifier.
+        """
+        return [node[2] for node in self.members.get(ident, ())]
+
+    def position(self, item):
+        """
+        Gets the place of an item in the priority order.
+
+        Parameters:
+        - item (dict): Executable in the queue.
+
+        Returns:
+        - tuple: (key, sequence) of the item; smaller positions come first.
+        """
+        node = self.nodes[id(item)]
+        return node[0], node[1]
+
+    def prune(self):
+        """
+        Drops collected nodes from the top of the heap and compacts it when they outnumber live items.
+        """
+        while self.heap and self.heap[0][2] is REMOVED:
+            heapq.heappop(self.heap)
+            self.removed -= 1
+        if self.removed > self.size:
+            self.heap = [node for node in self.heap if node[2] is not REMOVED]
+            heapq.heapify(self.heap)
+            self.removed = 0
+
+    def rekey(self, key):
+        """
+        Recomputes the key of every item and restores the heap order. Insertion order is kept for ties.
+
+        Parameters:
+        - key (callable): Function returning the new key of an item.
+        """
+        self.heap = [node for node in self.heap if node[2] is not REMOVED]
+        for node in self.heap:
+            node[0] = key(node[2])
+        heapq.heapify(self.heap)
+        self.removed = 0
+        self.order = sorted(self.heap)
+        self.added = []
+        self.view = None
+
+    def update(self, item, key):
+        """
+        Changes the key of one item in O(log n). The item goes after the items that already have the new key.
+
+        Parameters:
+        - item (dict): Executable in the queue.
+        - key: New sort key of the item.
+        """
+        node = self.nodes[id(item)]
+        replacement = [key, next(self.counter), item, node[3]]
+        entries = self.members[self.ident(item)]
+        entries[entries.index(node)] = replacement
+        self.nodes[id(item)] = replacement
+        if node[3]:
+            self.flagged[self.flagged.index(node)] = replacement
+        node[2] = REMOVED
+        self.removed += 1
+        heapq.heappush(self.heap, replacement)
+        self.added.append(replacement)
+        self.view = None
+        self.prune()
+        self.bound_order()
+
+    def discard(self, item):
+        """
+        Removes an item at once, without flagging it for `collect`.
+
+        Parameters:
+        - item (dict): Executable in the queue.
+        """
+        node = self.nodes[id(item)]
+        self.forget(node)
+        if node[3]:
+            self.flagged.remove(node)
+        node[2] = REMOVED
+        self.size -= 1
+        self.removed += 1
+        self.view = None
+        self.prune()
+
+    def peek(self):
+        """
+        Returns the item with the smallest key in O(1).
+
+        Returns:
+        - dict: First item of the queue, or None if the queue is empty.
+        """
+        return self.heap[0][2] if self.heap else None
+
+    def pop(self):
+        """
+        Removes and returns the item with the smallest key in O(log n).
+
+        Returns:
+        - dict: First item of the queue.
+        """
+        node = heapq.heappop(self.heap)
+        self.forget(node)
+        if node[3]:
+            self.flagged.remove(node)
+        item = node[2]
+        node[2] = REMOVED
+        self.size -= 1
+        self.view = None
+        self.prune()
+        return item
+
+    def ordered(self):
+        """
+        Iterates the items in priority order lazily, walking the heap from the root.
+
+        Visiting the first k items costs O(k log k) instead of sorting the whole
+        heap. The queue must not be pushed, popped or collected while iterating.
+        """
+        heap = self.heap
+        frontier = [(heap[0][0], heap[0][1], 0)] if heap else []
+        while frontier:
+            index = heapq.heappop(frontier)[2]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+            if heap[index][2] is not REMOVED:
+                yield heap[index][2]
+
+    def sort_order(self):
+        """
+        Merges the pushed nodes into the sorted order and drops the removed ones.
+        """
+        if self.added:
+            self.order.extend(self.added)
+            self.order.sort()
+            self.added = []
+        self.order = [node for node in self.order if node[2] is not REMOVED]
+
+    def bound_order(self):
+        """
+        Sorts the order when removed and unsorted nodes outnumber the live ones, so it stays bounded when the queue is not iterated.
+        """
+        if len(self.order) + len(self.added) > 2 * self.size + 64:
+            self.sort_order()
+
+    def __iter__(self):
+        """
+        Iterates the items in priority order. The ordered view is cached until the queue changes.
+        """
+        if self.view is None:
+            self.sort_order()
+            self.view = [node[2] for node in self.order]
+        return iter(self.view)
+
+    def __contains__(self, ident):
+        """
+        Checks in O(1) if an item with the given identifier is in the queue.
+        """
+        return ident in self.members
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"ReadyQueue({list(self)})"
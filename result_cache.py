@@ -0,0 +1,229 @@
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from functools import lru_cache
+
+RESULT_CACHE_DIRECTORY = os.path.join("results", "cache")
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024  # Bytes of cached results kept on disk
+# Modules whose code decides the result of a simulation; a change in any of them invalidates the cache
+SIMULATOR_SOURCES = ["scheduler.py", "rms.py", "edf.py", "task.py", "cpu.py", "ready_queue.py", "execution_history.py",
+                     "metrics.py", "events.py", "multiprocessor.py", "analysis.py", "servers.py", "task_table.py", "constants.py"]
+ENTRY_SUFFIX = ".result"
+
+@lru_cache(maxsize=None)
+def simulator_version():
+    """
+    Hashes the source of the simulator modules, so results of an older simulator are never reused.
+
+    Returns:
+    - str: Hexadecimal SHA-256 of the sources, computed once per process.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in SIMULATOR_SOURCES:
+        digest.update(name.encode())
+        with open(os.path.join(directory, name), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+def result_key(scheduler, seed=None):
+    """
+    Hashes everything that decides the result of a simulation that has not run yet.
+
+    The task set is normalized to (pid, period, execution_time, deadline) rows
+    in the order the tasks were added (the order breaks priority ties), so the
+    same tasks read from CSV, JSON Lines or binary files share a key. The seed
+    only counts when the tasks get random start times. The event-driven and
+    vectorized modes give the same results as the tick loop and are left out.
+
+    Parameters:
+    - scheduler (Scheduler): Scheduler with its tasks added.
+    - seed (int): Seed of the random start times (default is None).
+
+    Returns:
+    - str: Hexadecimal SHA-256 key, or None when the run cannot be cached (random
+      start times without a seed, aperiodic servers, or partitioned CPUs).
+    """
+    from multiprocessor import PartitionedScheduler
+    if isinstance(scheduler, PartitionedScheduler) or getattr(scheduler, "server", None) is not None:
+        return None
+    if scheduler.randomGenerator and seed is None:
+        return None
+    description = {
+        "scheduler": type(scheduler).__name__,
+        "algorithm": scheduler.name,
+        "simulation_time": scheduler.simulation_time,
+        "aperiodic": scheduler.aperiodic,
+        "seed": seed if scheduler.randomGenerator else None,
+        "extrapolate": scheduler.extrapolate,
+        "cpus": len(scheduler.cpus),
+        "tasks": [[str(task.pid), int(task.period), int(task.execution_time), int(task.deadline)] for task in scheduler.tasks],
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+class ResultCache:
+    """
+    On-disk cache of simulation results, addressed by the hash of their inputs.
+
+    An entry holds the statistic counters, the job metrics and the run-length
+    encoded history of every CPU of a finished run, which is all the reports
+    and the timeline read. Entries live in a directory named after the
+    simulator version, so editing the simulator invalidates them; directories
+    of other versions are deleted the next time the cache is trimmed. Reading
+    an entry refreshes its modification time, and the least recently used
+    entries are evicted once the cache grows over its size.
+
+    Attributes:
+    - directory (str): Root directory of the cache.
+    - max_bytes (int): Size the entries are trimmed to.
+    - hits (int): Runs answered from the cache.
+    - misses (int): Runs simulated and stored.
+    """
+    def __init__(self, directory=RESULT_CACHE_DIRECTORY, max_bytes=DEFAULT_CACHE_SIZE):
+        """
+        Initializes the cache. The directory is created on the first store.
+
+        Parameters:
+        - directory (str): Root directory of the cache (default is RESULT_CACHE_DIRECTORY).
+        - max_bytes (int): Size the entries are trimmed to (default is DEFAULT_CACHE_SIZE).
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, key):
+        """
+        Gets the file of an entry.
+
+        Parameters:
+        - key (str): Key of the entry.
+
+        Returns:
+        - str: Path of the entry in the directory of the current simulator version.
+        """
+        return os.path.join(self.directory, simulator_version(), key + ENTRY_SUFFIX)
+
+    def load(self, key):
+        """
+        Reads an entry and marks it as recently used.
+
+        Parameters:
+        - key (str): Key of the entry.
+
+        Returns:
+        - dict: Cached result, or None when there is no readable entry.
+        """
+        path = self.entry_path(key)
+        try:
+            with gzip.open(path, 'rb') as file:
+                entry = pickle.load(file)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return entry
+
+    def restore(self, key, scheduler):
+        """
+        Fills a scheduler that has not run with a cached result, as if it had run.
+
+        The statistics log is written again, so views that read it keep working;
+        the per-tick trace of the CPUs is not.
+
+        Parameters:
+        - key (str): Key of the run.
+        - scheduler (Scheduler): Scheduler the key was computed from.
+
+        Returns:
+        - bool: True if the result was found.
+        """
+        entry = self.load(key)
+        if entry is None:
+            return False
+        scheduler.statistics = entry["statistics"]
+        scheduler.job_metrics = entry["job_metrics"]
+        for cpu, history in zip(scheduler.cpus, entry["histories"]):
+            cpu.execution_history = history
+        scheduler.current_time = entry["current_time"]
+        scheduler.logger.info("Result restored from the cache entry %s", key)
+        scheduler.save_statistics()
+        return True
+
+    def store(self, key, scheduler):
+        """
+        Saves the result of a finished run and trims the cache.
+
+        The entry is written next to its target and renamed over it, so
+        concurrent runs and killed processes never leave a partial entry.
+
+        Parameters:
+        - key (str): Key of the run.
+        - scheduler (Scheduler): Scheduler after the run.
+        """
+        path = self.entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"statistics": scheduler.statistics,
+                 "job_metrics": scheduler.job_metrics,
+                 "histories": scheduler.cpu_histories(),
+                 "current_time": scheduler.current_time}
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(temporary, 'wb', compresslevel=1) as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        self.trim()
+
+    def trim(self):
+        """
+        Deletes the entries of other simulator versions, then the least recently used
+        entries until the cache fits in `max_bytes`.
+        """
+        version = simulator_version()
+        entries = []
+        for directory in os.scandir(self.directory):
+            if not directory.is_dir():
+                continue
+            if directory.name != version:
+                shutil.rmtree(directory.path, ignore_errors=True)
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Already evicted by another process sharing the cache
+                pass
+            total -= size
+
+    def run(self, scheduler, seed=None):
+        """
+        Runs a scheduler, or restores its result when the same run is cached.
+
+        Parameters:
+        - scheduler (Scheduler): Scheduler with its tasks added.
+        - seed (int): Seed of the random start times (default is None).
+
+        Returns:
+        - bool: True if the result came from the cache.
+        """
+        key = result_key(scheduler, seed)
+        if key is not None and self.restore(key, scheduler):
+            self.hits += 1
+            return True
+        scheduler.run()
+        if key is not None:
+            self.misses += 1
+            self.store(key, scheduler)
+        return False
@@ -0,0 +1,291 @@
+import csv
+import json
+import os
+from collections import deque
+from datetime import datetime
+from events import SchedulerEvent
+from scheduler import Statistic
+from constants import GENERAL_STATISTICS
+
+RESULT_FORMATS = ["csv", "jsonl", "parquet"]
+STATISTIC_COLUMNS = {statistic.value: statistic.value.lower().replace(" ", "_") for statistic in
+                     (Statistic.missed_deadlines, Statistic.executed_periods, Statistic.non_executed_periods,
+                      Statistic.executed_periods_percentage, Statistic.non_executed_periods_percentage, Statistic.migrations)}
+TASK_FIELDS = ["run", "task"] + list(STATISTIC_COLUMNS.values())
+JOB_FIELDS = ["run", "task", "release", "start", "finish", "deadline", "missed"]
+SEGMENT_FIELDS = ["run", "cpu", "task", "start", "finish"]
+# Column types of the typed formats; the other columns are integers
+COLUMN_TYPES = {"run": "string", "task": "string", "cpu": "string", "missed": "bool",
+                "executed_periods_percentage": "float64", "non_executed_periods_percentage": "float64"}
+DEFAULT_BATCH = 4096  # Job records buffered before they are written
+JOB_EVENTS = (SchedulerEvent.release, SchedulerEvent.start, SchedulerEvent.completion, SchedulerEvent.deadline_miss)
+
+class CsvTable:
+    """
+    Table appended to a CSV file; the header is written only when the file is new.
+    """
+    def __init__(self, directory, name, fields, run):
+        """
+        Opens the table of a dataset.
+
+        Parameters:
+        - directory (str): Dataset directory.
+        - name (str): Name of the table.
+        - fields (list): Column names.
+        - run (str): Identifier of the run writing to the table.
+        """
+        self.filename = os.path.join(directory, name + ".csv")
+        new = not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0
+        self.file = open(self.filename, 'a', newline='')
+        self.writer = csv.writer(self.file)
+        if new:
+            self.writer.writerow(fields)
+
+    def write(self, rows):
+        """
+        Appends rows to the table.
+
+        Parameters:
+        - rows (list): Rows, with the values in column order.
+        """
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        """
+        Closes the table.
+        """
+        self.file.close()
+
+class JsonLinesTable:
+    """
+    Table appended to a JSON Lines file, one object per row.
+    """
+    def __init__(self, directory, name, fields, run):
+        """
+        Opens the table of a dataset.
+
+        Parameters:
+        - directory (str): Dataset directory.
+        - name (str): Name of the table.
+        - fields (list): Column names.
+        - run (str): Identifier of the run writing to the table.
+        """
+        self.filename = os.path.join(directory, name + ".jsonl")
+        self.fields = fields
+        self.file = open(self.filename, 'a')
+
+    def write(self, rows):
+        """
+        Appends rows to the table.
+
+        Parameters:
+        - rows (list): Rows, with the values in column order.
+        """
+        self.file.writelines(json.dumps(dict(zip(self.fields, row))) + "\n" for row in rows)
+        self.file.flush()
+
+    def close(self):
+        """
+        Closes the table.
+        """
+        self.file.close()
+
+class ParquetTable:
+    """
+    Table stored as a Parquet dataset: a directory where every write adds a part file
+    named after the run, so runs are appended without rewriting earlier parts. Every
+    part has the same schema, even when a column of a batch is empty. Requires pyarrow.
+    """
+    def __init__(self, directory, name, fields, run):
+        """
+        Opens the table of a dataset.
+
+        Parameters:
+        - directory (str): Dataset directory.
+        - name (str): Name of the table.
+        - fields (list): Column names.
+        - run (str): Identifier of the run writing to the table.
+        """
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.directory = os.path.join(directory, name)
+        self.fields = fields
+        types = {"string": pyarrow.string, "bool": pyarrow.bool_, "float64": pyarrow.float64}
+        self.schema = pyarrow.schema([(field, types.get(COLUMN_TYPES.get(field), pyarrow.int64)()) for field in fields])
+        self.run = run
+        self.parts = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, rows):
+        """
+        Appends rows to the table.
+
+        Parameters:
+        - rows (list): Rows, with the values in column order.
+        """
+        if not rows:
+            return
+        columns = {field: list(column) for field, column in zip(self.fields, zip(*rows))}
+        self.parquet.write_table(self.pyarrow.table(columns, schema=self.schema), os.path.join(self.directory, f"{self.run}-{self.parts:05d}.parquet"))
+        self.parts += 1
+
+    def close(self):
+        """
+        Closes the table; every part file is complete once written.
+        """
+
+TABLES = {"csv": CsvTable, "jsonl": JsonLinesTable, "parquet": ParquetTable}
+
+def default_run_id(scheduler):
+    """
+    Builds an identifier for a run from the algorithm and the current time.
+
+    Parameters:
+    - scheduler (Scheduler): Scheduler of the run.
+
+    Returns:
+    - str: For example 'EDF-20240501T101500123456'.
+    """
+    return f"{scheduler.name}-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+
+class ResultsExporter:
+    """
+    Streams the results of a run to a dataset of three tables: per-task statistics
+    (`tasks`), per-job records (`jobs`) and CPU execution segments (`segments`).
+
+    Job records are built from the scheduling events of the run (release,
+    start, completion and deadline miss) and written in batches while it runs,
+    together with the segments the CPUs closed since the previous batch. The
+    statistics, the remaining segments and the jobs still pending at the end
+    (without finish) are written by `close`. An overrunning task can have
+    several jobs pending, so they are kept in release order: a start goes to the
+    job of the release the task is running, and a completion or a miss closes
+    the oldest pending job. A miss counted for a task with no job pending (its
+    last job was already closed) gets a row of its own, so the missed rows add
+    up to the missed deadlines of the task statistics. Every row carries the run
+    identifier, and tables are appended to, so several runs share one dataset.
+
+    Attributes:
+    - scheduler (Scheduler): Scheduler of the run.
+    - run (str): Identifier of the run in every row.
+    - tables (dict): Table writer by table name.
+    - open_jobs (dict): Records of the pending jobs of every task, in release order.
+    - last_jobs (dict): Last record closed of every task.
+    - jobs (list): Job records waiting to be written.
+    - written (list): Segments already written, for every CPU.
+    """
+    def __init__(self, scheduler, directory, format="csv", run=None, batch=DEFAULT_BATCH):
+        """
+        Opens the tables and subscribes to the job events of the scheduler.
+
+        Parameters:
+        - scheduler (Scheduler): Scheduler with its tasks added, before it runs.
+        - directory (str): Dataset directory, created if needed.
+        - format (str): 'csv', 'jsonl' or 'parquet' (default is 'csv').
+        - run (str): Identifier of the run (default is the algorithm and the current time).
+        - batch (int): Job records written at once (default is DEFAULT_BATCH).
+        """
+        if format not in TABLES:
+            raise ValueError(f"Unknown results format {format}, use one of {', '.join(RESULT_FORMATS)}")
+        if scheduler.extrapolate and not scheduler.aperiodic:
+            raise ValueError("Per-job records need every job simulated, which hyperperiod extrapolation skips")
+        os.makedirs(directory, exist_ok=True)
+        self.scheduler = scheduler
+        self.run = run or default_run_id(scheduler)
+        self.batch = batch
+        self.tables = {name: TABLES[format](directory, name, fields, self.run)
+                       for name, fields in (("tasks", TASK_FIELDS), ("jobs", JOB_FIELDS), ("segments", SEGMENT_FIELDS))}
+        self.open_jobs = {}
+        self.last_jobs = {}
+        self.jobs = []
+        self.written = [0] * len(scheduler.cpus)
+        scheduler.subscribe(self.on_event, *JOB_EVENTS)
+
+    def on_event(self, event):
+        """
+        Updates the job records with a scheduling event.
+
+        Parameters:
+        - event (SchedulingEvent): Release, start, completion or deadline miss.
+        """
+        if event.kind is SchedulerEvent.release:
+            task = self.scheduler.task_registry[event.pid]
+            self.open_jobs.setdefault(event.pid, deque()).append([self.run, event.pid, event.time, None, None, event.time + task.deadline, False])
+            return
+        jobs = self.open_jobs.get(event.pid)
+        if event.kind is SchedulerEvent.start:
+            if jobs:
+                release = self.scheduler.task_registry[event.pid].startedTime
+                job = next((job for job in jobs if job[2] == release), None) or next((job for job in jobs if job[3] is None), jobs[0])
+                job[3] = event.time
+            return
+        if event.kind is SchedulerEvent.completion:
+            if not jobs:
+                return
+            # The job finishes at the end of the tick of its completion
+            job = next((job for job in jobs if job[3] is not None), jobs[0])
+            jobs.remove(job)
+            job[4] = event.time + 1
+            self.close_job(job)
+            return
+        for _ in range(event.count):
+            if jobs:
+                job = jobs.popleft()
+                job[6] = True
+            elif event.pid in self.last_jobs:
+                # Miss counted again for a job already closed
+                job = self.last_jobs[event.pid][:]
+                job[3], job[4], job[6] = None, None, True
+            else:
+                task = self.scheduler.task_registry[event.pid]
+                job = [self.run, event.pid, task.startedTime, None, None, task.startedTime + task.deadline, True]
+            self.close_job(job)
+
+    def close_job(self, job):
+        """
+        Buffers the record of a job that finished or missed its deadline, writing the batch when it is full.
+
+        Parameters:
+        - job (list): Job record.
+        """
+        self.last_jobs[job[1]] = job
+        self.jobs.append(job)
+        if len(self.jobs) >= self.batch:
+            self.flush()
+
+    def flush(self, final=False):
+        """
+        Writes the buffered job records and the segments closed since the last flush.
+
+        Parameters:
+        - final (bool): Indicates if the last segment of every CPU is written too (default is False, it may still grow).
+        """
+        self.tables["jobs"].write(self.jobs)
+        self.jobs = []
+        segments = []
+        for index, (cpu, history) in enumerate(zip(self.scheduler.cpus, self.scheduler.cpu_histories())):
+            end = len(history.starts) if final else len(history.starts) - 1
+            for position in range(self.written[index], end):
+                segments.append((self.run, cpu.name, history.task_name(history.tasks[position]),
+                                 history.starts[position], history.finishes[position]))
+            self.written[index] = max(self.written[index], end)
+        self.tables["segments"].write(segments)
+
+    def close(self):
+        """
+        Writes what is left of the run and the statistics, unsubscribes and closes the tables.
+        """
+        self.scheduler.unsubscribe(self.on_event)
+        for jobs in self.open_jobs.values():
+            self.jobs.extend(jobs)
+        self.open_jobs = {}
+        self.flush(final=True)
+        statistics = self.scheduler.get_statistics()
+        statistics[GENERAL_STATISTICS] = self.scheduler.get_general_statistics()
+        self.tables["tasks"].write([[self.run, pid] + [stats.get(name) for name in STATISTIC_COLUMNS]
+                                    for pid, stats in statistics.items()])
+        for table in self.tables.values():
+            table.close()
@@ -1,4 +1,5 @@
 from scheduler import Scheduler, ExecutableItems
+from analysis import analyze_rms
 
 class RateMonotonicScheduler(Scheduler):
     def calculate_utilization(self):
@@ -11,30 +12,19 @@ class RateMonotonicScheduler(Scheduler):
         utilization = sum(task.execution_time / task.period for task in self.tasks)
         return utilization
 
+    def schedulability_tests(self):
+        """
+        Runs the Liu & Layland bound, the hyperbolic bound and the response-time analysis.
+
+        Returns:
+        - Tuple[Verdict, list]: Overall verdict and the results of the tests run.
+        """
+        return analyze_rms(self.tasks)
+
     def run(self):
         """
         Runs the Rate Monotonic Scheduler.
         """
         self.tasks.sort(key=lambda task: task.period)  # RMS: Ordena por periodo (menor a mayor)
         self.assign_priorities()
-
-        for self.current_time in range(self.simulation_time):
-            self.garbageCollector()
-            for task in self.tasks:
-                self.periodTriggered(task, ExecutableItems.period)
-            executed = False
-            count_executables = len(self.execution_queue)
-            self.evaluateEmptyRun(-1, executed, count_executables)
-            for index, task_pid in enumerate(self.execution_queue):
-                self.logger.info(f"Queue {self.execution_queue}")
-                self.logger.info(f"Task {task_pid[ExecutableItems.pid.value]}")
-                if not self.is_deadline_met(task_pid) and not executed:
-                    task, task_finished, executed = self.send_task_to_cpu(task_pid)
-                    if task_finished:
-                        self.logger.info(f"Task {task.pid} finished at {self.current_time}")
-                        self.removeExecutable(task.pid)
-                    self.updateTask(task)
-                else:
-                    self.evaluateEmptyRun(index, executed, count_executables)
-        self.cpu.print_history()
-        self.save_statistics()
+        self.simulate(lambda task: self.periodTriggered(task, ExecutableItems.period), ExecutableItems.period)
@@ -1,8 +1,14 @@
 import heapq
+import math
 import time
-from tabulate import tabulate
+from collections import deque
+from operator import itemgetter
 from cpu import CPU
 from logger import Logger
+from ready_queue import ReadyQueue
+from checkpoint import write_checkpoint
+from events import SchedulerEvent, SchedulingEvent
+from metrics import JobMetric, Distribution
 from enum import Enum
 import random
 from constants import SCHEDULER_LOGGER, GENERAL_STATISTICS
@@ -21,9 +27,10 @@ class Statistic(Enum):
     missed_deadlines_percentage = "Missed Deadlines Percentage"  # Percentage of missed deadlines
     executed_periods_percentage = "Executed Periods Percentage"  # Percentage of executed periods
     non_executed_periods_percentage = "Non executed Periods Percentage"  # Percentage of non-executed periods
+    migrations = "Migrations"  # Number of times a job resumed on a different CPU (multiprocessor only)
 
 class Scheduler:
-    def __init__(self, simulation_time, name, cpu, aperiodic=False, randomGenerator=False):
+    def __init__(self, simulation_time, name, cpu, aperiodic=False, randomGenerator=False, eventDriven=False, extrapolate=False, seed=None, vectorized=False):
         """
         Initializes the scheduler with simulation parameters and configurations.
         
@@ -33,38 +40,196 @@ class Scheduler:
         - cpu (CPU): CPU object for task execution.
         - aperiodic (bool): Flag indicating if the scheduler supports aperiodic tasks.
         - randomGenerator (bool): Flag indicating if random time generation is enabled.
+        - eventDriven (bool): Flag indicating if time jumps between scheduling events instead of stepping every tick.
+        - extrapolate (bool): Flag indicating if periodic runs stop simulating once the schedule repeats every hyperperiod and extrapolate the statistics.
+        - seed (int): Seed of the scheduler's own random generator; without it the global `random` module is used.
+        - vectorized (bool): Flag indicating if releases and deadline checks run as NumPy operations over a TaskTable (requires numpy).
         """
         self.simulation_time = simulation_time
         self.tasks = []
+        self.task_registry = {}
         self.name = name
         self.current_time = 0
         self.cpu = cpu
+        self.cpus = [cpu]
         self.statistics = {}
+        self.job_metrics = {}
+        self.jobs = {}
         self.preemp = True
         self.randomGenerator = randomGenerator
+        self.random = random.Random(seed) if seed is not None else random
         self.aperiodic = aperiodic
-        self.execution_queue = []
+        self.eventDriven = eventDriven
+        self.extrapolate = extrapolate
+        self.vectorized = vectorized
+        self.task_table = None
+        self.queue_key = None
+        self.steady_state = None
+        self.checkpoint_path = None
+        self.checkpoint_interval = 0
+        self.next_checkpoint = 0
+        self.resumed = False
+        self.progress = None
+        self.progress_interval = 0
+        self.next_progress = 0
+        self.observers = {}
+        self.arrival_offsets = deque()
+        self.execution_queue = ReadyQueue(itemgetter(ExecutableItems.pid.value))
         self.logPath = SCHEDULER_LOGGER + "-" + name
         self.logger = Logger(self.logPath) 
         self.statisticsLogger = Logger(self.logPath + "-statistics")
-        self.statistics[GENERAL_STATISTICS] = {
-            Statistic.missed_deadlines.value: 0,
-            Statistic.executed_periods.value: 0,
-            Statistic.non_executed_periods.value: self.simulation_time
-        }
         
+    def __getstate__(self):
+        """
+        Gets the state saved in a checkpoint. Without a seed the state of the global `random` module is saved instead of the module.
+        
+        Returns:
+        - dict: Attributes of the scheduler.
+        """
+        state = self.__dict__.copy()
+        state["progress"] = None
+        state["observers"] = {}
+        if self.random is random:
+            state["random"] = None
+            state["global_random"] = random.getstate()
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state saved in a checkpoint.
+        
+        Parameters:
+        - state (dict): Attributes of the scheduler.
+        """
+        global_random = state.pop("global_random", None)
+        self.__dict__.update(state)
+        for cpu in self.cpus:
+            cpu.notify = None
+        if self.random is None:
+            self.random = random
+            random.setstate(global_random)
+
+    def set_checkpoint(self, filename, interval=0):
+        """
+        Configures the checkpoints of the simulation.
+        
+        Parameters:
+        - filename (str): Checkpoint file, replaced by every new checkpoint; None disables checkpoints.
+        - interval (int): Simulation time between checkpoints; 0 saves only at the end of the run (default is 0).
+        """
+        self.checkpoint_path = filename
+        self.checkpoint_interval = interval
+        self.next_checkpoint = self.current_time + interval if interval else self.simulation_time + 1
+
+    def save_checkpoint(self):
+        """
+        Saves the scheduler to its checkpoint file and schedules the next checkpoint.
+        """
+        if self.checkpoint_interval:
+            self.next_checkpoint = self.current_time + self.checkpoint_interval
+        self.logger.info("Checkpoint at %s in %s", self.current_time, self.checkpoint_path)
+        write_checkpoint(self, self.checkpoint_path)
+
+    def set_progress(self, callback, interval):
+        """
+        Configures the progress reports of the simulation.
+        
+        Parameters:
+        - callback (callable): Function called with the scheduler every `interval` time units and at the end of the run; None disables the reports. An exception raised by it stops the run.
+        - interval (int): Simulation time between reports.
+        """
+        self.progress = callback
+        self.progress_interval = max(interval, 1)
+        self.next_progress = self.current_time
+
+    def report_progress(self):
+        """
+        Calls the progress callback and schedules the next report.
+        """
+        self.next_progress = self.current_time + self.progress_interval
+        self.progress(self)
+
+    def subscribe(self, callback, *kinds):
+        """
+        Calls a function with every scheduling event of the given kinds.
+
+        Events are only built while someone is subscribed, so an unobserved run
+        pays one check per emission point.
+        
+        Parameters:
+        - callback (callable): Function called with a SchedulingEvent.
+        - kinds (SchedulerEvent): Kinds of event to observe (default is every kind).
+        """
+        for kind in kinds or SchedulerEvent:
+            self.observers.setdefault(kind, []).append(callback)
+        self.connect_cpus()
+
+    def unsubscribe(self, callback):
+        """
+        Stops calling a function subscribed with `subscribe`.
+        
+        Parameters:
+        - callback (callable): Function to remove from every kind of event.
+        """
+        for kind in list(self.observers):
+            self.observers[kind] = [observer for observer in self.observers[kind] if observer != callback]
+            if not self.observers[kind]:
+                del self.observers[kind]
+        self.connect_cpus()
+
+    def connect_cpus(self):
+        """
+        Lets the CPUs report dispatch and idle events only while someone observes them.
+        """
+        notify = self.emit if SchedulerEvent.dispatch in self.observers or SchedulerEvent.idle in self.observers else None
+        for cpu in self.cpus:
+            cpu.notify = notify
+
+    def emit(self, kind, time, pid=None, cpu=None, count=1):
+        """
+        Sends a scheduling event to its observers.
+        
+        Parameters:
+        - kind (SchedulerEvent): What happened.
+        - time (int): Simulation time of the event.
+        - pid (str): PID of the task involved (default is None).
+        - cpu (str): Name of the CPU involved (default is None).
+        - count (int): Number of occurrences the event stands for (default is 1).
+        """
+        callbacks = self.observers.get(kind)
+        if callbacks:
+            event = SchedulingEvent(kind, time, pid, cpu, count)
+            for callback in callbacks:
+                callback(event)
+
+    def draw_arrival_offsets(self, count):
+        """
+        Draws the random start times of the next aperiodic tasks in one call to the random generator.
+
+        The offsets are used in order by the next `count` tasks added with random
+        start times; later tasks draw theirs one at a time again.
+
+        Parameters:
+        - count (int): Number of start times to draw.
+        """
+        if self.simulation_time < 0:
+            raise ValueError("Limit must be non-negative.")
+        self.arrival_offsets.extend(self.random.choices(range(self.simulation_time + 1), k=count))
+
     def initialize_random_int(self):
         """
         Generate a random integer between 0 and the specified limit.
         
         Returns:
-        - int: A random integer between 0 and `simulation_time`.
+        - int: A random integer between 0 and `simulation_time`, taken from the offsets drawn by `draw_arrival_offsets` if any are left.
         """
+        if self.arrival_offsets:
+            return self.arrival_offsets.popleft()
         if self.simulation_time < 0:
             raise ValueError("Limit must be non-negative.")
         
         # Generate a random integer between 0 and simulation_time
-        random_int = random.randint(0, self.simulation_time)
+        random_int = self.random.randint(0, self.simulation_time)
         
         return random_int
 
@@ -75,65 +240,138 @@ class Scheduler:
         Parameters:
         - task (Task): Task object to be added.
         """
+        self.track_task(task)
+        if self.aperiodic:
+            self.schedule_arrival(task)
+        self.tasks.append(task)
+        self.task_registry.setdefault(task.pid, task)
+
+    def track_task(self, task):
+        """
+        Creates the statistic counters and job metrics of a task.
+        
+        Parameters:
+        - task (Task): Task to track.
+        """
         self.statistics[task.pid] = {
             Statistic.missed_deadlines.value: 0,
-            Statistic.executed_periods.value: 0,
-            Statistic.non_executed_periods.value: self.simulation_time
+            Statistic.executed_periods.value: 0
         }
-        if self.aperiodic:
-            task.aperiodic = self.aperiodic
-            task.updatedStartedTime(task.period)
-            if self.randomGenerator:
-                task.updatedStartedTime(self.initialize_random_int())
-        self.tasks.append(task)
+        self.job_metrics[task.pid] = {metric.value: Distribution() for metric in JobMetric}
+
+    def schedule_arrival(self, task):
+        """
+        Marks a task as aperiodic. Its arrival time is the period column of the task file, or a random time.
+        
+        Parameters:
+        - task (Task): Aperiodic task.
+        """
+        task.aperiodic = True
+        task.updatedStartedTime(task.period)
+        if self.randomGenerator:
+            task.updatedStartedTime(self.initialize_random_int())
 
-    def update_statistics(self, task, statistic):
+    def update_statistics(self, task, statistic, count=1):
         """
-        Updates the statistics based on task execution.
+        Updates the statistic counters based on task execution.
+
+        Only the raw counters are kept during the simulation; non executed periods
+        and percentages are derived from them by `get_statistics`.
         
         Parameters:
         - task (Task): Task for which statistics are updated.
-        - statistic (Statistic): Type of statistic to update.
+        - statistic (Statistic): Counter to update (missed deadlines or executed periods).
+        - count (int): Number of occurrences to add (default is 1).
+        """
+        self.statistics[task.pid][statistic.value] += count
+        if self.observers and statistic is Statistic.missed_deadlines:
+            self.emit(SchedulerEvent.deadline_miss, self.current_time, task.pid, count=count)
+
+    def statistics_report(self, missed, executed, cpus=1, elapsed=None):
+        """
+        Builds the statistics of a task, or of all of them, from its counters.
+        
+        Parameters:
+        - missed (int): Missed deadlines.
+        - executed (int): Executed periods.
+        - cpus (int): Number of CPUs whose time is counted (default is 1).
+        - elapsed (int): Time the counters cover (default is the simulation time; the current time for a run in progress).
+        
+        Returns:
+        - dict: Counters, non executed periods and percentages.
+        """
+        total = self.simulation_time if elapsed is None else elapsed
+        non_executed = total * cpus - executed
+        return {Statistic.missed_deadlines.value: missed,
+                Statistic.executed_periods.value: executed,
+                Statistic.non_executed_periods.value: non_executed,
+                Statistic.executed_periods_percentage.value: self.calculate_percentage(executed, total) / cpus,
+                Statistic.non_executed_periods_percentage.value: self.calculate_percentage(non_executed, total) / cpus}
+
+    def job_dispatched(self, task):
         """
-        self.statistics[task.pid][statistic.value] += 1
-        self.statistics[GENERAL_STATISTICS][statistic.value] += 1
-        if statistic == Statistic.executed_periods:
-            self.statistics[task.pid][Statistic.non_executed_periods.value] -= 1
-            self.statistics[GENERAL_STATISTICS][Statistic.non_executed_periods.value] -= 1
-        self.calculate_statistics_percentage(task)
+        Records the start jitter of a job the first time it gets the CPU. Jobs are told apart by their release time.
+        
+        Parameters:
+        - task (Task): Task about to run.
+        """
+        job = self.jobs.get(task.pid)
+        if job is None or job[0] != task.startedTime:
+            self.jobs[task.pid] = [task.startedTime, 0]
+            self.job_metrics[task.pid][JobMetric.start_jitter.value].add(self.current_time - task.startedTime)
+            if self.observers:
+                self.emit(SchedulerEvent.start, self.current_time, task.pid)
 
-    def calculate_statistics_percentage(self, task):
+    def job_preempted(self, task):
         """
-        Calculates the percentage values for statistics.
+        Counts a preemption of the running job of a task.
         
         Parameters:
-        - task (Task): Task for which percentage values are calculated.
+        - task (Task): Task that lost the CPU.
+        """
+        job = self.jobs.get(task.pid)
+        if job is not None:
+            job[1] += 1
+        if self.observers:
+            self.emit(SchedulerEvent.preemption, self.current_time, task.pid)
+
+    def job_completed(self, task):
         """
-        self.statistics[task.pid][Statistic.executed_periods_percentage.value] = self.calculate_percentage(self.statistics[task.pid][Statistic.executed_periods.value])
-        self.statistics[GENERAL_STATISTICS][Statistic.executed_periods_percentage.value] = self.calculate_percentage(self.statistics[GENERAL_STATISTICS][Statistic.executed_periods.value])
-        self.statistics[task.pid][Statistic.non_executed_periods_percentage.value] = self.calculate_percentage(self.statistics[task.pid][Statistic.non_executed_periods.value])
-        self.statistics[GENERAL_STATISTICS][Statistic.non_executed_periods_percentage.value] = self.calculate_percentage(self.statistics[GENERAL_STATISTICS][Statistic.non_executed_periods.value])
+        Records the response time, lateness and preemptions of a job that finished in the current tick.
         
+        Parameters:
+        - task (Task): Task whose job finished.
+        """
+        release, preemptions = self.jobs.pop(task.pid)
+        response_time = self.current_time + 1 - release
+        metrics = self.job_metrics[task.pid]
+        metrics[JobMetric.response_time.value].add(response_time)
+        metrics[JobMetric.lateness.value].add(response_time - task.deadline)
+        metrics[JobMetric.preemptions.value].add(preemptions)
+        if self.observers:
+            self.emit(SchedulerEvent.completion, self.current_time, task.pid)
 
-    def calculate_percentage(self, value):
+    def calculate_percentage(self, value, total=None):
         """
         Calculates the percentage value.
         
         Parameters:
         - value (int): Value to calculate the percentage for.
+        - total (int): Time the percentage is taken of (default is the simulation time).
         
         Returns:
-        - float: Percentage value.
+        - float: Percentage value, 0 when the total is 0.
         """
-        return value*100/self.simulation_time
+        total = self.simulation_time if total is None else total
+        return value*100/total if total else 0.0
         
     def save_statistics(self):
         """
         Saves the statistics to log files.
         """
-        # Extract general statistics and remaining tasks
-        general_stats = self.statistics.pop('GENERAL_STATISTICS')  # Save and remove 'GENERAL_STATISTICS'
-        tasks = self.statistics.items()  # Get the rest of the tasks
+        # Derive the general statistics and the statistics of every task
+        general_stats = self.get_general_statistics()
+        tasks = self.get_statistics().items()
 
         # Determine column widths based on the longest content in each column
         headers = ["Task"] + list(general_stats.keys())
@@ -170,28 +408,399 @@ class Scheduler:
         self.statisticsLogger.info(general_row_str)
         self.statisticsLogger.info(horizontal_border)
 
+        # Print the job metrics of the whole run
+        for metric, summary in self.get_job_metrics()[GENERAL_STATISTICS].items():
+            self.statisticsLogger.info("%s: %s", metric, summary)
+
     def run(self):
         """
         Method that simulates the scheduling.
         """
         raise NotImplementedError("Scheduler subclass must implement the 'run' method")
+
+    def analyze(self):
+        """
+        Runs the schedulability analysis of the task set, before or instead of the simulation.
+        
+        Returns:
+        - Tuple[Verdict, list]: Overall verdict and the results of the tests run.
+        """
+        verdict, results = self.schedulability_tests()
+        for result in results:
+            self.logger.info("%s: %s (%s)", result["test"], result["verdict"].value, result["detail"])
+        self.logger.info("Schedulability verdict: %s", verdict.value)
+        return verdict, results
+
+    def schedulability_tests(self):
+        """
+        Method that runs the analytic tests of the scheduling algorithm.
+        """
+        raise NotImplementedError("Scheduler subclass must implement the 'schedulability_tests' method")
+
+    def simulate(self, release, key):
+        """
+        Runs the scheduling loop from time 0 until `simulation_time`.
+
+        In event-driven mode the quiet ticks between two scheduling events are
+        applied in a single step by `fast_forward`, so the cost depends on the
+        number of events instead of the elapsed time. With `extrapolate` the
+        state is compared at every hyperperiod boundary and the run stops
+        simulating as soon as the schedule repeats (see `extrapolate_hyperperiods`).
+        With `vectorized` the tasks released at each tick are found with one
+        array operation over a TaskTable instead of visiting every task.
+        With a checkpoint file (see `set_checkpoint`) the whole scheduler is saved
+        at the start of a tick every `checkpoint_interval` time units and at the
+        end; a scheduler restored from it continues from that tick. With a progress
+        callback (see `set_progress`) the scheduler is reported at the start of a
+        tick every `progress_interval` time units and at the end.
+        
+        Parameters:
+        - release (callable): Function called with every task at the start of each tick to handle its release.
+        - key (ExecutableItems): Key used to order the execution queue.
+        """
+        self.queue_key = key
+        if self.resumed:
+            # Restored from a checkpoint: the clock, queue and task table continue where they were
+            self.resumed = False
+            self.logger.info("Resuming at %s", self.current_time)
+        else:
+            self.current_time = 0
+            if self.vectorized:
+                from task_table import TaskTable
+                self.task_table = TaskTable(self.tasks)
+        hyperperiod = self.hyperperiod() if self.extrapolate and not self.aperiodic else 0
+        if hyperperiod:
+            self.logger.info("Hyperperiod %s", hyperperiod)
+        while self.current_time < self.simulation_time:
+            if self.checkpoint_path and self.current_time >= self.next_checkpoint:
+                self.save_checkpoint()
+            if self.progress is not None and self.current_time >= self.next_progress:
+                self.report_progress()
+            if hyperperiod and self.current_time % hyperperiod == 0 and self.extrapolate_hyperperiods(hyperperiod):
+                continue
+            self.garbageCollector()
+            for task in self.released_tasks():
+                release(task)
+            self.dispatch()
+            self.current_time += 1
+            if self.eventDriven:
+                self.fast_forward()
+        if self.checkpoint_path:
+            # The last checkpoint lets a longer run continue from the end of this one
+            self.save_checkpoint()
+        if self.progress is not None:
+            self.report_progress()
+        for cpu in self.cpus:
+            if cpu.logger.traceEnabled():
+                cpu.print_history()
+        self.save_statistics()
+
+    def released_tasks(self):
+        """
+        Gets the tasks whose release has to be handled at the current time.
+
+        Without a TaskTable every task is visited and the release function decides.
+        
+        Returns:
+        - list: Periodic tasks whose period divides the current time, in task order.
+        """
+        if self.task_table is None:
+            return self.tasks
+        return [self.tasks[row] for row in self.task_table.released(self.current_time)]
+
+    def enqueue(self, executable, key):
+        """
+        Pushes an executable into the execution queue.
+        
+        Parameters:
+        - executable (dict): Executable to add.
+        - key: Sort key of the executable.
+        """
+        self.execution_queue.push(executable, key)
+        if self.observers:
+            self.emit(SchedulerEvent.release, self.current_time, executable[ExecutableItems.pid.value])
+        if self.task_table is not None:
+            self.task_table.queued[self.task_table.rows[executable[ExecutableItems.pid.value]]] += 1
+
+    def sync_task(self, task_pid):
+        """
+        Copies the start time of a task into the TaskTable, if there is one.
+        
+        Parameters:
+        - task_pid (str): Process ID of the task.
+        """
+        if self.task_table is not None:
+            self.task_table.started[self.task_table.rows[task_pid]] = self.task_registry[task_pid].startedTime
+
+    def hyperperiod(self):
+        """
+        Calculates the hyperperiod of the task set, the least common multiple of the periods.
+
+        Periodic tasks are all released synchronously at time 0, so the release
+        pattern repeats at every multiple of the hyperperiod without an offset.
+        
+        Returns:
+        - int: Hyperperiod, or 0 if there are no tasks.
+        """
+        if not self.tasks:
+            return 0
+        return math.lcm(*(task.period for task in self.tasks))
+
+    def snapshot_state(self):
+        """
+        Builds a signature of the scheduler state relative to the current time.
+
+        Two signatures taken at times that differ by a multiple of the hyperperiod
+        are equal only if the simulation behaves the same from both instants.
+        Started times older than the largest deadline are clamped because any of
+        them already counts as an expired deadline.
+        
+        Returns:
+        - tuple: Hashable signature of the queue, the tasks, the CPU and the jobs in progress.
+        """
+        horizon = max(task.deadline for task in self.tasks)
+        queue = tuple((executable[ExecutableItems.pid.value],
+                       executable[ExecutableItems.deadline.value] - self.current_time,
+                       executable[ExecutableItems.startTime.value] - self.current_time,
+                       executable[ExecutableItems.delete.value]) for executable in self.execution_queue)
+        tasks = tuple((task.runningTime, task.started, max(task.startedTime - self.current_time, -horizon - 1)) for task in self.tasks)
+        current_task = self.cpu.current_task.pid if self.cpu.current_task else None
+        jobs = tuple(sorted((pid, max(release - self.current_time, -horizon - 1), preemptions) for pid, (release, preemptions) in self.jobs.items()))
+        return queue, tasks, current_task, jobs
+
+    def snapshot_statistics(self):
+        """
+        Copies the statistic counters and job metrics of every task.
+        
+        Returns:
+        - dict: Missed deadlines, executed periods and copies of the job metric distributions by task PID.
+        """
+        return {pid: (self.statistics[pid][Statistic.missed_deadlines.value], self.statistics[pid][Statistic.executed_periods.value],
+                      {metric: distribution.copy() for metric, distribution in self.job_metrics[pid].items()})
+                for pid in self.task_registry}
+
+    def extrapolate_hyperperiods(self, hyperperiod):
+        """
+        Skips whole hyperperiods once the schedule reaches its steady state.
+
+        Called at every multiple of the hyperperiod. When the state is the same as
+        one hyperperiod ago the next hyperperiods repeat the last one, so the
+        statistics gathered in it are scaled to the remaining full hyperperiods and
+        the clock jumps over them. Only the remainder is simulated afterwards. The
+        CPU history keeps the simulated ticks only.
+        
+        Parameters:
+        - hyperperiod (int): Hyperperiod of the task set.
+        
+        Returns:
+        - bool: True if the clock jumped forward.
+        """
+        state = self.snapshot_state()
+        statistics = self.snapshot_statistics()
+        previous = self.steady_state
+        self.steady_state = (state, statistics)
+        if not previous or previous[0] != state:
+            return False
+        repetitions = (self.simulation_time - self.current_time) // hyperperiod
+        if repetitions <= 0:
+            return False
+        self.logger.info("Steady state reached at %s, extrapolating %s hyperperiods", self.current_time, repetitions)
+        for pid, task in self.task_registry.items():
+            missed = statistics[pid][0] - previous[1][pid][0]
+            executed = statistics[pid][1] - previous[1][pid][1]
+            if missed:
+                self.update_statistics(task, Statistic.missed_deadlines, missed * repetitions)
+            if executed:
+                self.update_statistics(task, Statistic.executed_periods, executed * repetitions)
+            for metric, distribution in self.job_metrics[pid].items():
+                distribution.merge(distribution.difference(previous[1][pid][2][metric]), repetitions)
+        self.shift_time(repetitions * hyperperiod)
+        self.steady_state = None
+        return True
+
+    def shift_time(self, delta):
+        """
+        Moves the clock and every time-stamped piece of state forward.
+        
+        Parameters:
+        - delta (int): Time units to move forward.
+        """
+        self.current_time += delta
+        for task in self.tasks:
+            task.startedTime += delta
+        if self.task_table is not None:
+            self.task_table.started += delta
+        for job in self.jobs.values():
+            job[0] += delta
+        for executable in self.execution_queue:
+            executable[ExecutableItems.startTime.value] += delta
+            executable[ExecutableItems.deadline.value] += delta
+        self.execution_queue.rekey(itemgetter(self.queue_key.value))
+
+    def dispatch(self):
+        """
+        Walks the execution queue at the current time, checking deadlines and sending the first eligible task to the CPU.
+        """
+        executed = False
+        count_executables = len(self.execution_queue)
+        self.evaluateEmptyRun(-1, executed, count_executables)
+        # Without trace records, the entries after the dispatched one only matter if their deadline expired
+        vectorized = self.task_table is not None and not self.logger.traceEnabled()
+        queue = self.execution_queue.ordered() if vectorized else self.execution_queue
+        for index, task_pid in enumerate(queue):
+            if executed and vectorized:
+                self.expire_remaining(task_pid)
+                break
+            if not self.is_deadline_met(task_pid) and not executed:
+                task, task_finished, executed = self.send_task_to_cpu(task_pid)
+                if task_finished:
+                    self.logger.info("Task %s finished at %s", task.pid, self.current_time)
+                    self.removeExecutable(task.pid)
+                self.updateTask(task)
+                self.sync_task(task.pid)
+            else:
+                self.evaluateEmptyRun(index, executed, count_executables)
+
+    def expire_remaining(self, first):
+        """
+        Checks the deadlines of the queue entries from `first` on, once a task was dispatched.
+
+        The TaskTable gives the queued tasks whose deadline expired in one array
+        operation, and only their entries are checked, in queue order. The other
+        entries would not change the state, so they are not visited.
+        
+        Parameters:
+        - first (dict): First executable of the queue not visited by `dispatch`.
+        """
+        start = self.execution_queue.position(first)
+        expired = []
+        for row in self.task_table.expired(self.current_time):
+            for executable in self.execution_queue.entries(self.tasks[row].pid):
+                position = self.execution_queue.position(executable)
+                if position >= start:
+                    expired.append((position, executable))
+        expired.sort(key=itemgetter(0))
+        for _, executable in expired:
+            self.is_deadline_met(executable)
+
+    def next_release_time(self):
+        """
+        Gets the first time, from the current time on, at which a periodic task is released.
+        
+        Returns:
+        - int: Time of the next release, or `simulation_time` if there is none.
+        """
+        if self.task_table is not None:
+            return self.task_table.next_release(self.current_time, self.simulation_time)
+        return min((-(-self.current_time // task.period) * task.period for task in self.tasks), default=self.simulation_time)
+
+    def next_deadline_time(self):
+        """
+        Gets the first time at which a task in the execution queue misses its deadline.
+        
+        Returns:
+        - int: Time of the next deadline miss, or `simulation_time` if the queue is empty.
+        """
+        if self.task_table is not None:
+            return self.task_table.next_deadline(self.simulation_time)
+        deadlines = []
+        for executable in self.execution_queue:
+            task = self.getTask(executable)
+            deadlines.append(task.startedTime + task.deadline)
+        return min(deadlines, default=self.simulation_time)
+
+    def fast_forward(self):
+        """
+        Jumps `current_time` to the next scheduling event (release, completion, deadline or preemption).
+
+        The skipped ticks are quiet: the garbage collector has nothing to remove,
+        no task is released and no deadline expires, so the task that ran on the
+        last tick keeps the CPU (or the CPU stays idle) and preemptions cannot
+        happen. Their statistics and CPU history are applied in a single step.
+        """
+        if self.execution_queue.pending:
+            return
+        start = self.current_time
+        horizon = min(self.simulation_time, self.next_release_time(), self.next_deadline_time())
+        task = self.cpu.current_task
+        if self.execution_queue:
+            if not task:
+                return
+            pending_time = task.execution_time - task.runningTime
+            if pending_time > 0:
+                # The tick that completes the task is an event on its own
+                horizon = min(horizon, start + pending_time - 1)
+        ticks = horizon - start
+        if ticks <= 0:
+            return
+        if not self.execution_queue:
+            self.logger.trace("Empty run from %s to %s", start, horizon)
+            self.cpu.empty_run(start, ticks)
+        else:
+            self.logger.trace("Executing %s from %s to %s", task.pid, start, horizon)
+            self.update_statistics(task, Statistic.executed_periods, ticks)
+            self.cpu.run_task(task, start, ticks)
+        self.current_time = horizon
     
     def assign_priorities(self):
         """
-        Assigns priorities to tasks based on their order.
+        Assigns priorities to tasks based on their order and rebuilds the PID registry.
         """
+        self.task_registry = {}
         for index, task in enumerate(self.tasks):
             task.priority = index
+            self.task_registry.setdefault(task.pid, task)
 
     def get_statistics(self):
         """
-        Gets the statistics of the simulation.
+        Gets the statistics of every task, deriving the percentages from the counters.
         
         Returns:
-        - dict: Statistics dictionary.
+        - dict: Statistics dictionary by task PID.
+        """
+        return {pid: self.statistics_report(counters[Statistic.missed_deadlines.value], counters[Statistic.executed_periods.value])
+                for pid, counters in self.statistics.items()}
+
+    def get_general_statistics(self, elapsed=None):
         """
-        return self.statistics
+        Gets the statistics of the whole task set.
+        
+        Parameters:
+        - elapsed (int): Time the statistics cover (default is the simulation time; the current time for a run in progress).
+        
+        Returns:
+        - dict: Statistics of all the tasks together; non executed periods are counted over the elapsed time of every CPU.
+        """
+        return self.statistics_report(sum(counters[Statistic.missed_deadlines.value] for counters in self.statistics.values()),
+                                      sum(counters[Statistic.executed_periods.value] for counters in self.statistics.values()),
+                                      len(self.cpus), elapsed)
+
+    def get_job_metrics(self):
+        """
+        Gets the summaries of the job metrics (response time, lateness, start jitter and preemptions).
+        
+        Returns:
+        - dict: Summary of every metric by task PID, plus the merged metrics under GENERAL_STATISTICS.
+        """
+        general = {metric.value: Distribution() for metric in JobMetric}
+        result = {}
+        for pid, metrics in self.job_metrics.items():
+            result[pid] = {}
+            for metric, distribution in metrics.items():
+                general[metric].merge(distribution)
+                result[pid][metric] = distribution.summary()
+        result[GENERAL_STATISTICS] = {metric: distribution.summary() for metric, distribution in general.items()}
+        return result
     
+    def cpu_histories(self):
+        """
+        Gets the execution history of every CPU.
+        
+        Returns:
+        - list: ExecutionHistory of each CPU, in CPU order.
+        """
+        return [cpu.return_cpu_history() for cpu in self.cpus]
+
     def getTask(self, task_pid):
         """
         Retrieves a task based on its process ID.
@@ -202,23 +811,22 @@ class Scheduler:
         Returns:
         - Task: Task object corresponding to the process ID.
         """
-        for task in self.tasks:
-            if task.pid == task_pid[ExecutableItems.pid.value]:
-                return task
+        return self.task_registry.get(task_pid[ExecutableItems.pid.value])
 
     def garbageCollector(self):
         """
         Cleans up the execution queue by removing completed or expired tasks.
         """
-        new_execution_queue = self.execution_queue.copy()
-        for executable in self.execution_queue:
-            if executable[ExecutableItems.delete.value] == True:
-                self.logger.info(f"Removing {executable[ExecutableItems.pid.value]} from execution queue")
-                task = self.getTask(executable)
-                task.resetTask()
-                self.updateTask(task)
-                new_execution_queue.remove(executable)
-        self.execution_queue = new_execution_queue.copy()
+        for executable in self.execution_queue.collect():
+            self.logger.info("Removing %s from execution queue", executable[ExecutableItems.pid.value])
+            if self.observers:
+                self.emit(SchedulerEvent.queue_gc, self.current_time, executable[ExecutableItems.pid.value])
+            task = self.getTask(executable)
+            task.resetTask()
+            self.updateTask(task)
+            if self.task_table is not None:
+                self.task_table.queued[self.task_table.rows[task.pid]] -= 1
+                self.sync_task(task.pid)
 
     def remove_from_execution_queue(self, task_pid, isLogicDelete=False):
         """
@@ -228,12 +836,11 @@ class Scheduler:
         - task_pid (str): Process ID of the task to remove.
         - isLogicDelete (bool): Flag indicating if the task is logically deleted (default is False).
         """
-        for index, executable in enumerate(self.execution_queue):
-            if executable[ExecutableItems.pid.value] == task_pid:
-                if isLogicDelete:
-                    self.logger.info(f"Disable {executable[ExecutableItems.pid.value]} from execution queue")
-                    executable[ExecutableItems.delete.value] = True
-                    self.execution_queue[index] = executable
+        for executable in self.execution_queue.entries(task_pid):
+            if isLogicDelete:
+                self.logger.info("Disable %s from execution queue", executable[ExecutableItems.pid.value])
+                executable[ExecutableItems.delete.value] = True
+                self.execution_queue.flag(executable)
                 
 
     def removeExecutable(self, task_pid):
@@ -243,8 +850,7 @@ class Scheduler:
         Parameters:
         - task_pid (str): Process ID of the task to remove.
         """
-        id_list = [item[ExecutableItems.pid.value] for item in self.execution_queue]
-        if task_pid in id_list:
+        if task_pid in self.execution_queue:
             self.remove_from_execution_queue(task_pid, isLogicDelete=True)
 
     def is_deadline_met(self, task_pid):
@@ -259,12 +865,13 @@ class Scheduler:
         """
         task = self.getTask(task_pid)
         deadline_met = False
-        self.logger.info(f"task.startedTime {task.startedTime} task.deadline {task.deadline}")
+        self.logger.trace("task.startedTime %s task.deadline %s", task.startedTime, task.deadline)
         if self.current_time - task.startedTime >= task.deadline:
             deadline_met = True
             self.removeExecutable(task_pid[ExecutableItems.pid.value])
-            self.cpu.killProcess(task_pid[ExecutableItems.pid.value])
-            self.logger.warning(f"Deadline of task {task_pid[ExecutableItems.pid.value]} met at {self.current_time}")
+            for cpu in self.cpus:
+                cpu.killProcess(task_pid[ExecutableItems.pid.value])
+            self.logger.warning("Deadline of task %s met at %s", task_pid[ExecutableItems.pid.value], self.current_time)
             self.update_statistics(task, Statistic.missed_deadlines)
         return deadline_met
     
@@ -274,23 +881,23 @@ class Scheduler:
         
         Parameters:
         - task (Task): Task triggered periodically.
-        - key (ExecutableItems): Key to sort execution queue.
+        - key (ExecutableItems): Key used to order the task in the execution queue.
         """
         if self.current_time % task.period == 0:
-            id_list = [item[ExecutableItems.pid.value] for item in self.execution_queue]
-            if task.pid in id_list:
+            if task.pid in self.execution_queue:
                 self.removeExecutable(task.pid)
-                self.logger.warning(f"Reschedule of task {task.pid} met at {self.current_time}")
+                self.logger.warning("Reschedule of task %s met at %s", task.pid, self.current_time)
                 self.update_statistics(task, Statistic.missed_deadlines)
-            self.execution_queue.append({ExecutableItems.pid.value: task.pid, 
-                                         ExecutableItems.period.value: task.period, 
-                                         ExecutableItems.deadline.value: task.deadline + self.current_time, 
-                                         ExecutableItems.startTime.value: self.current_time,
-                                         ExecutableItems.delete.value: False})
+            executable = {ExecutableItems.pid.value: task.pid, 
+                          ExecutableItems.period.value: task.period, 
+                          ExecutableItems.deadline.value: task.deadline + self.current_time, 
+                          ExecutableItems.startTime.value: self.current_time,
+                          ExecutableItems.delete.value: False}
+            self.enqueue(executable, executable[key.value])
             task.startedTime = self.current_time
             self.updateTask(task)
-            self.logger.info(f"Task period met adding to execution queue {task.pid} at {self.current_time}")
-            self.execution_queue.sort(key=lambda task: task[key.value])
+            self.sync_task(task.pid)
+            self.logger.info("Task period met adding to execution queue %s at %s", task.pid, self.current_time)
 
         
     def send_task_to_cpu(self, task_pid):
@@ -308,33 +915,34 @@ class Scheduler:
         finished = False
         executed = False
         if not current_task and new_task:
-            self.logger.info(f"CPU empty executing {new_task.pid} at {self.current_time}")
-            self.update_statistics(new_task, Statistic.executed_periods)
-            new_task, finished = self.cpu.run_task(new_task, self.current_time)
+            self.logger.trace("CPU empty executing %s at %s", new_task.pid, self.current_time)
             executed = True
         elif self.preemp and new_task and current_task.pid != new_task.pid and current_task.priority > new_task.priority:
-            self.logger.warning(f"Swtiching tasks executing {new_task.pid}  at {self.current_time}")
-            self.update_statistics(new_task, Statistic.executed_periods)
-            new_task, finished = self.cpu.run_task(new_task, self.current_time)
+            self.logger.warning("Swtiching tasks executing %s  at %s", new_task.pid, self.current_time)
+            self.job_preempted(current_task)
             executed = True
         elif new_task.pid == current_task.pid:
-            self.logger.info(f"Executing {new_task.pid} again at {self.current_time}")
+            self.logger.trace("Executing %s again at %s", new_task.pid, self.current_time)
+            executed = True
+        if executed:
             self.update_statistics(new_task, Statistic.executed_periods)
+            self.job_dispatched(new_task)
             new_task, finished = self.cpu.run_task(new_task, self.current_time)
-            executed = True
+            if finished:
+                self.job_completed(new_task)
         return new_task, finished, executed
 
     
     def updateTask(self, modified_task):
         """
-        Updates a task in the task list.
+        Updates a task in the task registry.
+
+        Tasks are modified in place, so this only registers tasks whose PID is not known yet.
         
         Parameters:
-        - modified_task (Task): Modified task to update in the task list.
+        - modified_task (Task): Modified task to update in the task registry.
         """
-        for task in self.tasks:
-            if task.pid == modified_task.pid:
-                task = modified_task
+        self.task_registry.setdefault(modified_task.pid, modified_task)
     
     def evaluateEmptyRun(self, index, executed, count_executables):
         """
@@ -349,8 +957,8 @@ class Scheduler:
         - Tuple[Task, bool]: Tuple containing the task and finished flag.
         """
         if len(self.execution_queue) == 0:
-            self.logger.info(f"Empty run due to empty queue at {self.current_time}")
+            self.logger.trace("Empty run due to empty queue at %s", self.current_time)
             return self.cpu.empty_run(self.current_time)
         elif index != -1 and index == count_executables - 1 and not executed:
-            self.logger.info(f"Empty run due to last element at {self.current_time}")
+            self.logger.trace("Empty run due to last element at %s", self.current_time)
             return self.cpu.empty_run(self.current_time)
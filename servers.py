@@ -0,0 +1,260 @@
+import math
+from collections import deque
+from enum import Enum
+
+class ServerPolicy(Enum):
+    tbs = "TBS"  # Total Bandwidth Server (Spuri & Buttazzo)
+    cbs = "CBS"  # Constant Bandwidth Server (Abeni & Buttazzo)
+    sporadic = "SS"  # Sporadic Server with EDF deadlines (Spuri & Buttazzo dynamic sporadic server)
+
+class AperiodicServer:
+    """
+    Serves aperiodic jobs next to the periodic tasks of an EDF scheduler.
+
+    Jobs are served one at a time in arrival order. Only the head job is in
+    the execution queue, ordered by the deadline the server assigns it, so the
+    aperiodic load can take at most `budget` units of every `period` (the
+    server bandwidth) from the periodic tasks. Subclasses decide the deadline
+    of the head job and what happens when the budget runs out.
+
+    Attributes:
+    - budget (int): Execution budget per period (Q).
+    - period (int): Server period (T).
+    - bandwidth (float): Fraction of the CPU reserved for aperiodic jobs (Q / T).
+    - capacity (int): Budget left.
+    - deadline (int): Scheduling deadline of the head job.
+    - jobs (deque): Aperiodic jobs waiting or being served, head first.
+    """
+    policy = None
+
+    def __init__(self, budget, period):
+        """
+        Initializes the server with a full budget.
+
+        Parameters:
+        - budget (int): Execution budget per period.
+        - period (int): Server period.
+        """
+        if budget <= 0 or period <= 0 or budget > period:
+            raise ValueError(f"Invalid server budget {budget} for period {period}")
+        self.budget = budget
+        self.period = period
+        self.bandwidth = budget / period
+        self.capacity = budget
+        self.deadline = 0
+        self.jobs = deque()
+
+    def arrive(self, task, time):
+        """
+        Queues an aperiodic job.
+
+        Parameters:
+        - task (Task): Job that arrives.
+        - time (int): Current time.
+
+        Returns:
+        - bool: True if the job is the head, so it has to be sent to the execution queue.
+        """
+        self.jobs.append(task)
+        return len(self.jobs) == 1
+
+    def head(self):
+        """
+        Gets the job being served.
+
+        Returns:
+        - Task: Head job, or None if the server is idle.
+        """
+        return self.jobs[0] if self.jobs else None
+
+    def eligible(self, time):
+        """
+        Indicates if the head job may be in the execution queue.
+
+        Parameters:
+        - time (int): Current time.
+
+        Returns:
+        - bool: True unless the budget is exhausted and the policy suspends the server.
+        """
+        return True
+
+    def start(self, time):
+        """
+        Assigns the scheduling deadline of the head job when it enters the execution queue.
+
+        Parameters:
+        - time (int): Current time.
+
+        Returns:
+        - int: Scheduling deadline of the head job.
+        """
+        raise NotImplementedError("AperiodicServer subclass must implement the 'start' method")
+
+    def consume(self, time, ticks=1):
+        """
+        Charges the ticks the head job ran against the budget.
+
+        Parameters:
+        - time (int): First tick charged.
+        - ticks (int): Number of ticks (default is 1).
+
+        Returns:
+        - bool: True if the deadline changed or the budget ran out and the server is suspended.
+        """
+        return False
+
+    def finish(self, time):
+        """
+        Removes the head job, finished or expired.
+
+        Parameters:
+        - time (int): Current time.
+
+        Returns:
+        - Task: Job removed.
+        """
+        return self.jobs.popleft()
+
+    def replenish(self, time):
+        """
+        Restores the budget due at a time.
+
+        Parameters:
+        - time (int): Current time.
+        """
+
+    def expired(self, time, queued):
+        """
+        Removes the jobs waiting outside the execution queue whose own deadline passed.
+
+        Parameters:
+        - time (int): Current time.
+        - queued (bool): Indicates if the head job is in the execution queue, where the scheduler checks its deadline.
+
+        Returns:
+        - list: Jobs removed.
+        """
+        waiting = list(self.jobs)[1:] if queued else list(self.jobs)
+        expired = [task for task in waiting if time - task.startedTime >= task.deadline]
+        for task in expired:
+            self.jobs.remove(task)
+        return expired
+
+    def task(self):
+        """
+        Describes the server as a periodic task for the schedulability analysis.
+
+        Returns:
+        - tuple: (execution_time, period, deadline) of the reserved bandwidth.
+        """
+        return self.budget, self.period, self.period
+
+class TotalBandwidthServer(AperiodicServer):
+    """
+    Total Bandwidth Server: the head job gets the deadline
+    max(arrival, previous deadline) + ceil(C / bandwidth) and is never throttled;
+    the deadline alone keeps the aperiodic load within the bandwidth.
+    """
+    policy = ServerPolicy.tbs
+
+    def start(self, time):
+        task = self.head()
+        self.deadline = max(task.startedTime, self.deadline) + math.ceil(task.execution_time / self.bandwidth)
+        return self.deadline
+
+class ConstantBandwidthServer(AperiodicServer):
+    """
+    Constant Bandwidth Server: a job arriving at an idle server keeps the
+    current deadline only if the budget left fits in it at the server
+    bandwidth; otherwise the server gets a new deadline, arrival + T, and a full
+    budget. Whenever the budget runs out it is recharged and the deadline is
+    postponed by T, so an overrunning job only loses priority.
+    """
+    policy = ServerPolicy.cbs
+
+    def arrive(self, task, time):
+        if not self.jobs and self.capacity >= (self.deadline - time) * self.bandwidth:
+            self.deadline = time + self.period
+            self.capacity = self.budget
+        return super().arrive(task, time)
+
+    def start(self, time):
+        return self.deadline
+
+    def consume(self, time, ticks=1):
+        self.capacity -= ticks
+        if self.capacity > 0:
+            return False
+        self.capacity = self.budget
+        self.deadline += self.period
+        return True
+
+class SporadicServer(AperiodicServer):
+    """
+    Sporadic Server under EDF: when the server becomes active at time t with
+    budget left it gets the deadline t + T, and the budget it consumes from then
+    on is given back at t + T. With the budget exhausted the head job leaves
+    the execution queue until the next replenishment.
+
+    Attributes:
+    - active (bool): Indicates if the server has an open replenishment.
+    - replenishments (deque): [time, amount] replenishments, in time order.
+    """
+    policy = ServerPolicy.sporadic
+
+    def __init__(self, budget, period):
+        super().__init__(budget, period)
+        self.active = False
+        self.replenishments = deque()
+
+    def eligible(self, time):
+        return self.capacity > 0
+
+    def start(self, time):
+        if not self.active:
+            self.active = True
+            self.deadline = time + self.period
+            self.replenishments.append([self.deadline, 0])
+        return self.deadline
+
+    def consume(self, time, ticks=1):
+        renewed = not self.replenishments or self.replenishments[-1][0] <= time
+        if renewed:
+            # The open replenishment came due while the job ran, the budget consumed from now on opens a new one
+            self.deadline = time + self.period
+            self.replenishments.append([self.deadline, 0])
+        self.capacity -= ticks
+        self.replenishments[-1][1] += ticks
+        if self.capacity > 0:
+            return renewed
+        self.active = False
+        return True
+
+    def finish(self, time):
+        task = super().finish(time)
+        if not self.jobs:
+            self.active = False
+        return task
+
+    def replenish(self, time):
+        while self.replenishments and self.replenishments[0][0] <= time:
+            self.capacity += self.replenishments.popleft()[1]
+
+SERVERS = {server.policy.value: server for server in (TotalBandwidthServer, ConstantBandwidthServer, SporadicServer)}
+
+def create_server(policy, budget, period):
+    """
+    Creates an aperiodic server.
+
+    Parameters:
+    - policy (str): 'TBS', 'CBS' or 'SS'.
+    - budget (int): Execution budget per period.
+    - period (int): Server period.
+
+    Returns:
+    - AperiodicServer: Server of the policy.
+    """
+    if policy not in SERVERS:
+        raise ValueError(f"Unknown aperiodic server: {policy}")
+    return SERVERS[policy](budget, period)
@@ -0,0 +1,74 @@
+from rms import RateMonotonicScheduler
+from edf import EarliestDeadlineFirstScheduler
+from multiprocessor import GlobalScheduler, PartitionedScheduler
+from scheduler import ExecutableItems
+from task_loader import iter_tasks
+from cpu import CPU
+
+ALGORITHMS = ['RMS', 'EDF', 'EDFA']
+
+def create_scheduler(algorithm, simulation_time, cpu, randomGenerator=False, cpus=1, partitioning=None, server=None, **options):
+    """
+    Creates the scheduler of an algorithm.
+
+    With more than one CPU, RMS and EDF are scheduled globally (global fixed
+    priority or global EDF) unless a partitioning heuristic is given.
+
+    Parameters:
+    - algorithm (str): Scheduling algorithm ('RMS', 'EDF' or 'EDFA').
+    - simulation_time (int): Total simulation time.
+    - cpu (CPU): CPU object; with several CPUs, the first one.
+    - randomGenerator (bool): Indicates if EDFA tasks get random start times (default is False).
+    - cpus (int): Number of identical CPUs (default is 1).
+    - partitioning (str): 'first-fit', 'best-fit' or 'worst-fit' to partition the tasks instead of scheduling them globally (default is None).
+    - server (AperiodicServer): Server of the aperiodic jobs added next to the periodic tasks, EDF only (default is None).
+    - options: Other Scheduler flags (eventDriven, extrapolate, seed).
+
+    Returns:
+    - Scheduler: Scheduler of the algorithm.
+    """
+    if server is not None and (algorithm != 'EDF' or cpus > 1):
+        raise ValueError("Aperiodic servers need the EDF algorithm on a single CPU")
+    if cpus > 1:
+        if algorithm not in ('RMS', 'EDF'):
+            raise ValueError(f"{algorithm} is not supported on multiple CPUs")
+        if partitioning:
+            return PartitionedScheduler(simulation_time, algorithm, cpu, cpus, partitioning, **options)
+        policy = ExecutableItems.period if algorithm == 'RMS' else ExecutableItems.deadline
+        return GlobalScheduler(simulation_time, algorithm, [cpu] + [CPU(f"Processor-{core}", cleanLogs=False) for core in range(1, cpus)], policy, **options)
+    if algorithm == 'RMS':
+        return RateMonotonicScheduler(simulation_time, algorithm, cpu=cpu, **options)
+    if algorithm == 'EDF':
+        return EarliestDeadlineFirstScheduler(simulation_time, algorithm, cpu=cpu, server=server, **options)
+    if algorithm == 'EDFA':
+        return EarliestDeadlineFirstScheduler(simulation_time, algorithm, cpu=cpu, aperiodic=True, randomGenerator=randomGenerator, **options)
+    raise ValueError(f"Unknown scheduling algorithm: {algorithm}")
+
+def run_simulation(input, algorithm, simulation_time, randomGenerator=False, cache=True, aperiodic_input=None, result_cache=None, **options):
+    """
+    Reads a task file and simulates it on a new CPU.
+
+    Parameters:
+    - input (str): Input file with tasks.
+    - algorithm (str): Scheduling algorithm ('RMS', 'EDF' or 'EDFA').
+    - simulation_time (int): Total simulation time.
+    - randomGenerator (bool): Indicates if EDFA tasks get random start times (default is False).
+    - cache (bool): Indicates if the parsed task file is cached next to it (default is True).
+    - aperiodic_input (str): File with aperiodic jobs (arrival time in the period column) served by the `server` option (default is None).
+    - result_cache (ResultCache): Cache the result is restored from or stored in (default is None, always simulate).
+    - options: Other scheduler options (cpus, partitioning, server, eventDriven, extrapolate, seed).
+
+    Returns:
+    - Scheduler: Scheduler after the run, with its statistics.
+    """
+    scheduler = create_scheduler(algorithm, simulation_time, CPU("Processor"), randomGenerator=randomGenerator, **options)
+    for task in iter_tasks(input, aperiodic=algorithm == 'EDFA', cache=cache):
+        scheduler.add_task(task)
+    if aperiodic_input:
+        for task in iter_tasks(aperiodic_input, cache=cache, arrivals=True):
+            scheduler.add_aperiodic_task(task)
+    if result_cache is not None:
+        result_cache.run(scheduler, options.get("seed"))
+    else:
+        scheduler.run()
+    return scheduler
@@ -0,0 +1,171 @@
+import itertools
+import queue
+import threading
+from enum import Enum
+from timeline import timeline_rows
+from profiler import PhaseProfiler, format_profile
+
+PROGRESS_STEPS = 100  # Progress reports per simulation
+PROGRESS_PIXELS = 600  # Horizontal resolution of the streamed timeline segments
+
+class WorkerEvent(Enum):
+    queued = "Queued"  # The simulation waits for the previous ones
+    started = "Started"  # The simulation started running
+    progress = "Progress"  # Partial statistics and timeline segments
+    profiled = "Profiled"  # Timing breakdown of a profiled simulation, sent before it finishes
+    finished = "Finished"  # The simulation ended; the payload is the scheduler
+    cancelled = "Cancelled"  # The simulation was cancelled before or while running
+    failed = "Failed"  # The simulation raised an exception; the payload is the message
+
+class SimulationCancelled(Exception):
+    """
+    Raised from the progress callback to stop a simulation that was cancelled.
+    """
+
+class SimulationWorker:
+    """
+    Runs simulations one after another in a background thread.
+
+    Simulations are queued with `submit` and run in submission order. The
+    worker never touches the user interface: it puts (event, job, payload)
+    tuples in a thread-safe queue that the interface drains with `poll`, for
+    example from a `root.after` callback. While a simulation runs it reports
+    its progress, partial statistics and the timeline segments recorded since
+    the previous report, decimated to PROGRESS_PIXELS over the whole run.
+    Cancelling a running simulation stops it at its next progress report.
+    With a result cache, a simulation identical to an earlier one finishes
+    right away with the cached result and reports no progress.
+
+    Attributes:
+    - jobs (Queue): Simulations waiting to run, as (job, scheduler, profile, seed) tuples.
+    - events (Queue): Events for the interface, as (WorkerEvent, job, payload) tuples.
+    - current (int): Job running, or None.
+    - cancelled (set): Jobs cancelled before or while running.
+    - cache (ResultCache): Cache of the simulation results, or None.
+    """
+    def __init__(self, cache=None):
+        """
+        Initializes the worker and starts its thread.
+
+        Parameters:
+        - cache (ResultCache): Cache the results are restored from and stored in (default is None, always simulate).
+        """
+        self.cache = cache
+        self.jobs = queue.Queue()
+        self.events = queue.Queue()
+        self.counter = itertools.count(1)
+        self.current = None
+        self.cancelled = set()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.work, name="simulation-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, scheduler, profile=False, seed=None):
+        """
+        Queues a simulation.
+
+        Parameters:
+        - scheduler (Scheduler): Scheduler with its tasks added, run with `run()`.
+        - profile (bool): Time the phases of the scheduling loop and report the breakdown; profiled runs skip the cache (default is False).
+        - seed (int): Seed of the random start times, part of the cache key (default is None).
+
+        Returns:
+        - int: Identifier of the job.
+        """
+        job = next(self.counter)
+        self.events.put((WorkerEvent.queued, job, scheduler.name))
+        self.jobs.put((job, scheduler, profile, seed))
+        return job
+
+    def cancel(self, job=None):
+        """
+        Cancels a queued or running simulation.
+
+        Parameters:
+        - job (int): Identifier of the job (default is the running one).
+        """
+        with self.lock:
+            job = self.current if job is None else job
+            if job is not None:
+                self.cancelled.add(job)
+
+    def pending(self):
+        """
+        Gets the number of simulations waiting to run.
+
+        Returns:
+        - int: Queued jobs, not counting the running one.
+        """
+        return self.jobs.qsize()
+
+    def poll(self):
+        """
+        Takes the events produced since the last call, without blocking.
+
+        Returns:
+        - list: (WorkerEvent, job, payload) tuples, in the order they were produced.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def work(self):
+        """
+        Runs the queued simulations until the process ends.
+        """
+        while True:
+            job, scheduler, profile, seed = self.jobs.get()
+            with self.lock:
+                if job in self.cancelled:
+                    self.cancelled.discard(job)
+                    self.events.put((WorkerEvent.cancelled, job, None))
+                    continue
+                self.current = job
+            self.events.put((WorkerEvent.started, job, scheduler.simulation_time))
+            reported = [0]
+            scheduler.set_progress(lambda scheduler: self.report(job, scheduler, reported), scheduler.simulation_time // PROGRESS_STEPS)
+            try:
+                if profile:
+                    profiler = PhaseProfiler(scheduler)
+                    report = profiler.run()
+                    self.events.put((WorkerEvent.profiled, job, format_profile(report, profiler.elapsed, profiler.ticks)))
+                elif self.cache is not None:
+                    self.cache.run(scheduler, seed)
+                else:
+                    scheduler.run()
+                self.events.put((WorkerEvent.finished, job, scheduler))
+            except SimulationCancelled:
+                self.events.put((WorkerEvent.cancelled, job, None))
+            except Exception as error:
+                self.events.put((WorkerEvent.failed, job, str(error)))
+            finally:
+                scheduler.set_progress(None, 0)
+                with self.lock:
+                    self.current = None
+                    self.cancelled.discard(job)
+
+    def report(self, job, scheduler, reported):
+        """
+        Sends the progress of a running simulation, or stops it if it was cancelled.
+
+        Parameters:
+        - job (int): Identifier of the job.
+        - scheduler (Scheduler): Scheduler running.
+        - reported (list): Time reached by the previous report, updated in place.
+        """
+        if job in self.cancelled:
+            raise SimulationCancelled(job)
+        time = scheduler.current_time
+        pixels = PROGRESS_PIXELS * (time - reported[0]) // max(scheduler.simulation_time, 1)
+        segments = timeline_rows(scheduler.cpu_histories(), reported[0], time, pixels)
+        self.events.put((WorkerEvent.progress, job, {
+            "time": time,
+            "total": scheduler.simulation_time,
+            # Partial statistics cover the time simulated so far, not the whole run
+            "statistics": scheduler.get_general_statistics(time),
+            "segments": {pid: list(zip(starts.tolist(), widths.tolist())) for pid, (starts, widths) in segments.items()},
+        }))
+        reported[0] = time
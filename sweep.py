@@ -0,0 +1,352 @@
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from statistics import NormalDist
+from simulation import ALGORITHMS, create_scheduler
+from task_generator import PERIOD_DISTRIBUTIONS, generate_task_set
+from scheduler import Statistic
+from metrics import JobMetric
+from task import Task
+from cpu import CPU
+from logger import Logger
+
+RESULTS_FILE = "sets.jsonl"  # One line per simulated task set, appended as soon as it finishes
+CURVES_FILE = "curves.csv"  # One row per sweep point
+PARAMETERS_FILE = "sweep.json"  # Parameters every result row depends on, checked before resuming
+# EDFA tasks are one-shot jobs, so a generated task set gives one job per task whatever its utilization
+SWEEP_ALGORITHMS = [algorithm for algorithm in ALGORITHMS if algorithm != 'EDFA']
+CURVE_FIELDS = ["utilization", "tasks", "periods", "algorithm", "sets", "miss_ratio", "miss_ratio_ci",
+                "schedulability_ratio", "schedulability_ratio_ci", "converged"]
+
+def parse_periods(spec):
+    """
+    Parses a period distribution given as DISTRIBUTION:MIN:MAX.
+
+    Parameters:
+    - spec (str): For example 'log-uniform:10:1000'.
+
+    Returns:
+    - Tuple[str, int, int]: Distribution, smallest and largest period.
+    """
+    distribution, minimum, maximum = spec.split(":")
+    if distribution not in PERIOD_DISTRIBUTIONS:
+        raise ValueError(f"Unknown period distribution {distribution}, use one of {', '.join(PERIOD_DISTRIBUTIONS)}")
+    return distribution, int(minimum), int(maximum)
+
+def utilization_range(start, stop, step):
+    """
+    Lists the utilizations of a sweep, both ends included.
+
+    Parameters:
+    - start (float): First utilization.
+    - stop (float): Last utilization.
+    - step (float): Increment.
+
+    Returns:
+    - list: Utilizations rounded to 6 decimals.
+    """
+    return [round(start + index * step, 6) for index in range(int(round((stop - start) / step)) + 1)]
+
+def point_key(point):
+    """
+    Identifies a sweep point in the results file.
+
+    Parameters:
+    - point (dict): Utilization, tasks, periods and algorithm.
+
+    Returns:
+    - tuple: Hashable key of the point.
+    """
+    return point["utilization"], point["tasks"], point["periods"], point["algorithm"]
+
+def set_seed(seed, point, index):
+    """
+    Derives the seed of one task set. Every algorithm of a point gets the same task sets, so the curves are paired.
+
+    Parameters:
+    - seed (int): Seed of the sweep.
+    - point (dict): Sweep point.
+    - index (int): Number of the task set in the point.
+
+    Returns:
+    - int: 64-bit seed.
+    """
+    text = f"{seed}:{point['utilization']}:{point['tasks']}:{point['periods']}:{index}"
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+def simulate_set(point, index, seed, simulation_time, options, logs_path):
+    """
+    Generates one task set and simulates it. Runs in a worker process.
+
+    The miss ratio is the share of finished jobs (completed or missed) that
+    missed their deadline; the set is schedulable if no deadline was missed.
+
+    Parameters:
+    - point (dict): Sweep point.
+    - index (int): Number of the task set in the point.
+    - seed (int): Seed of the task set.
+    - simulation_time (int): Simulation time of every run.
+    - options (dict): Scheduler flags (eventDriven, extrapolate).
+    - logs_path (str): Base directory of the logs; every worker process gets its own.
+
+    Returns:
+    - dict: Result row of the task set.
+    """
+    start = time.perf_counter()
+    # Minimal logging, in a directory of this process so concurrent runs never share a file
+    Logger.configure(level='ERROR', trace=False, logs_path=os.path.join(logs_path, str(os.getpid()), ""))
+    distribution, minimum, maximum = parse_periods(point["periods"])
+    rows = generate_task_set(point["tasks"], point["utilization"], minimum, maximum, seed=seed, distribution=distribution)
+    scheduler = create_scheduler(point["algorithm"], simulation_time, CPU("Processor"), **options)
+    for pid, period, execution_time, deadline in rows:
+        scheduler.add_task(Task(pid=pid, period=period, execution_time=execution_time, deadline=deadline))
+    scheduler.run()
+    Logger.shutdown()
+    missed = sum(counters[Statistic.missed_deadlines.value] for counters in scheduler.statistics.values())
+    executed = sum(counters[Statistic.executed_periods.value] for counters in scheduler.statistics.values())
+    completed = sum(metrics[JobMetric.response_time.value].count for metrics in scheduler.job_metrics.values())
+    jobs = missed + completed
+    return dict(point, set=index, seed=seed, missed=missed, executed=executed, jobs=jobs,
+                miss_ratio=missed / jobs if jobs else 0.0, schedulable=missed == 0,
+                elapsed=round(time.perf_counter() - start, 6))
+
+def confidence_interval(values, confidence):
+    """
+    Computes the mean of samples and the half-width of its normal confidence interval.
+
+    Parameters:
+    - values (list): Samples.
+    - confidence (float): Confidence level, for example 0.95.
+
+    Returns:
+    - Tuple[float, float]: Mean and half-width (infinite with fewer than two samples).
+    """
+    n = len(values)
+    if n == 0:
+        return 0.0, math.inf
+    mean = sum(values) / n
+    if n < 2:
+        return mean, math.inf
+    variance = sum((value - mean) ** 2 for value in values) / (n - 1)
+    return mean, NormalDist().inv_cdf((1 + confidence) / 2) * math.sqrt(variance / n)
+
+def summarize(point, rows, confidence, ci_width, min_sets):
+    """
+    Builds the curve row of a sweep point and decides if it needs more task sets.
+
+    Parameters:
+    - point (dict): Sweep point.
+    - rows (list): Result rows of its task sets.
+    - confidence (float): Confidence level of the intervals.
+    - ci_width (float): Half-width of the miss ratio interval at which the point stops.
+    - min_sets (int): Task sets simulated before the interval is checked.
+
+    Returns:
+    - dict: Curve row; `converged` tells if the interval is tight enough.
+    """
+    miss_ratio, miss_ci = confidence_interval([row["miss_ratio"] for row in rows], confidence)
+    schedulable, schedulable_ci = confidence_interval([float(row["schedulable"]) for row in rows], confidence)
+    converged = len(rows) >= min_sets and miss_ci <= ci_width
+    return dict(point, sets=len(rows), miss_ratio=round(miss_ratio, 6), miss_ratio_ci=round(miss_ci, 6),
+                schedulability_ratio=round(schedulable, 6), schedulability_ratio_ci=round(schedulable_ci, 6),
+                converged=converged)
+
+def check_parameters(directory, parameters):
+    """
+    Records the parameters of a sweep in its results directory, or checks them against the recorded ones before resuming.
+
+    A ValueError is raised if the directory holds results of a sweep with other
+    parameters, or results without parameters.
+
+    Parameters:
+    - directory (str): Results directory.
+    - parameters (dict): Simulation time, seed and scheduler flags of the sweep.
+    """
+    filename = os.path.join(directory, PARAMETERS_FILE)
+    if os.path.exists(filename):
+        with open(filename, 'r') as file:
+            recorded = json.load(file)
+        if recorded != parameters:
+            changed = ", ".join(f"{name} {recorded.get(name)} -> {parameters.get(name)}" for name in sorted(set(recorded) | set(parameters))
+                                if recorded.get(name) != parameters.get(name))
+            raise ValueError(f"{directory} holds a sweep with other parameters ({changed}), use another directory")
+        return
+    results_path = os.path.join(directory, RESULTS_FILE)
+    if os.path.exists(results_path) and os.path.getsize(results_path):
+        raise ValueError(f"{directory} holds results without their parameters, use another directory")
+    with open(filename, 'w') as file:
+        json.dump(parameters, file)
+
+def read_results(filename):
+    """
+    Reads the task sets already simulated by an interrupted sweep. A line cut by the interruption is ignored.
+
+    Parameters:
+    - filename (str): Results file.
+
+    Returns:
+    - dict: Result rows by point key and task set number.
+    """
+    results = {}
+    if not os.path.exists(filename):
+        return results
+    with open(filename, 'r') as file:
+        for line in file:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            results.setdefault(point_key(row), {})[row["set"]] = row
+    return results
+
+def write_curves(filename, curves):
+    """
+    Writes the curve rows of every point.
+
+    Parameters:
+    - filename (str): CSV file.
+    - curves (list): Curve rows, in sweep order.
+    """
+    with open(filename, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CURVE_FIELDS)
+        writer.writeheader()
+        writer.writerows({field: curve[field] for field in CURVE_FIELDS} for curve in curves)
+
+def run_sweep(points, directory, simulation_time, seed=0, workers=None, batch=8, min_sets=10, max_sets=200,
+              confidence=0.95, ci_width=0.01, **options):
+    """
+    Simulates generated task sets at every sweep point until its miss ratio interval is tight enough.
+
+    Points are simulated in parallel, `batch` task sets at a time. Every
+    finished task set is appended to the results file at once, so an
+    interrupted sweep resumes from the sets already in it; the curves are
+    rewritten whenever a point stops. The simulation time, seed and scheduler
+    flags are recorded in the directory, and a sweep with other ones is not
+    resumed from it (ValueError), nor are points of EDFA, whose tasks are
+    one-shot jobs.
+
+    Parameters:
+    - points (list): Sweep points (utilization, tasks, periods, algorithm).
+    - directory (str): Results directory.
+    - simulation_time (int): Simulation time of every run.
+    - seed (int): Seed of the sweep (default is 0).
+    - workers (int): Number of worker processes (default is the number of CPUs).
+    - batch (int): Task sets submitted at a time for each point (default is 8).
+    - min_sets (int): Task sets simulated before the interval is checked (default is 10).
+    - max_sets (int): Task sets after which a point stops anyway (default is 200).
+    - confidence (float): Confidence level of the intervals (default is 0.95).
+    - ci_width (float): Half-width of the miss ratio interval at which a point stops (default is 0.01).
+    - options: Scheduler flags (eventDriven, extrapolate).
+
+    Returns:
+    - list: Curve rows, in sweep order.
+    """
+    for point in points:
+        if point["algorithm"] not in SWEEP_ALGORITHMS:
+            raise ValueError(f"Cannot sweep {point['algorithm']}, use one of {', '.join(SWEEP_ALGORITHMS)}")
+    os.makedirs(directory, exist_ok=True)
+    check_parameters(directory, dict(options, simulation_time=simulation_time, seed=seed))
+    results_path = os.path.join(directory, RESULTS_FILE)
+    results = read_results(results_path)
+    logs_path = os.path.join(directory, "logs")
+    curves = {}
+    next_set = {}
+    running = {}
+    if os.path.exists(results_path) and os.path.getsize(results_path):
+        with open(results_path, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            cut = file.read(1) != b"\n"
+        if cut:
+            # The interruption cut the last line; the next row starts on its own line
+            with open(results_path, 'a') as file:
+                file.write("\n")
+    with open(results_path, 'a') as output, ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit(point):
+            # The next batch skips the task sets finished before an interruption
+            key = point_key(point)
+            done = results[key]
+            while running[key] < batch and next_set[key] < max_sets:
+                index = next_set[key]
+                next_set[key] += 1
+                if index in done:
+                    continue
+                running[key] += 1
+                futures[executor.submit(simulate_set, point, index, set_seed(seed, point, index), simulation_time, options, logs_path)] = point
+
+        def advance(point):
+            # Stops a point once its interval is tight enough or every set ran, otherwise submits more sets
+            key = point_key(point)
+            rows = [results[key][index] for index in sorted(results[key])]
+            curve = summarize(point, rows, confidence, ci_width, min_sets)
+            if curve["converged"] or next_set[key] >= max_sets:
+                if not running[key]:
+                    curves[key] = curve
+                    print(f"{key}: {curve['sets']} sets, miss ratio {curve['miss_ratio']} ± {curve['miss_ratio_ci']}, "
+                          f"schedulability {curve['schedulability_ratio']} ± {curve['schedulability_ratio_ci']}")
+                    write_curves(os.path.join(directory, CURVES_FILE), [curves[point_key(p)] for p in points if point_key(p) in curves])
+                return
+            submit(point)
+
+        futures = {}
+        for point in points:
+            key = point_key(point)
+            results.setdefault(key, {})
+            running[key] = 0
+            next_set[key] = 0
+            advance(point)
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                point = futures.pop(future)
+                key = point_key(point)
+                row = future.result()
+                running[key] -= 1
+                results[key][row["set"]] = row
+                output.write(json.dumps(row) + "\n")
+                output.flush()
+                advance(point)
+    return [curves[point_key(point)] for point in points]
+
+def main():
+    parser = argparse.ArgumentParser(description='Real-Time Scheduling Simulator - parameter sweep')
+    parser.add_argument('-u', '--utilization', type=float, nargs=3, metavar=('START', 'STOP', 'STEP'), required=True, help='Total utilizations to sweep, both ends included')
+    parser.add_argument('-n', '--tasks', type=int, nargs='+', required=True, help='Task counts to sweep')
+    parser.add_argument('-p', '--periods', type=str, nargs='+', default=['log-uniform:10:1000'], help=f"Period distributions as DISTRIBUTION:MIN:MAX ({', '.join(PERIOD_DISTRIBUTIONS)})")
+    parser.add_argument('-a', '--algorithms', type=str, nargs='+', choices=SWEEP_ALGORITHMS, default=['RMS', 'EDF'], help='Scheduling algorithms to sweep (EDFA tasks are one-shot jobs, so it is not swept)')
+    parser.add_argument('-t', '--time', type=int, required=True, help='Simulation time of every run')
+    parser.add_argument('-d', '--directory', type=str, default='results/sweep', help='Results directory; an existing sweep in it is resumed')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Seed of the task sets')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Number of worker processes (default is the number of CPUs)')
+    parser.add_argument('--batch', type=int, default=8, help='Task sets submitted at a time for each point')
+    parser.add_argument('--min-sets', type=int, default=10, help='Task sets simulated before checking the confidence interval')
+    parser.add_argument('--max-sets', type=int, default=200, help='Task sets after which a point stops anyway')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence level of the intervals')
+    parser.add_argument('--ci-width', type=float, default=0.01, help='Half-width of the miss ratio interval at which a point stops')
+    parser.add_argument('-e', '--event-driven', action='store_true', help='Jump time between scheduling events instead of stepping every tick')
+    parser.add_argument('--hyperperiod', action='store_true', help='Simulate periodic runs until the schedule repeats and extrapolate the statistics')
+    args = parser.parse_args()
+    for spec in args.periods:
+        try:
+            parse_periods(spec)
+        except ValueError as error:
+            parser.error(str(error))
+
+    points = [{"utilization": utilization, "tasks": tasks, "periods": periods, "algorithm": algorithm}
+              for periods in args.periods for tasks in args.tasks
+              for utilization in utilization_range(*args.utilization) for algorithm in args.algorithms]
+    try:
+        run_sweep(points, args.directory, args.time, seed=args.seed, workers=args.workers, batch=args.batch,
+                  min_sets=args.min_sets, max_sets=args.max_sets, confidence=args.confidence, ci_width=args.ci_width,
+                  eventDriven=args.event_driven, extrapolate=args.hyperperiod)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"Curves: {os.path.join(args.directory, CURVES_FILE)}")
+
+if __name__ == '__main__':
+    main()
@@ -24,16 +24,29 @@ class Task:
         self.aperiodic = aperiodic
         self.priority = 0
         self.logPath = TASK_LOGGER + "-" + pid
-        self.logger = Logger(self.logPath) 
-        self.logger.info(f"Task Created")
-        self.reportCreation()
+        self.taskLogger = None
+
+    @property
+    def logger(self):
+        """
+        Logger of the task, created on first use together with the creation records,
+        so loading large task sets does not set up one logger per task.
+
+        Returns:
+        - Logger: Logger writing to the shared run log.
+        """
+        if self.taskLogger is None:
+            self.taskLogger = Logger(self.logPath, pid=self.pid)
+            self.taskLogger.info("Task Created")
+            self.reportCreation()
+        return self.taskLogger
 
     def reportCreation(self):
         """
         Reports the creation details of the task.
         """
-        self.logger.info(f"Task {self.pid} created")
-        self.logger.info(f"\nPeriod {self.period}\nExecution Time {self.execution_time}\nDeadline {self.deadline}\nAperiodic {self.aperiodic}\nStarted Time {self.startedTime} ")
+        self.logger.info("Task %s created", self.pid)
+        self.logger.info("\nPeriod %s\nExecution Time %s\nDeadline %s\nAperiodic %s\nStarted Time %s ", self.period, self.execution_time, self.deadline, self.aperiodic, self.startedTime)
 
     def updatedStartedTime(self, startedTime):
         """
@@ -43,7 +56,7 @@ class Task:
         - startedTime (int): New started time of the task.
         """
         self.startedTime = startedTime
-        self.logger.info(f"New StartedTime {self.startedTime}")
+        self.logger.info("New StartedTime %s", self.startedTime)
 
     def resetTask(self):
         """
@@ -53,12 +66,13 @@ class Task:
         self.startedTime = 0
         self.started = False
 
-    def run(self, currentTime):
+    def run(self, currentTime, ticks=1):
         """
         Simulates the execution of the task.
         
         Parameters:
         - currentTime (int): Current simulation time.
+        - ticks (int): Number of consecutive time units the task runs (default is 1).
         
         Returns:
         - bool: True if the task finishes execution, False otherwise.
@@ -66,14 +80,15 @@ class Task:
         finish = False
         if not self.started:
             self.started = True
-        self.runningTime += 1
+        self.runningTime += ticks
         self.pendingTime = self.execution_time - self.runningTime
-        self.logger.info({"Task": self.pid,
-               "Finished": self.pendingTime == 0, 
-               "Running Time": self.runningTime, 
-               "Pending Time": self.pendingTime, 
-               "Current Deadline": self.startedTime + self.deadline,
-               "Current Time": currentTime})
+        if Logger.tracing and self.logger.traceEnabled():
+            self.logger.trace({"Task": self.pid,
+                   "Finished": self.pendingTime == 0, 
+                   "Running Time": self.runningTime, 
+                   "Pending Time": self.pendingTime, 
+                   "Current Deadline": self.startedTime + self.deadline,
+                   "Current Time": currentTime + ticks - 1})
         if(self.pendingTime == 0):
             self.runningTime = 0
             finish = True 
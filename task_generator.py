@@ -0,0 +1,134 @@
+import argparse
+import math
+import random
+from file_manager import write_tasks_to_file
+
+def uunifast(n, utilization, rng=random):
+    """
+    Draws n task utilizations summing to a total, uniformly distributed (Bini & Buttazzo).
+
+    Parameters:
+    - n (int): Number of tasks.
+    - utilization (float): Total utilization.
+    - rng (random.Random): Random generator (default is the random module).
+
+    Returns:
+    - list: Utilization of every task.
+    """
+    utilizations = []
+    remaining = utilization
+    for index in range(1, n):
+        next_remaining = remaining * rng.random() ** (1 / (n - index))
+        utilizations.append(remaining - next_remaining)
+        remaining = next_remaining
+    utilizations.append(remaining)
+    return utilizations
+
+def uunifast_discard(n, utilization, rng=random, limit=1.0, attempts=1000):
+    """
+    UUniFast that discards the draws where some task exceeds a utilization limit,
+    so total utilizations above 1 can be split into feasible tasks.
+
+    Parameters:
+    - n (int): Number of tasks.
+    - utilization (float): Total utilization.
+    - rng (random.Random): Random generator (default is the random module).
+    - limit (float): Maximum utilization of one task (default is 1).
+    - attempts (int): Draws tried before giving up (default is 1000).
+
+    Returns:
+    - list: Utilization of every task.
+    """
+    if utilization > n * limit:
+        raise ValueError(f"Total utilization {utilization} cannot be split into {n} tasks of at most {limit}")
+    for _ in range(attempts):
+        utilizations = uunifast(n, utilization, rng)
+        if max(utilizations) <= limit:
+            return utilizations
+    raise ValueError(f"No UUniFast draw of {n} tasks with utilization {utilization} under {limit} after {attempts} attempts")
+
+def log_uniform_periods(n, minimum, maximum, rng=random, granularity=1):
+    """
+    Draws periods whose logarithm is uniform between two bounds, rounded to a granularity.
+
+    Parameters:
+    - n (int): Number of tasks.
+    - minimum (int): Smallest period.
+    - maximum (int): Largest period.
+    - rng (random.Random): Random generator (default is the random module).
+    - granularity (int): Periods are multiples of this value (default is 1).
+
+    Returns:
+    - list: Period of every task.
+    """
+    low, high = math.log(minimum), math.log(maximum + granularity)
+    return [max(granularity, int(math.exp(rng.uniform(low, high)) // granularity * granularity)) for _ in range(n)]
+
+def uniform_periods(n, minimum, maximum, rng=random, granularity=1):
+    """
+    Draws periods uniformly between two bounds, rounded to a granularity.
+
+    Parameters:
+    - n (int): Number of tasks.
+    - minimum (int): Smallest period.
+    - maximum (int): Largest period.
+    - rng (random.Random): Random generator (default is the random module).
+    - granularity (int): Periods are multiples of this value (default is 1).
+
+    Returns:
+    - list: Period of every task.
+    """
+    return [max(granularity, int(rng.uniform(minimum, maximum + granularity) // granularity * granularity)) for _ in range(n)]
+
+PERIOD_DISTRIBUTIONS = {"log-uniform": log_uniform_periods, "uniform": uniform_periods}
+
+def generate_task_set(n, utilization, minimum_period=10, maximum_period=1000, granularity=1, deadline_ratio=1.0, discard=True, seed=None, distribution="log-uniform"):
+    """
+    Generates a synthetic task set.
+
+    Execution times are the drawn utilization times the period, rounded and at
+    least 1, so the real total utilization is close to the requested one.
+
+    Parameters:
+    - n (int): Number of tasks.
+    - utilization (float): Total utilization.
+    - minimum_period (int): Smallest period (default is 10).
+    - maximum_period (int): Largest period (default is 1000).
+    - granularity (int): Periods are multiples of this value (default is 1).
+    - deadline_ratio (float): Relative deadline as a fraction of the period (default is 1, implicit deadlines).
+    - discard (bool): Indicates if UUniFast-discard is used instead of plain UUniFast (default is True).
+    - seed (int): Seed of the generator (default is None).
+    - distribution (str): Distribution of the periods, a key of PERIOD_DISTRIBUTIONS (default is 'log-uniform').
+
+    Returns:
+    - list: (pid, period, execution_time, deadline) tuples.
+    """
+    rng = random.Random(seed)
+    utilizations = uunifast_discard(n, utilization, rng) if discard else uunifast(n, utilization, rng)
+    periods = PERIOD_DISTRIBUTIONS[distribution](n, minimum_period, maximum_period, rng, granularity)
+    tasks = []
+    for index, (task_utilization, period) in enumerate(zip(utilizations, periods), start=1):
+        execution_time = min(period, max(1, round(task_utilization * period)))
+        deadline = max(execution_time, round(period * deadline_ratio))
+        tasks.append((f"Task{index}", period, execution_time, deadline))
+    return tasks
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic task set generator')
+    parser.add_argument('-n', '--tasks', type=int, required=True, help='Number of tasks')
+    parser.add_argument('-u', '--utilization', type=float, required=True, help='Total utilization')
+    parser.add_argument('-o', '--output', type=str, required=True, help='Output task file')
+    parser.add_argument('--min-period', type=int, default=10, help='Smallest period')
+    parser.add_argument('--max-period', type=int, default=1000, help='Largest period')
+    parser.add_argument('--distribution', type=str, default='log-uniform', choices=PERIOD_DISTRIBUTIONS, help='Distribution of the periods')
+    parser.add_argument('--granularity', type=int, default=1, help='Periods are multiples of this value')
+    parser.add_argument('--deadline-ratio', type=float, default=1.0, help='Relative deadline as a fraction of the period')
+    parser.add_argument('--no-discard', action='store_true', help='Use plain UUniFast (tasks may exceed utilization 1)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='Seed of the generator')
+    args = parser.parse_args()
+
+    write_tasks_to_file(args.output, generate_task_set(args.tasks, args.utilization, args.min_period, args.max_period,
+                                                       args.granularity, args.deadline_ratio, not args.no_discard, args.seed, args.distribution))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import struct
+from itertools import islice
+from task import Task
+
+TASK_FIELDS = ("pid", "period", "execution_time", "deadline")
+BINARY_MAGIC = b"RTTS\x01"  # Compact binary task file, version 1
+CACHE_MAGIC = b"RTTC\x01"  # Binary cache of a parsed task file, version 1
+DIGEST_SIZE = 32  # SHA-256 of the source file, stored after CACHE_MAGIC
+RECORD = struct.Struct("<qqqH")  # period, execution_time, deadline and PID length of a binary row
+CHUNK_SIZE = 4096  # Rows validated together
+JSON_EXTENSIONS = (".jsonl", ".ndjson")
+BINARY_EXTENSIONS = (".bin", ".rtts")
+
+def file_format(filename):
+    """
+    Detects the format of a task file from its extension.
+
+    Parameters:
+    - filename (str): Task file.
+
+    Returns:
+    - str: "jsonl", "binary" or "csv" (any other extension, as in examples/simulation1.txt).
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in JSON_EXTENSIONS:
+        return "jsonl"
+    if extension in BINARY_EXTENSIONS:
+        return "binary"
+    return "csv"
+
+def iter_csv_rows(file):
+    """
+    Reads comma-separated rows (pid,period,execution_time,deadline). A header line starting with "pid" and blank lines are skipped.
+
+    Parameters:
+    - file (TextIO): Open text file.
+
+    Returns:
+    - generator: (line number, fields) pairs.
+    """
+    for number, line in enumerate(file, start=1):
+        if not line.strip() or (number == 1 and line.lstrip().lower().startswith("pid,")):
+            continue
+        yield number, line.split(',')
+
+def iter_jsonl_rows(file):
+    """
+    Reads JSON Lines rows, one object with pid, period, execution_time and deadline per line.
+
+    Parameters:
+    - file (TextIO): Open text file.
+
+    Returns:
+    - generator: (line number, fields) pairs.
+    """
+    for number, line in enumerate(file, start=1):
+        if line.strip():
+            row = json.loads(line)
+            yield number, [row.get(field) for field in TASK_FIELDS]
+
+def iter_binary_rows(file, magic=BINARY_MAGIC):
+    """
+    Reads the rows of a binary task file: the magic bytes, then per task the fixed RECORD followed by the UTF-8 PID.
+
+    Parameters:
+    - file (BinaryIO): Open binary file, positioned after any header preceding the magic bytes.
+    - magic (bytes): Expected magic bytes (default is BINARY_MAGIC).
+
+    Returns:
+    - generator: (pid, period, execution_time, deadline) tuples.
+    """
+    if file.read(len(magic)) != magic:
+        raise ValueError(f"{getattr(file, 'name', 'file')} is not a binary task file")
+    while True:
+        record = file.read(RECORD.size)
+        if not record:
+            return
+        period, execution_time, deadline, length = RECORD.unpack(record)
+        yield file.read(length).decode("utf-8"), period, execution_time, deadline
+
+def validate_rows(rows, filename, arrivals=False):
+    """
+    Converts and validates parsed rows in chunks of CHUNK_SIZE, reporting every invalid row of a chunk at once.
+
+    A row is valid when it has a non-empty PID and positive integer period,
+    execution time and deadline. In files of aperiodic jobs the period column
+    is the arrival time, which may also be 0.
+
+    Parameters:
+    - rows (iterable): (line number, fields) pairs.
+    - filename (str): Task file, for the error message.
+    - arrivals (bool): Indicates if the period column holds arrival times (default is False).
+
+    Returns:
+    - generator: Valid (pid, period, execution_time, deadline) tuples.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            return
+        valid = []
+        errors = []
+        for number, fields in chunk:
+            try:
+                pid, period, execution_time, deadline = fields
+                row = (str(pid).strip(), int(period), int(execution_time), int(deadline))
+            except (TypeError, ValueError):
+                errors.append(number)
+                continue
+            if not row[0] or row[1] < (0 if arrivals else 1) or min(row[2:]) <= 0:
+                errors.append(number)
+            else:
+                valid.append(row)
+        if errors:
+            raise ValueError(f"Invalid task rows in {filename} at lines {', '.join(map(str, errors[:20]))}" + (" ..." if len(errors) > 20 else ""))
+        yield from valid
+
+def file_digest(filename):
+    """
+    Calculates the SHA-256 digest of a file.
+
+    Parameters:
+    - filename (str): File to hash.
+
+    Returns:
+    - bytes: Digest of the content.
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+def cache_filename(filename, arrivals=False):
+    """
+    Gets the path of the cache of a task file: a hidden file next to it.
+
+    Files read as arrival times get their own cache, since they are validated differently.
+
+    Parameters:
+    - filename (str): Task file.
+    - arrivals (bool): Indicates if the period column holds arrival times (default is False).
+
+    Returns:
+    - str: Path of the cache file.
+    """
+    directory, name = os.path.split(filename)
+    return os.path.join(directory, "." + name + (".arrivals" if arrivals else "") + ".taskcache")
+
+def write_binary_rows(file, rows):
+    """
+    Writes rows as binary records.
+
+    Parameters:
+    - file (BinaryIO): Open binary file, after the magic bytes.
+    - rows (iterable): (pid, period, execution_time, deadline) tuples.
+    """
+    for pid, period, execution_time, deadline in rows:
+        encoded = str(pid).encode("utf-8")
+        file.write(RECORD.pack(period, execution_time, deadline, len(encoded)))
+        file.write(encoded)
+
+def parse_task_file(filename, arrivals=False):
+    """
+    Parses and validates a task file in any supported format.
+
+    Parameters:
+    - filename (str): Task file.
+    - arrivals (bool): Indicates if the period column holds arrival times (default is False).
+
+    Returns:
+    - generator: Valid (pid, period, execution_time, deadline) tuples.
+    """
+    format = file_format(filename)
+    if format == "binary":
+        with open(filename, 'rb') as file:
+            yield from validate_rows(((index, row) for index, row in enumerate(iter_binary_rows(file), start=1)), filename, arrivals)
+        return
+    with open(filename, 'r') as file:
+        rows = iter_jsonl_rows(file) if format == "jsonl" else iter_csv_rows(file)
+        yield from validate_rows(rows, filename, arrivals)
+
+def load_task_rows(filename, cache=True, arrivals=False):
+    """
+    Streams the validated rows of a task file.
+
+    With `cache`, the rows are read from the cache next to the file when its
+    digest matches the content of the file, skipping parsing and validation.
+    Otherwise the file is parsed and the cache is written as a side effect
+    (skipped silently if the directory is not writable).
+
+    Parameters:
+    - filename (str): Task file.
+    - cache (bool): Indicates if the content-hash cache is used (default is True).
+    - arrivals (bool): Indicates if the period column holds arrival times (default is False).
+
+    Returns:
+    - generator: (pid, period, execution_time, deadline) tuples.
+    """
+    if not cache:
+        yield from parse_task_file(filename, arrivals)
+        return
+    digest = file_digest(filename)
+    cached = cache_filename(filename, arrivals)
+    try:
+        with open(cached, 'rb') as file:
+            if file.read(DIGEST_SIZE) == digest:
+                yield from iter_binary_rows(file, CACHE_MAGIC)
+                return
+    except (OSError, ValueError):
+        pass
+    temporary = f"{cached}.{os.getpid()}.tmp"
+    try:
+        output = open(temporary, 'wb')
+    except OSError:
+        yield from parse_task_file(filename, arrivals)
+        return
+    complete = False
+    try:
+        with output:
+            output.write(digest)
+            output.write(CACHE_MAGIC)
+            for row in parse_task_file(filename, arrivals):
+                write_binary_rows(output, (row,))
+                yield row
+        complete = True
+    finally:
+        # Only a complete cache replaces the previous one
+        if complete:
+            os.replace(temporary, cached)
+        else:
+            os.remove(temporary)
+
+def iter_tasks(filename, aperiodic=False, cache=True, arrivals=False):
+    """
+    Streams the tasks of a file, building each Task only when it is consumed.
+
+    Parameters:
+    - filename (str): Task file (CSV, JSON Lines or binary).
+    - aperiodic (bool): Indicates whether the tasks are aperiodic; their period column holds arrival times.
+    - cache (bool): Indicates if the content-hash cache is used (default is True).
+    - arrivals (bool): Indicates if the period column holds arrival times, as in the aperiodic jobs of a server (default is False).
+
+    Returns:
+    - generator: Task objects.
+    """
+    for pid, period, execution_time, deadline in load_task_rows(filename, cache, aperiodic or arrivals):
+        yield Task(pid=pid, period=period, execution_time=execution_time, deadline=deadline, aperiodic=aperiodic)
+
+def write_task_rows(filename, rows):
+    """
+    Writes task rows in the format given by the extension of the file.
+
+    Parameters:
+    - filename (str): Output task file.
+    - rows (iterable): (pid, period, execution_time, deadline) tuples.
+    """
+    format = file_format(filename)
+    if format == "binary":
+        with open(filename, 'wb') as file:
+            file.write(BINARY_MAGIC)
+            write_binary_rows(file, rows)
+        return
+    with open(filename, 'w') as file:
+        if format == "jsonl":
+            for row in rows:
+                file.write(json.dumps(dict(zip(TASK_FIELDS, row))) + "\n")
+        else:
+            file.write("\n".join(",".join(str(field) for field in row) for row in rows))
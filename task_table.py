@@ -0,0 +1,90 @@
+import numpy as np
+
+class TaskTable:
+    """
+    Struct-of-arrays view of the task set for vectorized checks over all tasks.
+
+    Rows follow the order of the scheduler's task list, so the rows returned by
+    the checks are in the same order the per-object loop visited the tasks.
+    The static parameters are copied once; the scheduler keeps `started` and
+    `queued` in sync with the tasks and the execution queue.
+
+    Only releases and deadline expiries are vectorized. There are no offset or
+    next-release arrays, since periodic tasks are all released at time 0 and the
+    next release follows from the periods. There is no remaining-time array or
+    vectorized completion check either, since only the one running task can
+    complete in a tick and it is checked on its own.
+
+    Attributes:
+    - rows (dict): Row of every task PID (the first task registered with that PID).
+    - periods (ndarray): Period of every task.
+    - execution_times (ndarray): Execution time (WCET) of every task.
+    - deadlines (ndarray): Relative deadline of every task.
+    - started (ndarray): Release time of the current job of every task (Task.startedTime).
+    - queued (ndarray): Number of executables of every task in the execution queue.
+    """
+    def __init__(self, tasks):
+        """
+        Initializes a TaskTable.
+
+        Parameters:
+        - tasks (list): Task objects, in scheduling order.
+        """
+        self.rows = {}
+        for row, task in enumerate(tasks):
+            self.rows.setdefault(task.pid, row)
+        self.periods = np.array([task.period for task in tasks], dtype=np.int64)
+        self.execution_times = np.array([task.execution_time for task in tasks], dtype=np.int64)
+        self.deadlines = np.array([task.deadline for task in tasks], dtype=np.int64)
+        self.started = np.array([task.startedTime for task in tasks], dtype=np.int64)
+        self.queued = np.zeros(len(tasks), dtype=np.int64)
+
+    def released(self, time):
+        """
+        Gets the periodic tasks released at a time.
+
+        Parameters:
+        - time (int): Current time.
+
+        Returns:
+        - ndarray: Rows whose period divides the time.
+        """
+        return np.flatnonzero(time % self.periods == 0)
+
+    def next_release(self, time, default):
+        """
+        Gets the first periodic release from a time on.
+
+        Parameters:
+        - time (int): Current time.
+        - default (int): Value returned when there are no tasks.
+
+        Returns:
+        - int: Time of the next release.
+        """
+        return int((-(-time // self.periods) * self.periods).min()) if len(self.periods) else default
+
+    def expired(self, time):
+        """
+        Gets the queued tasks whose deadline is expired at a time.
+
+        Parameters:
+        - time (int): Current time.
+
+        Returns:
+        - ndarray: Rows with executables in the queue and time - started >= deadline.
+        """
+        return np.flatnonzero((self.queued > 0) & (time - self.started >= self.deadlines))
+
+    def next_deadline(self, default):
+        """
+        Gets the first absolute deadline of the queued tasks.
+
+        Parameters:
+        - default (int): Value returned when the queue is empty.
+
+        Returns:
+        - int: Earliest started + deadline among queued tasks.
+        """
+        deadlines = (self.started + self.deadlines)[self.queued > 0]
+        return int(deadlines.min()) if len(deadlines) else default
@@ -0,0 +1,138 @@
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+CORE_MODULES = ["scheduler", "rms", "edf", "task", "cpu"]  # Scheduling core, importable with the standard library only
+DEFAULT_BUDGET = 60  # Milliseconds, for the command line
+STARTUP_FACTOR = 8  # Test budget in multiples of the interpreter startup, so it holds on slower machines
+BUDGET_VARIABLE = "IMPORT_BUDGET_MS"  # Environment variable with an absolute test budget in milliseconds
+
+def measure_imports(modules):
+    """
+    Imports modules in a fresh interpreter and reads the `-X importtime` report.
+
+    Modules the interpreter imports at startup (site hooks, .pth files) are
+    measured with an empty program and left out.
+
+    Parameters:
+    - modules (list): Names of the modules to import.
+
+    Returns:
+    - Tuple[float, list]: Cumulative import time in milliseconds, and the names of the modules imported.
+    """
+    startup = {name.strip() for _, name in import_report("pass")}
+    total = 0
+    imported = []
+    for cumulative, name in import_report(f"import {', '.join(modules)}"):
+        if name.strip() in startup:
+            continue
+        imported.append(name.strip())
+        if not name.startswith(" "):
+            # Only top-level imports, their cumulative time already includes the nested ones
+            total += cumulative
+    return total / 1000, imported
+
+def import_report(program):
+    """
+    Runs a program in a fresh interpreter with `-X importtime`.
+
+    Parameters:
+    - program (str): Python code to run.
+
+    Returns:
+    - list: (cumulative microseconds, indented module name) of every import, in report order.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", program],
+                            cwd=directory, capture_output=True, text=True, check=True)
+    report = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        report.append((int(cumulative), name[1:]))
+    return report
+
+def third_party(imported):
+    """
+    Finds the imported modules that are neither in the standard library nor in this project.
+
+    Parameters:
+    - imported (list): Names of the imported modules.
+
+    Returns:
+    - list: Top-level packages from outside the standard library and the project.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    packages = []
+    for name in imported:
+        package = name.split(".")[0]
+        if package in sys.stdlib_module_names or package.startswith("_") or package in packages:
+            continue
+        if os.path.exists(os.path.join(directory, package + ".py")) or importlib.util.find_spec(package) is None:
+            # Project modules, and failed optional imports of the standard library (copy probes org.python.core)
+            continue
+        packages.append(package)
+    return packages
+
+def fastest_import(modules, repeat=5):
+    """
+    Measures the imports of modules in several fresh interpreters.
+
+    Parameters:
+    - modules (list): Names of the modules to import.
+    - repeat (int): Fresh interpreters to measure (default is 5).
+
+    Returns:
+    - Tuple[float, list]: Fastest cumulative import time in milliseconds, and the names of the modules imported.
+    """
+    return min((measure_imports(modules) for _ in range(repeat)), key=lambda measurement: measurement[0])
+
+def startup_time(repeat=5):
+    """
+    Measures the wall time of an interpreter that runs an empty program.
+
+    Parameters:
+    - repeat (int): Fresh interpreters to measure (default is 5).
+
+    Returns:
+    - float: Fastest startup time in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+def test_core_imports_standard_library_only():
+    _, imported = measure_imports(CORE_MODULES)
+    assert third_party(imported) == []
+
+def test_core_import_time_within_budget():
+    # An absolute budget only holds on the machine it was chosen for, so by default it follows the interpreter startup
+    budget = float(os.environ[BUDGET_VARIABLE]) if os.environ.get(BUDGET_VARIABLE) else STARTUP_FACTOR * startup_time()
+    elapsed, _ = fastest_import(CORE_MODULES)
+    assert elapsed <= budget, f"Core imported in {elapsed:.1f} ms, budget {budget:.1f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that modules import fast and with the standard library only')
+    parser.add_argument('modules', nargs='*', default=CORE_MODULES, help='Modules to import (default: the scheduling core)')
+    parser.add_argument('-b', '--budget', type=float, default=DEFAULT_BUDGET, help='Maximum cumulative import time in milliseconds')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Fresh interpreters to measure; the fastest one counts')
+    args = parser.parse_args()
+
+    elapsed, imported = fastest_import(args.modules, args.repeat)
+    packages = third_party(imported)
+    print(f"Imported {', '.join(args.modules)} in {elapsed:.1f} ms (budget {args.budget:g} ms), {len(imported)} modules")
+    if packages:
+        print(f"FAIL: modules from outside the standard library: {', '.join(packages)}")
+    if elapsed > args.budget:
+        print(f"FAIL: import time over budget by {elapsed - args.budget:.1f} ms")
+    sys.exit(1 if packages or elapsed > args.budget else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import csv
+import random
+from task import Task
+from cpu import CPU
+from simulation import create_scheduler
+from results_export import ResultsExporter
+from constants import GENERAL_STATISTICS
+from logger import Logger
+
+def export_run(directory, rows, algorithm='EDF', simulation_time=14):
+    """
+    Simulates a task set with a CSV exporter and reads the job and task tables back.
+
+    Parameters:
+    - directory (Path): Dataset directory.
+    - rows (list): (pid, period, execution_time, deadline) tuples.
+    - algorithm (str): 'RMS' or 'EDF' (default is 'EDF').
+    - simulation_time (int): Simulation time (default is 14).
+
+    Returns:
+    - Tuple[list, dict]: Job rows, and task rows by task.
+    """
+    scheduler = create_scheduler(algorithm, simulation_time, CPU("Processor"))
+    for pid, period, execution_time, deadline in rows:
+        scheduler.add_task(Task(pid=pid, period=period, execution_time=execution_time, deadline=deadline))
+    exporter = ResultsExporter(scheduler, directory, run="test")
+    scheduler.run()
+    exporter.close()
+    with open(directory / "jobs.csv", newline='') as file:
+        jobs = list(csv.DictReader(file))
+    with open(directory / "tasks.csv", newline='') as file:
+        tasks = {row["task"]: row for row in csv.DictReader(file)}
+    return jobs, tasks
+
+def missed_jobs(jobs):
+    """
+    Counts the missed job rows of every task.
+
+    Parameters:
+    - jobs (list): Job rows.
+
+    Returns:
+    - dict: Missed jobs by task.
+    """
+    missed = {}
+    for job in jobs:
+        missed[job["task"]] = missed.get(job["task"], 0) + (job["missed"] == "True")
+    return missed
+
+def test_missed_jobs_match_task_statistics(tmp_path, monkeypatch):
+    monkeypatch.setattr(Logger, "logs_path", f"{tmp_path}/logs/")
+    jobs, tasks = export_run(tmp_path / "overrun", [("T0", 4, 1, 3), ("T1", 6, 5, 5), ("T2", 6, 2, 6)])
+    missed = missed_jobs(jobs)
+    for pid, row in tasks.items():
+        if pid != GENERAL_STATISTICS:
+            assert missed.get(pid, 0) == int(row["missed_deadlines"]), pid
+    assert sum(missed.values()) == int(tasks[GENERAL_STATISTICS]["missed_deadlines"]) == 6
+
+def test_missed_jobs_match_task_statistics_random_sets(tmp_path, monkeypatch):
+    monkeypatch.setattr(Logger, "logs_path", f"{tmp_path}/logs/")
+    generator = random.Random(7)
+    for index in range(100):
+        rows = []
+        for number in range(generator.randint(2, 5)):
+            period = generator.randint(2, 12)
+            rows.append((f"T{number}", period, generator.randint(1, period), generator.randint(1, period)))
+        algorithm = generator.choice(['RMS', 'EDF'])
+        jobs, tasks = export_run(tmp_path / str(index), rows, algorithm, generator.randint(10, 60))
+        assert sum(missed_jobs(jobs).values()) == int(tasks[GENERAL_STATISTICS]["missed_deadlines"]), (algorithm, rows)
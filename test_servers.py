@@ -0,0 +1,22 @@
+from task import Task
+from cpu import CPU
+from servers import create_server
+from simulation import create_scheduler
+from logger import Logger
+
+def test_sporadic_server_replenishment_due_while_job_runs(tmp_path, monkeypatch):
+    """
+    The replenishment of an active Sporadic Server comes due before its job
+    finishes; the budget consumed afterwards opens a new replenishment.
+    """
+    monkeypatch.setattr(Logger, "logs_path", f"{tmp_path}/")
+    server = create_server('SS', 2, 6)
+    scheduler = create_scheduler('EDF', 300, CPU("Processor"), server=server)
+    for pid, period, execution_time, deadline in (("T0", 8, 3, 8), ("T1", 6, 3, 6), ("T2", 12, 3, 12)):
+        scheduler.add_task(Task(pid=pid, period=period, execution_time=execution_time, deadline=deadline))
+    scheduler.add_aperiodic_task(Task(pid="J2", period=127, execution_time=6, deadline=13))
+    scheduler.run()
+
+    assert "J2" in scheduler.get_statistics()
+    assert all(amount > 0 for _, amount in server.replenishments)
+    assert server.capacity + sum(amount for _, amount in server.replenishments) <= server.budget
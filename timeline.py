@@ -0,0 +1,277 @@
+import math
+import os
+from execution_history import IDLE
+
+DEFAULT_PIXELS = 2000  # Horizontal resolution the timeline is decimated to
+ROW_HEIGHT = 10  # Height of the row of every task, in plot units
+EXPORT_FORMATS = (".html", ".png", ".svg")
+EXPORT_PACKAGES = {".html": ("numpy", "matplotlib", "plotly"), ".png": ("numpy", "matplotlib"), ".svg": ("numpy", "matplotlib")}  # Packages each format is drawn with
+
+def history_arrays(history):
+    """
+    Views the segment arrays of an ExecutionHistory as NumPy arrays, without copying them.
+
+    Parameters:
+    - history (ExecutionHistory): Execution history of a CPU.
+
+    Returns:
+    - Tuple[ndarray, ndarray, ndarray]: Start, finish and task index of every segment.
+    """
+    import numpy as np
+    return (np.frombuffer(history.starts, dtype=np.int64) if len(history.starts) else np.zeros(0, dtype=np.int64),
+            np.frombuffer(history.finishes, dtype=np.int64) if len(history.finishes) else np.zeros(0, dtype=np.int64),
+            np.frombuffer(history.tasks, dtype=np.dtype(history.tasks.typecode)) if len(history.tasks) else np.zeros(0, dtype=np.int64))
+
+def window_segments(histories, start, finish):
+    """
+    Gets the segments of every task that overlap a time window, clipped to it.
+
+    The segments of a history are sorted by time, so the window is found by
+    binary search and only the visible segments are read.
+
+    Parameters:
+    - histories (list): ExecutionHistory of every CPU.
+    - start (int): Start of the window.
+    - finish (int): End of the window (exclusive).
+
+    Returns:
+    - dict: (starts, finishes) arrays by task PID, sorted by start; idle time is left out.
+    """
+    import numpy as np
+    pieces = {}
+    for history in histories:
+        starts, finishes, tasks = history_arrays(history)
+        first = np.searchsorted(finishes, start, side='right')
+        last = np.searchsorted(starts, finish, side='left')
+        starts = np.maximum(starts[first:last], start)
+        finishes = np.minimum(finishes[first:last], finish)
+        tasks = tasks[first:last]
+        order = np.argsort(tasks, kind='stable')
+        indexes, bounds = np.unique(tasks[order], return_index=True)
+        for index, group in zip(indexes, np.split(order, bounds[1:])):
+            if index != IDLE:
+                pieces.setdefault(history.names[index], []).append((starts[group], finishes[group]))
+    segments = {}
+    for pid, parts in pieces.items():
+        starts = np.concatenate([part[0] for part in parts])
+        finishes = np.concatenate([part[1] for part in parts])
+        # A task runs on one CPU at a time, so merging the CPUs only needs a sort
+        order = np.argsort(starts, kind='stable')
+        segments[pid] = (starts[order], finishes[order])
+    return segments
+
+def decimate(starts, finishes, resolution):
+    """
+    Merges the segments of a task separated by gaps shorter than the resolution.
+
+    Gaps that would not be visible at the resolution are filled, so a task
+    keeps at most one bar per resolution unit however many segments it has.
+
+    Parameters:
+    - starts (ndarray): Start of every segment, sorted.
+    - finishes (ndarray): Finish of every segment.
+    - resolution (float): Time units covered by one pixel.
+
+    Returns:
+    - Tuple[ndarray, ndarray]: Starts and finishes of the merged bars.
+    """
+    import numpy as np
+    if len(starts) < 2 or resolution <= 1:
+        return starts, finishes
+    gaps = starts[1:] - finishes[:-1] >= resolution
+    return starts[np.concatenate(([True], gaps))], finishes[np.concatenate((gaps, [True]))]
+
+def timeline_rows(histories, start, finish, pixels=DEFAULT_PIXELS):
+    """
+    Builds the bars of every task in a window, decimated to a horizontal resolution.
+
+    Parameters:
+    - histories (list): ExecutionHistory of every CPU.
+    - start (int): Start of the window.
+    - finish (int): End of the window (exclusive).
+    - pixels (int): Horizontal resolution (default is DEFAULT_PIXELS).
+
+    Returns:
+    - dict: (starts, widths) arrays by task PID, in PID order.
+    """
+    resolution = (finish - start) / max(pixels, 1)
+    rows = {}
+    for pid, (starts, finishes) in sorted(window_segments(histories, start, finish).items()):
+        starts, finishes = decimate(starts, finishes, resolution)
+        rows[pid] = (starts, finishes - starts)
+    return rows
+
+def history_end(histories):
+    """
+    Gets the time of the last tick recorded in the histories.
+
+    Parameters:
+    - histories (list): ExecutionHistory of every CPU.
+
+    Returns:
+    - int: Largest segment finish, or 0 for empty histories.
+    """
+    return max((history.finishes[-1] for history in histories if len(history.finishes)), default=0)
+
+def task_colors(pids):
+    """
+    Assigns a color to every task, cycling through a qualitative palette.
+
+    Parameters:
+    - pids (iterable): Task PIDs.
+
+    Returns:
+    - dict: RGB tuple by task PID.
+    """
+    from matplotlib import colormaps
+    palette = colormaps["tab20"].colors
+    return {pid: palette[index % len(palette)] for index, pid in enumerate(sorted(pids))}
+
+class TimelineView:
+    """
+    Matplotlib Gantt chart of the CPU histories that redraws only the visible window.
+
+    Every task is drawn as one bar collection. When the x limits change
+    (zoom or pan) the segments of the new window are queried and decimated
+    again, so the number of drawn bars depends on the width of the plot and
+    not on the length of the simulation.
+
+    Attributes:
+    - ax (Axes): Axes the timeline is drawn on.
+    - histories (list): ExecutionHistory of every CPU.
+    - pixels (int): Horizontal resolution of the bars.
+    - rows (dict): Row position by task PID.
+    - colors (dict): Color by task PID.
+    - collections (dict): Bar collection by task PID.
+    """
+    def __init__(self, ax, histories, pixels=DEFAULT_PIXELS):
+        """
+        Initializes the view with one row per task that ever ran.
+
+        Parameters:
+        - ax (Axes): Axes to draw on.
+        - histories (list): ExecutionHistory of every CPU.
+        - pixels (int): Horizontal resolution (default is DEFAULT_PIXELS).
+        """
+        self.ax = ax
+        self.histories = histories
+        self.pixels = pixels
+        pids = sorted({pid for history in histories for pid in history.names}, reverse=True)
+        self.rows = {pid: ROW_HEIGHT * (index + 1) for index, pid in enumerate(pids)}
+        self.colors = task_colors(pids)
+        self.collections = {}
+        self.drawing = False
+        ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def draw(self, start, finish):
+        """
+        Draws the bars of a window, replacing the previous ones, and sets the limits of the axes.
+
+        Parameters:
+        - start (int): Start of the window.
+        - finish (int): End of the window (exclusive).
+        """
+        self.drawing = True
+        self.render(start, finish)
+        self.ax.set_xlim(start, finish)
+        self.ax.set_ylim(ROW_HEIGHT / 2, ROW_HEIGHT * len(self.rows) + ROW_HEIGHT * 1.5)
+        self.ax.set_yticks([row + ROW_HEIGHT / 2 for row in self.rows.values()])
+        self.ax.set_yticklabels([f"Task {pid}" for pid in self.rows])
+        self.drawing = False
+
+    def render(self, start, finish):
+        """
+        Replaces the bar collections with those of a window.
+
+        Parameters:
+        - start (float): Start of the window.
+        - finish (float): End of the window (exclusive).
+        """
+        import numpy as np
+        for collection in self.collections.values():
+            collection.remove()
+        self.collections = {}
+        start, finish = max(int(start), 0), math.ceil(finish)
+        if finish <= start:
+            return
+        for pid, (starts, widths) in timeline_rows(self.histories, start, finish, self.pixels).items():
+            self.collections[pid] = self.ax.broken_barh(np.column_stack((starts, widths)), (self.rows[pid], ROW_HEIGHT - 1),
+                                                        facecolors=self.colors[pid])
+
+    def on_xlim_changed(self, ax):
+        """
+        Re-queries the visible window after a zoom or pan.
+
+        Parameters:
+        - ax (Axes): Axes whose limits changed.
+        """
+        if self.drawing:
+            return
+        self.drawing = True
+        self.render(*ax.get_xlim())
+        self.drawing = False
+
+def plot_timeline(histories, timeline_scale, ax=None, pixels=DEFAULT_PIXELS, start=0):
+    """
+    Draws the timeline of the CPU histories with matplotlib.
+
+    Parameters:
+    - histories (list): ExecutionHistory of every CPU.
+    - timeline_scale (int): End of the initial window.
+    - ax (Axes): Axes to draw on (default is a new figure).
+    - pixels (int): Horizontal resolution (default is DEFAULT_PIXELS).
+    - start (int): Start of the initial window (default is 0).
+
+    Returns:
+    - TimelineView: View kept alive for the zoom and pan callbacks.
+    """
+    import matplotlib.pyplot as plt
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 5))
+    view = TimelineView(ax, histories, pixels)
+    view.draw(start, timeline_scale)
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Tasks')
+    ax.grid(True)
+    ax.set_title("Task Execution Timeline")
+    return view
+
+def export_timeline(histories, filename, start=0, finish=None, pixels=DEFAULT_PIXELS):
+    """
+    Writes the timeline of a window to a file without a display.
+
+    HTML files are interactive plotly charts with one bar trace per task. PNG
+    and SVG files are drawn with the non-interactive matplotlib backend, since
+    static plotly images need the optional kaleido package.
+
+    Parameters:
+    - histories (list): ExecutionHistory of every CPU.
+    - filename (str): Output file (.html, .png or .svg).
+    - start (int): Start of the window (default is 0).
+    - finish (int): End of the window (default is the end of the histories).
+    - pixels (int): Horizontal resolution (default is DEFAULT_PIXELS).
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported timeline format {extension}, use one of {', '.join(EXPORT_FORMATS)}")
+    if finish is None:
+        finish = history_end(histories)
+    if extension == ".html":
+        import plotly.graph_objects as go
+        rows = timeline_rows(histories, start, finish, pixels)
+        colors = task_colors(rows)
+        figure = go.Figure()
+        for pid, (starts, widths) in rows.items():
+            red, green, blue = (round(channel * 255) for channel in colors[pid])
+            figure.add_trace(go.Bar(name=f"Task {pid}", y=[f"Task {pid}"] * len(starts), x=widths, base=starts,
+                                    orientation='h', marker_color=f"rgb({red},{green},{blue})"))
+        figure.update_layout(title="Task Execution Timeline", xaxis_title="Time (s)", yaxis_title="Tasks", barmode='overlay')
+        figure.update_xaxes(range=[start, finish])
+        figure.write_html(filename)
+        return
+    from matplotlib.figure import Figure
+    figure = Figure(figsize=(10, 5))
+    ax = figure.subplots()
+    plot_timeline(histories, finish, ax=ax, pixels=pixels, start=start)
+    figure.tight_layout()
+    figure.savefig(filename)